@@ -11,22 +11,49 @@ import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
-from homeassistant.util.json import load_json
-from homeassistant.helpers.json import save_json
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
 
-from .coordinator import KumoDataUpdateCoordinator
+from .cache import (
+    CACHE_SOURCE_BACKUP,
+    async_remove_cache,
+    apply_dhcp_addresses,
+    async_load_cache,
+    async_save_cache,
+    unaddressed_units,
+)
+from .coordinator import (
+    KumoDataUpdateCoordinator,
+    device_timeouts,
+    device_update_interval,
+)
+from .fleet import KumoFleet
+from .health import KumoHealthMonitor
+from .topology import KumoTopologySync
+from .transport import get_transport
+from .last_hvac_mode import KumoLastHvacModeStore
+from .prometheus import async_register_metrics_view
+from .services import async_setup_services
+from .websocket_api import async_register_websocket_commands
 from .const import (
+    CONF_CLIMATE_ATTRIBUTES,
     CONF_CONNECT_TIMEOUT,
+    CONF_KUMO_CACHE,
     CONF_PREFER_CACHE,
     CONF_RESPONSE_TIMEOUT,
-    CONF_SCAN_INTERVAL,
-    DEFAULT_SCAN_INTERVAL,
+    CONF_TOPOLOGY_SYNC_INTERVAL,
+    DEFAULT_TOPOLOGY_SYNC_INTERVAL,
     DHCP_DISCOVERED_KEY,
     DOMAIN,
-    KUMO_CONFIG_CACHE,
     KUMO_DATA,
+    KUMO_DATA_CLOUD_REFRESH,
     KUMO_DATA_COORDINATORS,
+    KUMO_DATA_FLEET,
+    KUMO_DATA_HEALTH,
+    KUMO_DATA_LAST_HVAC_MODE,
     PLATFORMS,
+    SIGNAL_ENTRY_UNLOADED,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -70,76 +97,133 @@ class KumoCloudSettings:
         """Retrieve domain config."""
         return self._domain_options
 
+    def set_account(self, account):
+        """Replace the account after a topology resync."""
+        self._account = account
+
     def get_raw_json(self):
         """Retrieve raw JSON config from account."""
         return self._account.get_raw_json()
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Kumo services."""
+    async_setup_services(hass)
+    async_register_websocket_commands(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Setup Kumo Entry"""
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN].setdefault(entry.entry_id, {})
+    async_register_metrics_view(hass)
     username = entry.data.get(CONF_USERNAME)
     password = entry.data.get(CONF_PASSWORD)
     prefer_cache = entry.data.get(CONF_PREFER_CACHE)
 
-    # Load cached config if available
-    cached_dict = await hass.async_add_executor_job(
-        load_json, hass.config.path(KUMO_CONFIG_CACHE)
+    if CONF_KUMO_CACHE in entry.data:
+        # The units the config flow found become the entry's own cache.
+        data = dict(entry.data)
+        await async_save_cache(hass, entry.entry_id, data.pop(CONF_KUMO_CACHE))
+        hass.config_entries.async_update_entry(entry, data=data)
+    cache = await async_load_cache(hass, entry.entry_id)
+    cached_dict = cache.kumo_dict if cache is not None else None
+    cloud_refresh = entry.entry_id in hass.data[DOMAIN].get(
+        KUMO_DATA_CLOUD_REFRESH, set()
     )
-    if not isinstance(cached_dict, list) or len(cached_dict) < 3:
-        cached_dict = None
+    hass.data[DOMAIN].get(KUMO_DATA_CLOUD_REFRESH, set()).discard(entry.entry_id)
 
     # Initialize account and try setup
     account = pykumo.KumoCloudAccount(username, password, kumo_dict=cached_dict)
     candidate_ips = hass.data.get(DHCP_DISCOVERED_KEY, {})
 
-    try:
-        setup_success = await hass.async_add_executor_job(
-            account.try_setup, candidate_ips, prefer_cache
-        )
-    except (ConnectionError, OSError) as err:
-        _LOGGER.warning("Kumo setup failed due to network error: %s", err)
-        return False
-    except (json.JSONDecodeError, binascii.Error, ValueError) as err:
-        _LOGGER.error("Kumo setup failed due to malformed cached data: %s", err)
-        return False
-    except Exception:
-        _LOGGER.exception("Unexpected error during Kumo setup")
-        raise
+    moved = []
+    fast_start = (
+        prefer_cache
+        and not cloud_refresh
+        and cache is not None
+        and cache.verified
+        and not unaddressed_units(cached_dict)
+    )
+    if fast_start:
+        # The cache is intact and every unit has an address: start from it
+        # without contacting KumoCloud or probing the units. Units DHCP
+        # discovery saw at a new address are moved there.
+        _LOGGER.debug("Kumo starting from the %s cache", cache.source)
+        moved = apply_dhcp_addresses(cached_dict, candidate_ips)
+        if moved:
+            _LOGGER.info("Kumo units %s moved to a new address", moved)
+            account = pykumo.KumoCloudAccount(username, password, kumo_dict=cached_dict)
+        setup_success = bool(account.get_all_units())
+    else:
+        try:
+            setup_success = await hass.async_add_executor_job(
+                account.try_setup, candidate_ips, prefer_cache and not cloud_refresh
+            )
+        except (ConnectionError, OSError) as err:
+            _LOGGER.warning("Kumo setup failed due to network error: %s", err)
+            return False
+        except (json.JSONDecodeError, binascii.Error, ValueError) as err:
+            _LOGGER.error("Kumo setup failed due to malformed cached data: %s", err)
+            return False
+        except Exception:
+            _LOGGER.exception("Unexpected error during Kumo setup")
+            raise
 
     if setup_success:
-        # Save updated config for next time
-        await hass.async_add_executor_job(
-            save_json, hass.config.path(KUMO_CONFIG_CACHE), account.get_raw_json()
-        )
+        if not fast_start or moved or cache.source == CACHE_SOURCE_BACKUP:
+            # Save updated config for next time
+            await async_save_cache(hass, entry.entry_id, account.get_raw_json())
         _LOGGER.info("Kumo setup successful")
 
         hass.data[DOMAIN][entry.entry_id][KUMO_DATA] = KumoCloudSettings(
             account, entry.data, entry.options
         )
+        get_transport(hass).async_register_entry(entry.entry_id, account.get_raw_json())
 
         # Create a data coordinator for each Kumo device
         hass.data[DOMAIN][entry.entry_id].setdefault(KUMO_DATA_COORDINATORS, {})
         coordinators = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]
-        connect_timeout = float(entry.options.get(CONF_CONNECT_TIMEOUT, "1.2"))
-        response_timeout = float(entry.options.get(CONF_RESPONSE_TIMEOUT, "8"))
-        timeouts = (connect_timeout, response_timeout)
-        scan_interval_secs = float(
-            entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-        )
-        update_interval = timedelta(seconds=scan_interval_secs)
         pykumos = await hass.async_add_executor_job(
-            account.make_pykumos, timeouts, True
+            account.make_pykumos, device_timeouts(entry.options), True
         )
         for device in pykumos.values():
             if device.get_serial() not in coordinators:
                 coordinators[device.get_serial()] = KumoDataUpdateCoordinator(
-                    hass, device, config_entry=entry, update_interval=update_interval
+                    hass,
+                    device,
+                    config_entry=entry,
+                    update_interval=device_update_interval(entry.options, device),
                 )
 
+        # The account device carries the account-wide aggregate sensors.
+        dr.async_get(hass).async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={(DOMAIN, entry.entry_id)},
+            manufacturer="Mitsubishi",
+            name=f"Kumo Cloud {entry.title}",
+            entry_type=dr.DeviceEntryType.SERVICE,
+        )
+        fleet = KumoFleet()
+        fleet.async_track(entry, coordinators)
+        hass.data[DOMAIN][entry.entry_id][KUMO_DATA_FLEET] = fleet
+        health = KumoHealthMonitor()
+        health.async_track(entry, coordinators)
+        hass.data[DOMAIN][entry.entry_id][KUMO_DATA_HEALTH] = health
+
+        last_hvac_modes = KumoLastHvacModeStore(hass, entry.entry_id)
+        await last_hvac_modes.async_load()
+        hass.data[DOMAIN][entry.entry_id][KUMO_DATA_LAST_HVAC_MODE] = last_hvac_modes
+
         entry.async_on_unload(entry.add_update_listener(_async_options_updated))
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+        sync_minutes = entry.options.get(
+            CONF_TOPOLOGY_SYNC_INTERVAL, DEFAULT_TOPOLOGY_SYNC_INTERVAL
+        )
+        if sync_minutes:
+            KumoTopologySync(hass, entry, timedelta(minutes=sync_minutes)).async_start()
         return True
 
     _LOGGER.warning("Could not load config from KumoCloud")
@@ -151,9 +235,41 @@ async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry):
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the cache of a removed entry."""
+    await async_remove_cache(hass, entry.entry_id)
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an old config entry."""
+    if entry.version == 1 and entry.minor_version < 2:
+        # 1.2 added dedicated entities for the diagnostic climate attributes.
+        # Keep the attributes for existing installations so their dashboards
+        # and automations keep working.
+        hass.config_entries.async_update_entry(
+            entry,
+            options={CONF_CLIMATE_ATTRIBUTES: True, **entry.options},
+            minor_version=2,
+        )
+        _LOGGER.debug("Migrated Kumo config entry to version 1.2")
+    if entry.version == 1 and entry.minor_version < 3:
+        # 1.3 identifies entries by account, so more than one can be added.
+        unique_id = entry.unique_id
+        if unique_id == DOMAIN and entry.data.get(CONF_USERNAME):
+            unique_id = entry.data[CONF_USERNAME].lower()
+        hass.config_entries.async_update_entry(
+            entry, unique_id=unique_id, minor_version=3
+        )
+        _LOGGER.debug("Migrated Kumo config entry to version 1.3")
+    return True
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload Entry"""
 
+    # Nothing below waits on an adapter: calls still queued or in flight
+    # are cancelled before the platforms go away.
+    get_transport(hass).async_cancel_entry(entry.entry_id)
     all_ok = True
     for platform in PLATFORMS:
         unload_ok = await hass.config_entries.async_forward_entry_unload(
@@ -163,6 +279,15 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
             all_ok = False
 
     if all_ok:
+        async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format(entry.entry_id))
+        get_transport(hass).async_unregister_entry(entry.entry_id)
         hass.data[DOMAIN][entry.entry_id].pop(KUMO_DATA_COORDINATORS, None)
+        hass.data[DOMAIN][entry.entry_id].pop(KUMO_DATA_FLEET, None)
+        hass.data[DOMAIN][entry.entry_id].pop(KUMO_DATA_HEALTH, None)
+        last_hvac_modes = hass.data[DOMAIN][entry.entry_id].pop(
+            KUMO_DATA_LAST_HVAC_MODE, None
+        )
+        if last_hvac_modes is not None:
+            await last_hvac_modes.async_save()
 
     return all_ok
@@ -0,0 +1,106 @@
+"""HomeAssistant binary sensor component for Kumo indoor units."""
+
+import logging
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, KUMO_DATA, KUMO_DATA_COORDINATORS, SIGNAL_UNIT_ADDED
+from .coordinator import KumoDataUpdateCoordinator
+from .entity import CoordinatedKumoEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities
+):
+    """Set up the Kumo binary sensors."""
+    account = hass.data[DOMAIN][entry.entry_id][KUMO_DATA].get_account()
+    coordinators = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]
+
+    entities = []
+    indoor_unit_serials = await hass.async_add_executor_job(account.get_indoor_units)
+    for serial in indoor_unit_serials:
+        coordinator = coordinators[serial]
+        entities.append(KumoFilterDirty(coordinator))
+        entities.append(KumoDefrost(coordinator))
+        _LOGGER.debug(
+            "Adding entity: filter and defrost for %s",
+            coordinator.get_device().get_name(),
+        )
+
+    if entities:
+        async_add_entities(entities)
+
+    @callback
+    def _async_unit_added(serial: str) -> None:
+        coordinator = coordinators[serial]
+        if coordinator.indoor_unit:
+            async_add_entities([KumoFilterDirty(coordinator), KumoDefrost(coordinator)])
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_UNIT_ADDED.format(entry.entry_id), _async_unit_added
+        )
+    )
+
+
+class KumoFilterDirty(CoordinatedKumoEntity, BinarySensorEntity):
+    """Representation of a Kumo's dirty filter indication."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator):
+        """Initialize the filter sensor."""
+        super().__init__(coordinator)
+        self._name = self._label + " Filter"
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-filter-dirty"
+
+    @property
+    def is_on(self):
+        """Return True if the unit reports a dirty filter."""
+        return self._pykumo.get_filter_dirty()
+
+    @property
+    def device_class(self):
+        return BinarySensorDeviceClass.PROBLEM
+
+    @property
+    def entity_category(self):
+        return EntityCategory.DIAGNOSTIC
+
+
+class KumoDefrost(CoordinatedKumoEntity, BinarySensorEntity):
+    """Representation of a Kumo's defrost cycle."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator):
+        """Initialize the defrost sensor."""
+        super().__init__(coordinator)
+        self._name = self._label + " Defrost"
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-defrost"
+
+    @property
+    def is_on(self):
+        """Return True while the unit is defrosting."""
+        return self._pykumo.get_defrost()
+
+    @property
+    def device_class(self):
+        return BinarySensorDeviceClass.RUNNING
+
+    @property
+    def entity_category(self):
+        return EntityCategory.DIAGNOSTIC
@@ -0,0 +1,340 @@
+"""Integrity-checked storage of each entry's kumo_cache.<entry_id>.json.
+
+The cache holds what is needed to reach each unit without KumoCloud: its
+address and local API credentials. Each config entry has its own cache, so
+the units of one account never end up in another. Every write records the
+SHA-256 of the cache's canonical JSON and the cache schema version in a
+metadata file, then copies the cache to a last-known-good backup. On load
+a cache whose checksum does not match, e.g. after a partial write, is
+replaced by the backup when the backup still matches. A cache without
+matching metadata, such as one written by an older version or edited by
+hand, is used only if every unit in it is well formed.
+
+Older versions kept a single kumo_cache.json for all entries. An entry
+without a cache of its own takes its units from that file once; the file is
+removed when every entry has a cache of its own.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import os
+from typing import Any, NamedTuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.json import save_json
+from homeassistant.util.json import load_json
+
+from .const import (
+    DOMAIN,
+    KUMO_CONFIG_CACHE,
+    KUMO_CONFIG_CACHE_BACKUP,
+    KUMO_CONFIG_CACHE_META,
+    KUMO_LEGACY_CACHE,
+    KUMO_LEGACY_CACHE_BACKUP,
+    KUMO_LEGACY_CACHE_META,
+)
+from .metrics import get_integration_metrics
+
+_LOGGER = logging.getLogger(__name__)
+
+CACHE_SCHEMA_VERSION = 1
+
+CACHE_SOURCE_VERIFIED = "verified"
+CACHE_SOURCE_BACKUP = "backup"
+CACHE_SOURCE_UNVERIFIED = "unverified"
+
+
+class KumoCacheError(ValueError):
+    """The cache is not usable."""
+
+
+class KumoCache(NamedTuple):
+    """A loaded cache and how far it could be trusted."""
+
+    kumo_dict: list[Any]
+    source: str
+
+    @property
+    def verified(self) -> bool:
+        """Return True if the cache matched its recorded checksum."""
+        return self.source != CACHE_SOURCE_UNVERIFIED
+
+
+def cache_checksum(kumo_dict: list[Any]) -> str:
+    """Return the SHA-256 of the canonical JSON of `kumo_dict`."""
+    canonical = json.dumps(kumo_dict, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def zone_tables(kumo_dict: Any) -> list[dict[str, Any]]:
+    """Return the zone table of every child and grandchild of `kumo_dict`.
+
+    These are the tables pykumo reads units from. Raises KeyError, IndexError
+    or TypeError if `kumo_dict` is malformed.
+    """
+    tables = []
+    for child in kumo_dict[2]["children"]:
+        tables.append(child["zoneTable"])
+        tables.extend(
+            grandchild["zoneTable"] for grandchild in child.get("children", [])
+        )
+    return tables
+
+
+def zone_units(kumo_dict: list[Any]) -> dict[str, dict[str, Any]]:
+    """Return serial -> unit across all zone tables of `kumo_dict`."""
+    return {
+        serial: unit
+        for table in zone_tables(kumo_dict)
+        for serial, unit in table.items()
+    }
+
+
+def validate_cache(kumo_dict: Any) -> int:
+    """Return the number of units in `kumo_dict`, raising KumoCacheError if malformed."""
+    try:
+        tables = zone_tables(kumo_dict)
+    except (KeyError, IndexError, TypeError) as err:
+        raise KumoCacheError("no zone table") from err
+    if not tables or not all(isinstance(table, dict) for table in tables):
+        raise KumoCacheError("no zone table")
+    units = 0
+    for serial, unit in zone_units(kumo_dict).items():
+        if not isinstance(unit, dict):
+            raise KumoCacheError(f"unit {serial} is not an object")
+        if not unit.get("password") or not unit.get("cryptoSerial"):
+            # pykumo skips units without credentials.
+            continue
+        try:
+            base64.b64decode(unit["password"], validate=True)
+            bytearray.fromhex(unit["cryptoSerial"])
+        except (TypeError, ValueError, binascii.Error) as err:
+            raise KumoCacheError(f"unit {serial} has invalid credentials") from err
+        units += 1
+    if not units:
+        raise KumoCacheError("no units with credentials")
+    return units
+
+
+def unaddressed_units(kumo_dict: list[Any]) -> list[str]:
+    """Return the serials of units with credentials but no address."""
+    return [
+        serial
+        for serial, unit in zone_units(kumo_dict).items()
+        if unit.get("password") and unit.get("cryptoSerial") and not unit.get("address")
+    ]
+
+
+def normalize_mac(mac: str | None) -> str:
+    """Return `mac` in lower case without separators, as DHCP reports it."""
+    return (mac or "").replace(":", "").replace("-", "").lower()
+
+
+def apply_dhcp_addresses(
+    kumo_dict: list[Any], candidate_ips: dict[str, str]
+) -> list[str]:
+    """Move units to the address DHCP discovery saw for their MAC.
+
+    Returns the serials whose address changed.
+    """
+    addresses = {normalize_mac(mac): address for mac, address in candidate_ips.items()}
+    moved = []
+    for serial, unit in zone_units(kumo_dict).items():
+        address = addresses.get(normalize_mac(unit.get("mac")))
+        if address and address != unit.get("address"):
+            unit["address"] = address
+            moved.append(serial)
+    return moved
+
+
+def _cache_files(entry_id: str | None) -> tuple[str, str, str]:
+    """Return the cache, metadata and backup file names of `entry_id`.
+
+    None names the legacy files shared by all entries.
+    """
+    if entry_id is None:
+        return KUMO_LEGACY_CACHE, KUMO_LEGACY_CACHE_META, KUMO_LEGACY_CACHE_BACKUP
+    return (
+        KUMO_CONFIG_CACHE.format(entry_id),
+        KUMO_CONFIG_CACHE_META.format(entry_id),
+        KUMO_CONFIG_CACHE_BACKUP.format(entry_id),
+    )
+
+
+def _read(path: str) -> Any:
+    try:
+        return load_json(path, default=None)
+    except HomeAssistantError as err:
+        _LOGGER.warning("Could not read %s: %s", path, err)
+        return None
+
+
+def _checked(kumo_dict: Any, checksum: str | None) -> bool:
+    try:
+        validate_cache(kumo_dict)
+    except KumoCacheError:
+        return False
+    return checksum is None or cache_checksum(kumo_dict) == checksum
+
+
+def load_cache(config_dir: str, entry_id: str | None) -> KumoCache | None:
+    """Return the cache of `entry_id` that can be trusted most, if any."""
+    cache_file, meta_file, backup_file = _cache_files(entry_id)
+    meta = _read(os.path.join(config_dir, meta_file))
+    checksum = None
+    if isinstance(meta, dict) and meta.get("version") == CACHE_SCHEMA_VERSION:
+        checksum = meta.get("sha256")
+
+    kumo_dict = _read(os.path.join(config_dir, cache_file))
+    if checksum is not None:
+        if _checked(kumo_dict, checksum):
+            return KumoCache(kumo_dict, CACHE_SOURCE_VERIFIED)
+        backup = _read(os.path.join(config_dir, backup_file))
+        if _checked(backup, checksum):
+            _LOGGER.warning(
+                "%s does not match its checksum; using the last known good copy",
+                cache_file,
+            )
+            return KumoCache(backup, CACHE_SOURCE_BACKUP)
+    if kumo_dict is not None and _checked(kumo_dict, None):
+        return KumoCache(kumo_dict, CACHE_SOURCE_UNVERIFIED)
+    if kumo_dict is not None:
+        _LOGGER.warning("Ignoring malformed %s", cache_file)
+    return None
+
+
+def save_cache(config_dir: str, entry_id: str, kumo_dict: list[Any]) -> None:
+    """Write the cache of `entry_id`, its checksum and its last-known-good backup."""
+    cache_file, meta_file, backup_file = _cache_files(entry_id)
+    # The metadata is written between the cache and the backup, so an
+    # interrupted save always leaves one of them matching the checksum.
+    # The cache holds unit credentials, hence private files.
+    save_json(
+        os.path.join(config_dir, cache_file),
+        kumo_dict,
+        private=True,
+        atomic_writes=True,
+    )
+    save_json(
+        os.path.join(config_dir, meta_file),
+        {"version": CACHE_SCHEMA_VERSION, "sha256": cache_checksum(kumo_dict)},
+        atomic_writes=True,
+    )
+    save_json(
+        os.path.join(config_dir, backup_file),
+        kumo_dict,
+        private=True,
+        atomic_writes=True,
+    )
+
+
+def remove_cache(config_dir: str, entry_id: str | None) -> None:
+    """Delete the cache files of `entry_id`."""
+    for name in _cache_files(entry_id):
+        try:
+            os.remove(os.path.join(config_dir, name))
+        except FileNotFoundError:
+            pass
+
+
+def _owned(child: dict[str, Any], serials: set[str]) -> dict[str, Any]:
+    """Return `child` with only the units of `serials`, grandchildren included."""
+    owned = {
+        **child,
+        "zoneTable": {
+            serial: unit
+            for serial, unit in child["zoneTable"].items()
+            if serial in serials
+        },
+    }
+    if "children" in child:
+        owned["children"] = [
+            _owned(grandchild, serials) for grandchild in child["children"]
+        ]
+    return owned
+
+
+def migrate_legacy_cache(
+    config_dir: str,
+    entry_id: str,
+    serials: set[str] | None,
+    entry_ids: list[str],
+) -> KumoCache | None:
+    """Give `entry_id` its units from the legacy shared cache, if there is one.
+
+    `serials` are the units the entry owns, or None if it owns all of them.
+    The legacy files are removed once every entry of `entry_ids` has a
+    cache of its own.
+    """
+    legacy = load_cache(config_dir, None)
+    if legacy is None:
+        return None
+    kumo_dict = legacy.kumo_dict
+    if serials is not None:
+        children = [_owned(child, serials) for child in kumo_dict[2]["children"]]
+        kumo_dict = [*kumo_dict[:2], {**kumo_dict[2], "children": children}]
+    cache = None
+    try:
+        validate_cache(kumo_dict)
+    except KumoCacheError:
+        _LOGGER.debug("No units of entry %s in %s", entry_id, KUMO_LEGACY_CACHE)
+    else:
+        save_cache(config_dir, entry_id, kumo_dict)
+        _LOGGER.info("Moved the units of entry %s to its own cache", entry_id)
+        cache = KumoCache(kumo_dict, legacy.source)
+    if all(
+        os.path.exists(os.path.join(config_dir, _cache_files(other)[0]))
+        for other in entry_ids
+    ):
+        remove_cache(config_dir, None)
+    return cache
+
+
+async def async_load_cache(
+    hass: HomeAssistant, entry_id: str | None
+) -> KumoCache | None:
+    """Load the cache of `entry_id`, taking its units from the legacy cache once.
+
+    None loads the legacy cache itself.
+    """
+    config_dir = hass.config.config_dir
+    cache = await hass.async_add_executor_job(load_cache, config_dir, entry_id)
+    if cache is not None or entry_id is None:
+        return cache
+    entry_ids = [entry.entry_id for entry in hass.config_entries.async_entries(DOMAIN)]
+    serials = None
+    if len(entry_ids) > 1:
+        # The legacy cache held the units of whichever entry saved last;
+        # only take those registered to this entry.
+        device_registry = dr.async_get(hass)
+        serials = {
+            identifier
+            for device in dr.async_entries_for_config_entry(device_registry, entry_id)
+            for domain, identifier in device.identifiers
+            if domain == DOMAIN
+        }
+    return await hass.async_add_executor_job(
+        migrate_legacy_cache, config_dir, entry_id, serials, entry_ids
+    )
+
+
+async def async_save_cache(
+    hass: HomeAssistant, entry_id: str, kumo_dict: list[Any]
+) -> None:
+    """Save the cache of `entry_id` to the configuration directory."""
+    await hass.async_add_executor_job(
+        save_cache, hass.config.config_dir, entry_id, kumo_dict
+    )
+    get_integration_metrics(hass).cache_writes += 1
+
+
+async def async_remove_cache(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the cache of a removed entry; it holds unit credentials."""
+    await hass.async_add_executor_job(remove_cache, hass.config.config_dir, entry_id)
@@ -0,0 +1,223 @@
+"""Record adapter traffic to a file and replay it later.
+
+A capture wraps the ``_request`` method of every loaded pykumo device, so it
+sees exactly the request/response pairs the coordinator and command paths
+exchange with the adapters, together with how long each took. Captures are
+written as gzip-compressed JSON lines: a header line describing the units,
+then one line per request. Units are identified by position rather than by
+serial or name, and MAC addresses and other identifying fields in responses
+are redacted before anything is written.
+
+``KumoReplayTransport`` feeds a capture back into pykumo devices in place of
+the network, at the original or an accelerated speed.
+"""
+
+from __future__ import annotations
+
+import copy
+import gzip
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_FILE_PREFIX = "kumo_capture_"
+CAPTURE_VERSION = 1
+MAX_CAPTURE_EVENTS = 100_000
+
+# Identifying fields that appear in adapter responses.
+CAPTURE_REDACT = {
+    "macAddress",
+    "serialNumber",
+    "uuid",
+    "SSID",
+    "BSSID",
+    "ssid",
+    "ipAddress",
+    "password",
+}
+
+
+def _decode(post_data: bytes | str) -> Any:
+    if isinstance(post_data, bytes):
+        post_data = post_data.decode("utf-8")
+    try:
+        return json.loads(post_data)
+    except ValueError:
+        return post_data
+
+
+def _request_key(request: Any) -> str:
+    return json.dumps(request, sort_keys=True, separators=(",", ":"))
+
+
+class KumoCapture:
+    """Record the adapter requests of a set of coordinators for a while."""
+
+    def __init__(
+        self, hass: HomeAssistant, coordinators: list, duration: timedelta
+    ) -> None:
+        """Initialize the capture for the given coordinators."""
+        self._hass = hass
+        self._duration = duration
+        self._devices = {
+            f"unit_{index}": coordinator.get_device()
+            for index, coordinator in enumerate(coordinators, start=1)
+        }
+        self._events: list[dict[str, Any]] = []
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._start = 0.0
+        self._unsub_timer: Callable[[], None] | None = None
+        self.path = hass.config.path(
+            f"{CAPTURE_FILE_PREFIX}{dt_util.utcnow().strftime('%Y%m%d-%H%M%S')}"
+            ".jsonl.gz"
+        )
+
+    @property
+    def active(self) -> bool:
+        """Return True while requests are being recorded."""
+        return self._unsub_timer is not None
+
+    @callback
+    def async_start(self) -> None:
+        """Start recording."""
+        self._start = time.monotonic()
+        for unit_id, device in self._devices.items():
+            device._request = self._wrap(unit_id, device._request)
+        self._unsub_timer = async_call_later(
+            self._hass, self._duration, self._async_stop
+        )
+        _LOGGER.info(
+            "Capturing Kumo adapter traffic of %d units for %s",
+            len(self._devices),
+            self._duration,
+        )
+
+    def _wrap(self, unit_id: str, request: Callable[[bytes], dict]):
+        def _recording_request(post_data):
+            start = time.monotonic()
+            response = request(post_data)
+            end = time.monotonic()
+            event = {
+                "t": round(start - self._start, 4),
+                "unit": unit_id,
+                "duration": round(end - start, 4),
+                "request": _decode(post_data),
+                "response": response,
+            }
+            with self._lock:
+                if len(self._events) < MAX_CAPTURE_EVENTS:
+                    self._events.append(event)
+                else:
+                    self._dropped += 1
+            return response
+
+        return _recording_request
+
+    @callback
+    def _async_stop(self, _now=None) -> None:
+        self._unsub_timer = None
+        for device in self._devices.values():
+            # Drop the instance attribute to expose the class method again.
+            device.__dict__.pop("_request", None)
+        with self._lock:
+            events, self._events = self._events, []
+        header = {
+            "version": CAPTURE_VERSION,
+            "created": dt_util.utcnow().isoformat(),
+            "units": {
+                unit_id: {"type": type(device).__name__}
+                for unit_id, device in self._devices.items()
+            },
+            "events": len(events),
+            "dropped": self._dropped,
+        }
+        self._hass.async_create_task(self._async_write(header, events))
+
+    async def _async_write(
+        self, header: dict[str, Any], events: list[dict[str, Any]]
+    ) -> None:
+        await self._hass.async_add_executor_job(self._write, header, events)
+        _LOGGER.info(
+            "Kumo capture of %d requests written to %s", len(events), self.path
+        )
+
+    def _write(self, header: dict[str, Any], events: list[dict[str, Any]]) -> None:
+        with gzip.open(self.path, "wt", encoding="utf-8") as file:
+            file.write(json.dumps(header) + "\n")
+            for event in events:
+                file.write(json.dumps(async_redact_data(event, CAPTURE_REDACT)) + "\n")
+
+
+def load_capture(path: str) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Return the header and events of a capture file."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(file.readline())
+        if header.get("version") != CAPTURE_VERSION:
+            raise ValueError(
+                f"Unsupported Kumo capture version: {header.get('version')}"
+            )
+        return header, [json.loads(line) for line in file if line.strip()]
+
+
+class KumoReplayTransport:
+    """Answer pykumo requests from a capture instead of the network.
+
+    Each unit's recorded responses are replayed per distinct request in the
+    order they were captured, wrapping around when exhausted, so a replayed
+    device can be polled indefinitely. A request that was never captured
+    gets an empty response, which pykumo treats as a failed request. The
+    recorded latency of each response is reproduced divided by `speed`;
+    a speed of 0 answers immediately.
+    """
+
+    def __init__(self, events: list[dict[str, Any]], speed: float = 1.0) -> None:
+        """Index the events of a capture."""
+        self._speed = speed
+        self._responses: dict[str, dict[str, list[tuple[dict, float]]]] = {}
+        self._cursors: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        for event in events:
+            by_request = self._responses.setdefault(event["unit"], {})
+            by_request.setdefault(_request_key(event["request"]), []).append(
+                (event["response"], event["duration"])
+            )
+
+    @property
+    def units(self) -> list[str]:
+        """Return the ids of the units in the capture."""
+        return list(self._responses)
+
+    def request_for(self, unit_id: str) -> Callable[[bytes], dict]:
+        """Return a replacement for a device's ``_request`` replaying `unit_id`."""
+        by_request = self._responses.get(unit_id, {})
+
+        def _replayed_request(post_data):
+            key = _request_key(_decode(post_data))
+            recorded = by_request.get(key)
+            if not recorded:
+                return {}
+            with self._lock:
+                cursor = self._cursors.get((unit_id, key), 0)
+                self._cursors[(unit_id, key)] = (cursor + 1) % len(recorded)
+            response, duration = recorded[cursor]
+            if self._speed > 0 and duration > 0:
+                time.sleep(duration / self._speed)
+            return copy.deepcopy(response)
+
+        return _replayed_request
+
+    def attach(self, device, unit_id: str) -> None:
+        """Make `device` answer its requests from the capture of `unit_id`."""
+        device._request = self.request_for(unit_id)
@@ -2,16 +2,25 @@
 
 import asyncio
 import logging
-import pprint
+import time
 
 import voluptuous as vol
 from homeassistant.components.climate import PLATFORM_SCHEMA
 from homeassistant.exceptions import ConfigEntryNotReady
 
-from .const import DOMAIN, KUMO_DATA, KUMO_DATA_COORDINATORS
+from .const import (
+    CONF_CLIMATE_ATTRIBUTES,
+    DEFAULT_CLIMATE_ATTRIBUTES,
+    DOMAIN,
+    KUMO_DATA,
+    KUMO_DATA_COORDINATORS,
+    SIGNAL_UNIT_ADDED,
+)
 from .coordinator import KumoDataUpdateCoordinator
+from .deadband import MEASUREMENT_SIGNAL
 from .entity import CoordinatedKumoEntity
-from .last_hvac_mode import get_last_hvac_mode, set_last_hvac_mode_value
+from .last_hvac_mode import get_last_hvac_mode_store
+from .metrics import KIND_COMMAND
 from .temperature import c_to_f, f_to_c
 
 try:
@@ -30,7 +39,8 @@ from homeassistant.components.climate.const import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_BATTERY_LEVEL, ATTR_TEMPERATURE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -108,10 +118,36 @@ async def async_setup_entry(
         raise ConfigEntryNotReady("Kumo integration found no indoor units")
     async_add_entities(entities, True)
 
+    @callback
+    def _async_unit_added(serial: str) -> None:
+        coordinator = coordinators[serial]
+        if coordinator.indoor_unit:
+            _LOGGER.debug("Adding entity: %s", coordinator.get_device().get_name())
+            async_add_entities([KumoThermostat(coordinator)], True)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_UNIT_ADDED.format(entry.entry_id), _async_unit_added
+        )
+    )
+
 
 class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
     """Representation of a Kumo Thermostat device."""
 
+    # These change far more often than the thermal state; keep them out of
+    # the recorder when they are still shown as attributes.
+    _unrecorded_attributes = frozenset(
+        {
+            ATTR_BATTERY_LEVEL,
+            ATTR_FILTER_DIRTY,
+            ATTR_DEFROST,
+            ATTR_RSSI,
+            ATTR_SENSOR_RSSI,
+            ATTR_RUNSTATE,
+        }
+    )
+
     _update_properties = [
         "current_humidity",
         "hvac_mode",
@@ -135,7 +171,7 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
 
         super().__init__(coordinator)
         coordinator.add_update_method(self.update)
-        self._name = self._pykumo.get_name()
+        self._name = self._label
         self._target_temperature = None
         self._target_temperature_low = None
         self._target_temperature_high = None
@@ -152,6 +188,23 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
         self._sensor_rssi = None
         self._runstate = None
         self._pending_refresh_task: asyncio.Task | None = None
+        self._read_poll = False
+        entry = coordinator.config_entry
+        options = entry.options if entry else {}
+        self._last_hvac_modes = (
+            get_last_hvac_mode_store(coordinator.hass, entry.entry_id)
+            if entry
+            else None
+        )
+        self._legacy_attributes = options.get(
+            CONF_CLIMATE_ATTRIBUTES, DEFAULT_CLIMATE_ATTRIBUTES
+        )
+        # The signal strengths move by a dB or two on almost every poll;
+        # only carry significant changes into the climate attributes.
+        self._rssi_filter = coordinator.get_filter("climate_rssi", MEASUREMENT_SIGNAL)
+        self._sensor_rssi_filter = coordinator.get_filter(
+            "climate_sensor_rssi", MEASUREMENT_SIGNAL
+        )
         # Initialise to safe defaults; _refresh_capabilities() will populate
         # properly once the unit profile is available (either now at startup
         # if the adapter is online, or after the first successful poll).
@@ -250,6 +303,7 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
 
     async def update(self):
         """Call from HA to trigger a refresh of cached state."""
+        self._read_poll = True
         for prop in KumoThermostat._update_properties:
             self._update_property(prop)
             if not self.available:
@@ -320,19 +374,19 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
 
     def _get_cached_last_hvac_mode(self):
         """Return the cached last active hvac mode, if any."""
-        if not self.hass or self._identifier is None:
+        if self._last_hvac_modes is None or self._identifier is None:
             return None
-        return get_last_hvac_mode(self.hass, self._identifier, self._hvac_modes)
+        return self._last_hvac_modes.get_mode(self._identifier, self._hvac_modes)
 
     def _store_last_hvac_mode(self, hvac_mode, caller):
         """Persist last active hvac mode for turn_on."""
         if (
             hvac_mode in (None, HVACMode.OFF)
-            or not self.hass
+            or self._last_hvac_modes is None
             or self._identifier is None
         ):
             return
-        set_last_hvac_mode_value(self.hass, self._identifier, hvac_mode.value)
+        self._last_hvac_modes.async_set(self._identifier, hvac_mode.value)
         _LOGGER.debug(
             "Kumo %s saved last hvac mode %s (via `%s`)",
             self._name,
@@ -484,7 +538,8 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
     def _update_rssi(self):
         """Refresh the cached rssi attribute."""
         rssi = self._pykumo.get_wifi_rssi()
-        self._rssi = rssi
+        self._rssi_filter.update(rssi, time.monotonic())
+        self._rssi = self._rssi_filter.value
 
     @property
     def sensor_rssi(self):
@@ -494,7 +549,8 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
     def _update_sensor_rssi(self):
         """Refresh the cached sensor_rssi attribute."""
         rssi = self._pykumo.get_sensor_rssi()
-        self._sensor_rssi = rssi
+        self._sensor_rssi_filter.update(rssi, time.monotonic())
+        self._sensor_rssi = self._sensor_rssi_filter.value
 
     @property
     def runstate(self):
@@ -518,7 +574,15 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
 
     @property
     def extra_state_attributes(self):
-        """Return the state attributes of the device."""
+        """Return the state attributes of the device.
+
+        The unit's diagnostic values have their own binary sensor and sensor
+        entities; they are only repeated here for installations that enabled
+        the climate_attributes option (on by default for entries created
+        before those entities existed).
+        """
+        if not self._legacy_attributes:
+            return None
         attr = {}
         if self._battery_percent is not None:
             attr[ATTR_BATTERY_LEVEL] = self._battery_percent
@@ -561,10 +625,25 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
         """Schedule a debounced post-command refresh, canceling any pending one."""
         if self._pending_refresh_task is not None:
             self._pending_refresh_task.cancel()
-        self._pending_refresh_task = self.hass.async_create_task(
-            self._delayed_refresh()
+        # As an entry task, the refresh is also cancelled when the entry
+        # unloads, even if this entity is never removed on its own.
+        self._pending_refresh_task = (
+            self.coordinator.config_entry.async_create_background_task(
+                self.hass, self._delayed_refresh(), name=f"Kumo {self._name} refresh"
+            )
         )
 
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the coordinator and pick up data it already has."""
+        await super().async_added_to_hass()
+        # When several platforms ask the coordinator for a refresh at setup,
+        # the request made on behalf of this entity can be debounced and the
+        # refresh finish before we subscribed; use its result now instead of
+        # showing an unknown state until the next poll. A poll this entity
+        # already read is not read again, so its filters see it only once.
+        if self._coordinator.get_available() and not self._read_poll:
+            await self.update()
+
     async def async_will_remove_from_hass(self) -> None:
         """Cancel any pending refresh task when entity is removed."""
         if self._pending_refresh_task is not None:
@@ -577,7 +656,7 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
         _LOGGER.debug(
             "Kumo %s set temp: %s, current mode %s",
             self._name,
-            pprint.pformat(kwargs),
+            kwargs,
             self._hvac_mode,
         )
 
@@ -631,22 +710,51 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
                 target["heat"] = f_to_c(target["heat"])
 
         if "cool" in target:
-            response = await self.hass.async_add_executor_job(
-                self._pykumo.set_cool_setpoint, target["cool"]
+            self._count_noop_command(
+                "cool setpoint", self._pykumo.get_cool_setpoint(), target["cool"]
+            )
+            response = await self._coordinator.async_device_call(
+                KIND_COMMAND, self._pykumo.set_cool_setpoint, target["cool"]
             )
             _LOGGER.debug(
-                "Kumo %s set %s temp response: %s", self._name, "cool", str(response)
+                "Kumo %s set %s temp response: %s", self._name, "cool", response
             )
         if "heat" in target:
-            response = await self.hass.async_add_executor_job(
-                self._pykumo.set_heat_setpoint, target["heat"]
+            self._count_noop_command(
+                "heat setpoint", self._pykumo.get_heat_setpoint(), target["heat"]
+            )
+            response = await self._coordinator.async_device_call(
+                KIND_COMMAND, self._pykumo.set_heat_setpoint, target["heat"]
             )
             _LOGGER.debug(
-                "Kumo %s set %s temp response: %s", self._name, "heat", str(response)
+                "Kumo %s set %s temp response: %s", self._name, "heat", response
             )
 
         self._schedule_refresh()
 
+    def _count_noop_command(self, command, current, requested) -> None:
+        """Count a command that pykumo's cached status says changes nothing.
+
+        The cached status can be a poll interval old, and the unit may have
+        been changed by its remote since, so the command is still sent.
+        Setpoints are compared to a tenth of a degree, as they may have
+        been converted from Fahrenheit.
+        """
+        if current is None or requested is None:
+            return
+        if isinstance(current, float) or isinstance(requested, float):
+            noop = abs(float(current) - float(requested)) < 0.1
+        else:
+            noop = current == requested
+        if noop:
+            self._coordinator.metrics.noop_commands += 1
+            _LOGGER.debug(
+                "Kumo %s sending %s command that looks like a no-op: already %s",
+                self._name,
+                command,
+                requested,
+            )
+
     async def async_set_hvac_mode(
         self, hvac_mode, caller="async_set_hvac_mode", refresh=True
     ):
@@ -660,7 +768,10 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
             _LOGGER.warning("Kumo %s is not available", self._name)
             return
 
-        response = await self.hass.async_add_executor_job(self._pykumo.set_mode, mode)
+        self._count_noop_command("mode", self._pykumo.get_mode(), mode)
+        response = await self._coordinator.async_device_call(
+            KIND_COMMAND, self._pykumo.set_mode, mode
+        )
         _LOGGER.debug(
             "Kumo %s set mode %s (via `%s`) response: %s",
             self._name,
@@ -678,8 +789,11 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
             _LOGGER.warning("Kumo %s is not available", self._name)
             return
 
-        response = await self.hass.async_add_executor_job(
-            self._pykumo.set_vane_direction, swing_mode
+        self._count_noop_command(
+            "swing mode", self._pykumo.get_vane_direction(), swing_mode
+        )
+        response = await self._coordinator.async_device_call(
+            KIND_COMMAND, self._pykumo.set_vane_direction, swing_mode
         )
         _LOGGER.debug("Kumo %s set swing mode response: %s", self._name, response)
         self._schedule_refresh()
@@ -690,8 +804,9 @@ class KumoThermostat(CoordinatedKumoEntity, ClimateEntity):
             _LOGGER.warning("Kumo %s is not available", self._name)
             return
 
-        response = await self.hass.async_add_executor_job(
-            self._pykumo.set_fan_speed, fan_mode
+        self._count_noop_command("fan mode", self._pykumo.get_fan_speed(), fan_mode)
+        response = await self._coordinator.async_device_call(
+            KIND_COMMAND, self._pykumo.set_fan_speed, fan_mode
         )
         _LOGGER.debug("Kumo %s set fan speed response: %s", self._name, response)
         self._schedule_refresh()
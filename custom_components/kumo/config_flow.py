@@ -1,8 +1,11 @@
 """Config flow for Kumo integration."""
 
+import asyncio
+import ipaddress
 import logging
-import os
+import re
 
+import requests
 import voluptuous as vol
 from homeassistant import config_entries, core, exceptions
 
@@ -11,28 +14,57 @@ try:
 except ImportError:
     from homeassistant.components.dhcp import DhcpServiceInfo
 from homeassistant.core import callback
-from homeassistant.util.json import load_json
-from homeassistant.helpers.json import save_json
-from pykumo import KumoCloudAccount
-from requests.exceptions import ConnectionError
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
+from pykumo import KumoCloudV3
+from pykumo.py_kumo_cloud_account_v3 import V3_BASE_URL, V3_CLOUD_TIMEOUT
 
 from .const import (
+    CONF_CLIMATE_ATTRIBUTES,
     CONF_CONNECT_TIMEOUT,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_KUMO_CACHE,
     CONF_POST_COMMAND_REFRESH_DELAY,
     CONF_RESPONSE_TIMEOUT,
     CONF_SCAN_INTERVAL,
+    CONF_STATION_SCAN_INTERVAL,
+    CONF_SIGNAL_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_TOPOLOGY_SYNC_INTERVAL,
+    DEFAULT_CLIMATE_ATTRIBUTES,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_HUMIDITY_DEADBAND,
     DEFAULT_POST_COMMAND_REFRESH_DELAY,
+    DEFAULT_RESPONSE_TIMEOUT,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATION_SCAN_INTERVAL,
+    DEFAULT_SIGNAL_DEADBAND,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_TOPOLOGY_SYNC_INTERVAL,
     DHCP_DISCOVERED_KEY,
     DOMAIN,
-    KUMO_CONFIG_CACHE,
 )
+from .cache import async_load_cache, async_save_cache
+from .discovery import (
+    KUMO_PORT,
+    SCAN_MAX_HOSTS,
+    async_probe_units,
+    async_scan_network,
+)
+from .transport import get_transport
 
 DEFAULT_PREFER_CACHE = False
 _LOGGER = logging.getLogger(__name__)
 EDIT_KEY = "edit_selection"
 EDIT_TIMEOUT = "Timeouts"
 EDIT_UNITS = "Unit Settings"
+EDIT_FILTERS = "Reporting Filters"
+EDIT_SCAN = "Scan Network"
+EDIT_BULK = "Bulk Addresses"
+CONF_SUBNET = "subnet"
+CONF_ADDRESSES = "addresses"
+CONF_APPLY_UNANSWERED = "apply_unanswered"
 
 
 class PlaceholderAccount:
@@ -80,6 +112,63 @@ def _set_unit_address(kumo_cache, label, address):
             return
 
 
+# `label or serial, address`, with optional quotes as in CSV.
+_ADDRESS_LINE = re.compile(r'"?(.+?)"?\s*[,;\t=]\s*"?([^",;\t=\s]+)"?')
+
+
+def _valid_address(address):
+    """Return True for an IP address, optionally followed by `:port`."""
+    host, sep, port = address.rpartition(":")
+    if not sep or ":" in host:
+        # No port, or a bare IPv6 address.
+        host, port = address, ""
+    elif not port.isdigit():
+        return False
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+def _parse_address_lines(text, kumo_cache):
+    """Parse `label or serial, address` lines into serial -> address.
+
+    Labels match case-insensitively. Commas, semicolons, tabs and `=` are
+    accepted as separators, so CSV pasted from a spreadsheet works. Returns
+    the mapping and the numbers of the lines that could not be used.
+    """
+    serials = {}
+    for serial, raw_unit in _iter_zone_units(kumo_cache):
+        serials[serial.lower()] = serial
+        serials[_get_unit_label(raw_unit, serial).lower()] = serial
+
+    addresses = {}
+    bad_lines = []
+    header = True
+    for number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.rstrip(",;=\t ").strip('"').lower() in serials:
+            # A unit without an address is left as it is.
+            header = False
+            continue
+        match = _ADDRESS_LINE.fullmatch(line)
+        serial = match and serials.get(match.group(1).lower())
+        address_ok = match is not None and _valid_address(match.group(2))
+        if header and not serial and not address_ok:
+            # A CSV header such as `label,address`.
+            header = False
+            continue
+        header = False
+        if not serial or not address_ok:
+            bad_lines.append(number)
+            continue
+        addresses[serial] = match.group(2)
+    return addresses, bad_lines
+
+
 def _merge_cache_addresses(kumo_cache, cached_json):
     """Merge IP addresses from cached_json into kumo_cache where missing."""
     # Build lookup of cached addresses
@@ -104,27 +193,29 @@ def _merge_cache_addresses(kumo_cache, cached_json):
 # ── Validation ──────────────────────────────────────────────
 
 
-async def validate_input(hass: core.HomeAssistant, data):
-    """Validate the user input and return an authenticated account.
+def _cloud_reachable() -> bool:
+    """Return whether KumoCloud answers at all, whatever the answer."""
+    try:
+        response = requests.head(V3_BASE_URL, timeout=V3_CLOUD_TIMEOUT)
+    except requests.RequestException:
+        return False
+    return response.status_code < 500
 
-    Returns {"title": ..., "account": KumoCloudAccount}.
-    """
-    # Collect DHCP-discovered IPs
-    candidate_ips = hass.data.get(DHCP_DISCOVERED_KEY, {})
-    prefer_cache = data.get("prefer_cache", False)
 
-    account = KumoCloudAccount(data["username"], data["password"])
-    try:
-        result = await hass.async_add_executor_job(
-            account.try_setup, candidate_ips, prefer_cache
-        )
-    except ConnectionError:
-        raise CannotConnect
+async def validate_input(hass: core.HomeAssistant, data):
+    """Validate the credentials with KumoCloud, without contacting any unit.
 
-    if not result:
+    Returns {"title": ..., "cloud": KumoCloudV3} with the client logged in.
+    pykumo reports any failed login as False, so a failure is only blamed on
+    the credentials if KumoCloud can be reached.
+    """
+    cloud = KumoCloudV3(data["username"], data["password"])
+    if not await hass.async_add_executor_job(cloud.login):
+        if not await hass.async_add_executor_job(_cloud_reachable):
+            raise CannotConnect
         raise InvalidAuth
 
-    return {"title": data["username"], "account": account}
+    return {"title": data["username"], "cloud": cloud}
 
 
 # ── Config Flow ─────────────────────────────────────────────
@@ -134,8 +225,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Kumo."""
 
     VERSION = 1
+    MINOR_VERSION = 3
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_POLL
 
+    _probe_task: asyncio.Task | None = None
+
     async def async_step_dhcp(self, discovery_info: DhcpServiceInfo):
         """Handle discovery of a Kumo adapter via DHCP."""
         _LOGGER.info(
@@ -153,11 +247,17 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._abort_if_unique_id_configured()
 
         # If we already have any Kumo entry, we just absorb the discovery
-        # silently into the candidate list and trigger a reload to pick it up.
+        # silently into the candidate list. An adapter one of the entries
+        # knows only reloads that entry, and only if it moved; an unknown
+        # one may be a new unit of any account, so all of them reload.
         current_entries = self._async_current_entries()
         if current_entries:
-            for entry in current_entries:
-                self.hass.config_entries.async_schedule_reload(entry.entry_id)
+            owner = get_transport(self.hass).adapter_owner(discovery_info.macaddress)
+            if owner is None:
+                for entry in current_entries:
+                    self.hass.config_entries.async_schedule_reload(entry.entry_id)
+            elif owner[1] != discovery_info.ip:
+                self.hass.config_entries.async_schedule_reload(owner[0])
             return self.async_abort(reason="already_configured")
 
         # Prompt the user to set up the integration
@@ -172,60 +272,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         }
         errors = {}
         if user_input is not None:
-            # Set unique ID to the domain for the actual config entry.
-            await self.async_set_unique_id(DOMAIN)
+            # One entry per KumoCloud account.
+            await self.async_set_unique_id(user_input["username"].lower())
             self._abort_if_unique_id_configured()
 
             try:
                 info = await validate_input(self.hass, user_input)
-                account = info["account"]
-
-                self.kumo_cache = await self.hass.async_add_executor_job(
-                    account.get_raw_json
-                )
-                self.user_account_setup = user_input
-                self.title = info["title"]
-
-                # Merge cached addresses so manually-configured IPs aren't lost
-                cache_path = self.hass.config.path(KUMO_CONFIG_CACHE)
-                if os.path.exists(cache_path):
-                    cached_json = await self.hass.async_add_executor_job(
-                        load_json, cache_path
-                    )
-                    if cached_json and _merge_cache_addresses(
-                        self.kumo_cache, cached_json
-                    ):
-                        _LOGGER.info("Merged IP addresses from existing cache")
-
-                # Build unit list
-                self.units = []
-                for serial, raw_unit in _iter_zone_units(self.kumo_cache):
-                    self.units.append(
-                        {
-                            "label": _get_unit_label(raw_unit, serial),
-                            "ip_address": raw_unit.get("address", "empty") or "empty",
-                            "mac": raw_unit.get("mac", "unknown"),
-                            "serial": serial,
-                        }
-                    )
-
-                ip_addresses = [u["ip_address"] for u in self.units]
-                if "empty" in ip_addresses:
-                    return await self.async_step_request_ips()
-                else:
-                    await self.hass.async_add_executor_job(
-                        save_json,
-                        self.hass.config.path(KUMO_CONFIG_CACHE),
-                        self.kumo_cache,
-                    )
-                    return self.async_create_entry(
-                        title=info["title"],
-                        data={
-                            "username": user_input["username"],
-                            "password": user_input["password"],
-                            "prefer_cache": user_input["prefer_cache"],
-                        },
-                    )
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except InvalidAuth:
@@ -233,37 +285,141 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
+            else:
+                self.cloud = info["cloud"]
+                self.user_account_setup = user_input
+                self.title = info["title"]
+                return await self.async_step_probe_units()
 
         return self.async_show_form(
             step_id="user", data_schema=vol.Schema(data_schema), errors=errors
         )
 
+    async def async_step_probe_units(self, user_input=None):
+        """Fetch the units of the account and look for them on the network."""
+        if self._probe_task is None:
+            self._probe_task = self.hass.async_create_task(self._async_discover_units())
+        if not self._probe_task.done():
+            return self.async_show_progress(
+                step_id="probe_units",
+                progress_action="probe_units",
+                progress_task=self._probe_task,
+            )
+        try:
+            await self._probe_task
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected exception while discovering units")
+            return self.async_show_progress_done(next_step_id="no_units")
+        if not self.units:
+            return self.async_show_progress_done(next_step_id="no_units")
+        return self.async_show_progress_done(next_step_id="request_ips")
+
+    async def _async_discover_units(self) -> None:
+        """Build the zone table of the account and probe its units."""
+        devices = await self.hass.async_add_executor_job(
+            self.cloud.get_all_device_credentials
+        )
+        self.kumo_cache = [
+            {},
+            {},
+            {"children": [{"zoneTable": devices}]},
+        ]
+        # Keep manually-configured addresses of the account's units. The
+        # legacy shared cache may hold another account's units, so it is
+        # only trusted while no other entry exists.
+        cache = None
+        if not self._async_current_entries(include_ignore=False):
+            cache = await async_load_cache(self.hass, None)
+        if cache is not None and _merge_cache_addresses(
+            self.kumo_cache, cache.kumo_dict
+        ):
+            _LOGGER.info("Merged IP addresses from existing cache")
+
+        zone_units = dict(_iter_zone_units(self.kumo_cache))
+        self.units = [
+            {
+                "label": _get_unit_label(raw_unit, serial),
+                "ip_address": raw_unit.get("address", ""),
+                "mac": raw_unit.get("mac", "unknown"),
+                "serial": serial,
+                "answered": False,
+            }
+            for serial, raw_unit in zone_units.items()
+            if raw_unit.get("password") and raw_unit.get("cryptoSerial")
+        ]
+        units_by_serial = {unit["serial"]: unit for unit in self.units}
+
+        @callback
+        def _found(serial: str, address: str) -> None:
+            unit = units_by_serial[serial]
+            unit["ip_address"] = address
+            unit["answered"] = True
+            zone_units[serial]["address"] = address
+            answered = sum(1 for unit in self.units if unit["answered"])
+            self.async_update_progress(answered / len(self.units))
+
+        await async_probe_units(
+            self.hass,
+            {serial: zone_units[serial] for serial in units_by_serial},
+            self.hass.data.get(DHCP_DISCOVERED_KEY, {}).values(),
+            on_found=_found,
+        )
+
+    async def async_step_no_units(self, user_input=None):
+        """Abort when the account has no usable units."""
+        return self.async_abort(reason="no_units")
+
     async def async_step_request_ips(self, user_input=None):
-        data_schema = {}
-        for x in self.units:
-            if x["ip_address"] == "empty":
-                data_schema[
-                    vol.Required(x["label"], default=x["label"] + " " + x["mac"])
-                ] = str
+        """Confirm the addresses of units that did not answer."""
+        if user_input is None and all(unit["answered"] for unit in self.units):
+            return self.async_create_entry(
+                title=self.title,
+                data={
+                    "username": self.user_account_setup["username"],
+                    "password": self.user_account_setup["password"],
+                    "prefer_cache": self.user_account_setup["prefer_cache"],
+                    CONF_KUMO_CACHE: self.kumo_cache,
+                },
+            )
 
         if user_input is not None:
             for label, ip_addr in user_input.items():
-                _set_unit_address(self.kumo_cache, label, ip_addr)
-            await self.hass.async_add_executor_job(
-                save_json, self.hass.config.path(KUMO_CONFIG_CACHE), self.kumo_cache
-            )
+                if ip_addr:
+                    _set_unit_address(self.kumo_cache, label, ip_addr)
             return self.async_create_entry(
                 title=self.title,
                 data={
                     "username": self.user_account_setup["username"],
                     "password": self.user_account_setup["password"],
                     "prefer_cache": True,
+                    CONF_KUMO_CACHE: self.kumo_cache,
                 },
             )
+
+        # Every field starts at the address the probe found, or the last
+        # known one for units that did not answer.
+        data_schema = {}
+        for unit in self.units:
+            if unit["ip_address"]:
+                data_schema[vol.Optional(unit["label"], default=unit["ip_address"])] = (
+                    str
+                )
+            else:
+                data_schema[vol.Optional(unit["label"])] = str
         return self.async_show_form(
             step_id="request_ips",
             data_schema=vol.Schema(data_schema),
-            description_placeholders=self.user_account_setup,
+            description_placeholders={
+                "answered": ", ".join(
+                    unit["label"] for unit in self.units if unit["answered"]
+                )
+                or "-",
+                "missing": ", ".join(
+                    f"{unit['label']} ({unit['mac']})"
+                    for unit in self.units
+                    if not unit["answered"]
+                ),
+            },
         )
 
     @staticmethod
@@ -276,6 +432,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 class OptionsFlowHandler(config_entries.OptionsFlow):
     """Handle a option flow for Kumo."""
 
+    _scan_task: asyncio.Task | None = None
+    _bulk_task: asyncio.Task | None = None
+
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
         self._config_entry = config_entry
@@ -287,13 +446,19 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 return await self.async_step_timeout_settings()
             if user_input[EDIT_KEY] == EDIT_UNITS:
                 return await self.async_step_unit_select()
+            if user_input[EDIT_KEY] == EDIT_FILTERS:
+                return await self.async_step_filter_settings()
+            if user_input[EDIT_KEY] == EDIT_SCAN:
+                return await self.async_step_scan_network()
+            if user_input[EDIT_KEY] == EDIT_BULK:
+                return await self.async_step_bulk_addresses()
 
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
                     vol.Required(EDIT_KEY, default=EDIT_TIMEOUT): vol.In(
-                        [EDIT_TIMEOUT, EDIT_UNITS]
+                        [EDIT_TIMEOUT, EDIT_UNITS, EDIT_FILTERS, EDIT_SCAN, EDIT_BULK]
                     )
                 },
             ),
@@ -301,23 +466,37 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_timeout_settings(self, user_input=None):
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            return self.async_create_entry(
+                title="", data={**self._config_entry.options, **user_input}
+            )
 
         current = self._config_entry.options
         data_schema = vol.Schema(
             {
                 vol.Required(
                     CONF_CONNECT_TIMEOUT,
-                    default=float(current.get(CONF_CONNECT_TIMEOUT, 1.2)),
+                    default=float(
+                        current.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)
+                    ),
                 ): vol.Coerce(float),
                 vol.Required(
                     CONF_RESPONSE_TIMEOUT,
-                    default=float(current.get(CONF_RESPONSE_TIMEOUT, 8)),
+                    default=float(
+                        current.get(CONF_RESPONSE_TIMEOUT, DEFAULT_RESPONSE_TIMEOUT)
+                    ),
                 ): vol.Coerce(float),
                 vol.Required(
                     CONF_SCAN_INTERVAL,
                     default=int(current.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)),
                 ): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+                vol.Required(
+                    CONF_STATION_SCAN_INTERVAL,
+                    default=int(
+                        current.get(
+                            CONF_STATION_SCAN_INTERVAL, DEFAULT_STATION_SCAN_INTERVAL
+                        )
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
                 vol.Required(
                     CONF_POST_COMMAND_REFRESH_DELAY,
                     default=float(
@@ -327,16 +506,70 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         )
                     ),
                 ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=30.0)),
+                vol.Required(
+                    CONF_TOPOLOGY_SYNC_INTERVAL,
+                    default=int(
+                        current.get(
+                            CONF_TOPOLOGY_SYNC_INTERVAL, DEFAULT_TOPOLOGY_SYNC_INTERVAL
+                        )
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
             }
         )
 
         return self.async_show_form(step_id="timeout_settings", data_schema=data_schema)
 
+    async def async_step_filter_settings(self, user_input=None):
+        """Edit the deadbands that filter noisy sensor values."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="", data={**self._config_entry.options, **user_input}
+            )
+
+        current = self._config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_SIGNAL_DEADBAND,
+                    default=float(
+                        current.get(CONF_SIGNAL_DEADBAND, DEFAULT_SIGNAL_DEADBAND)
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=30.0)),
+                vol.Required(
+                    CONF_TEMPERATURE_DEADBAND,
+                    default=float(
+                        current.get(
+                            CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND
+                        )
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=5.0)),
+                vol.Required(
+                    CONF_HUMIDITY_DEADBAND,
+                    default=float(
+                        current.get(CONF_HUMIDITY_DEADBAND, DEFAULT_HUMIDITY_DEADBAND)
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=20.0)),
+                vol.Required(
+                    CONF_HEARTBEAT_INTERVAL,
+                    default=int(
+                        current.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL)
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                vol.Required(
+                    CONF_CLIMATE_ATTRIBUTES,
+                    default=bool(
+                        current.get(CONF_CLIMATE_ATTRIBUTES, DEFAULT_CLIMATE_ATTRIBUTES)
+                    ),
+                ): bool,
+            }
+        )
+
+        return self.async_show_form(step_id="filter_settings", data_schema=data_schema)
+
     async def async_step_unit_select(self, user_input=None):
         """Handle options flow."""
-        kumo_cache = await self.hass.async_add_executor_job(
-            load_json, self.hass.config.path(KUMO_CONFIG_CACHE)
-        )
+        cache = await async_load_cache(self.hass, self._config_entry.entry_id)
+        kumo_cache = cache.kumo_dict if cache is not None else []
 
         kumo_unit_list = {}
         for serial, raw_unit in _iter_zone_units(kumo_cache):
@@ -347,9 +580,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             _set_unit_address(
                 kumo_cache, user_input["unit_label"], user_input["ip_address"]
             )
-            await self.hass.async_add_executor_job(
-                save_json, self.hass.config.path(KUMO_CONFIG_CACHE), kumo_cache
-            )
+            await async_save_cache(self.hass, self._config_entry.entry_id, kumo_cache)
             return self.async_create_entry(title="", data=None)
 
         data_schema = vol.Schema(
@@ -361,6 +592,203 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
 
         return self.async_show_form(step_id="unit_select", data_schema=data_schema)
 
+    async def async_step_scan_network(self, user_input=None):
+        """Ask for the subnet to scan for the adapters of the cached units."""
+        errors = {}
+        if user_input is not None:
+            try:
+                network = ipaddress.ip_network(user_input[CONF_SUBNET], strict=False)
+            except ValueError:
+                errors[CONF_SUBNET] = "invalid_subnet"
+            else:
+                if network.version != 4 or network.num_addresses > SCAN_MAX_HOSTS + 2:
+                    errors[CONF_SUBNET] = "subnet_too_large"
+                else:
+                    self._scan_network = network
+                    return await self.async_step_scan_progress()
+
+        cache = await async_load_cache(self.hass, self._config_entry.entry_id)
+        self._kumo_cache = cache.kumo_dict if cache is not None else []
+        # Suggest the /24 of the first unit with a known address.
+        subnet = vol.UNDEFINED
+        for _, raw_unit in _iter_zone_units(self._kumo_cache):
+            host = (raw_unit.get("address") or "").split(":")[0]
+            try:
+                subnet = str(ipaddress.ip_network(f"{host}/24", strict=False))
+            except ValueError:
+                continue
+            break
+        return self.async_show_form(
+            step_id="scan_network",
+            data_schema=vol.Schema({vol.Required(CONF_SUBNET, default=subnet): str}),
+            errors=errors,
+        )
+
+    async def async_step_scan_progress(self, user_input=None):
+        """Scan the subnet while showing progress."""
+        if self._scan_task is None:
+            self._scan_task = self.hass.async_create_task(self._async_scan())
+        if not self._scan_task.done():
+            return self.async_show_progress(
+                step_id="scan_progress",
+                progress_action="scan_network",
+                progress_task=self._scan_task,
+                description_placeholders={CONF_SUBNET: str(self._scan_network)},
+            )
+        try:
+            await self._scan_task
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected exception while scanning")
+            self._scan_found = {}
+        return self.async_show_progress_done(next_step_id="scan_result")
+
+    async def _async_scan(self) -> None:
+        units = {
+            serial: raw_unit
+            for serial, raw_unit in _iter_zone_units(self._kumo_cache)
+            if raw_unit.get("password") and raw_unit.get("cryptoSerial")
+        }
+        self._scan_found = await async_scan_network(
+            self.hass,
+            self._scan_network,
+            units,
+            port=KUMO_PORT,
+            on_progress=self.async_update_progress,
+        )
+
+    async def async_step_scan_result(self, user_input=None):
+        """Show the adapters found and write their addresses in one go."""
+        if not self._scan_found:
+            return self.async_abort(reason="no_adapters_found")
+        if user_input is not None:
+            for serial, raw_unit in _iter_zone_units(self._kumo_cache):
+                if serial in self._scan_found:
+                    raw_unit["address"] = self._scan_found[serial]
+            await async_save_cache(
+                self.hass, self._config_entry.entry_id, self._kumo_cache
+            )
+            self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+            return self.async_create_entry(
+                title="", data=dict(self._config_entry.options)
+            )
+
+        found = [
+            f"{_get_unit_label(raw_unit, serial)} ({raw_unit.get('mac') or serial}): "
+            f"{raw_unit.get('address') or '-'} → {self._scan_found[serial]}"
+            for serial, raw_unit in _iter_zone_units(self._kumo_cache)
+            if serial in self._scan_found
+        ]
+        return self.async_show_form(
+            step_id="scan_result",
+            data_schema=vol.Schema({}),
+            description_placeholders={"found": "\n".join(found)},
+        )
+
+    async def async_step_bulk_addresses(self, user_input=None):
+        """Edit the addresses of many units at once."""
+        cache = await async_load_cache(self.hass, self._config_entry.entry_id)
+        self._kumo_cache = cache.kumo_dict if cache is not None else []
+        errors = {}
+        placeholders = {"lines": ""}
+        if user_input is not None:
+            addresses, bad_lines = _parse_address_lines(
+                user_input[CONF_ADDRESSES], self._kumo_cache
+            )
+            for serial, raw_unit in _iter_zone_units(self._kumo_cache):
+                if addresses.get(serial) == raw_unit.get("address"):
+                    del addresses[serial]
+            if bad_lines:
+                errors[CONF_ADDRESSES] = "invalid_lines"
+                placeholders["lines"] = ", ".join(str(line) for line in bad_lines)
+            elif not addresses:
+                errors[CONF_ADDRESSES] = "no_addresses"
+            else:
+                self._bulk_addresses = addresses
+                return await self.async_step_bulk_progress()
+            text = user_input[CONF_ADDRESSES]
+        else:
+            # Start from the current addresses, one unit per line.
+            text = "\n".join(
+                f"{_get_unit_label(raw_unit, serial)}, {raw_unit.get('address', '')}"
+                for serial, raw_unit in _iter_zone_units(self._kumo_cache)
+            )
+
+        return self.async_show_form(
+            step_id="bulk_addresses",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_ADDRESSES, default=text): TextSelector(
+                        TextSelectorConfig(multiline=True)
+                    )
+                }
+            ),
+            errors=errors,
+            description_placeholders=placeholders,
+        )
+
+    async def async_step_bulk_progress(self, user_input=None):
+        """Check the new addresses against the adapters."""
+        if self._bulk_task is None:
+            units = {
+                serial: {**raw_unit, "address": self._bulk_addresses[serial]}
+                for serial, raw_unit in _iter_zone_units(self._kumo_cache)
+                if serial in self._bulk_addresses
+            }
+            self._bulk_task = self.hass.async_create_task(
+                async_probe_units(self.hass, units)
+            )
+        if not self._bulk_task.done():
+            return self.async_show_progress(
+                step_id="bulk_progress",
+                progress_action="bulk_addresses",
+                progress_task=self._bulk_task,
+            )
+        try:
+            self._bulk_answered = await self._bulk_task
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected exception while checking addresses")
+            self._bulk_answered = {}
+        return self.async_show_progress_done(next_step_id="bulk_result")
+
+    async def async_step_bulk_result(self, user_input=None):
+        """Apply the addresses in one cache write."""
+        unanswered = [
+            serial
+            for serial in self._bulk_addresses
+            if serial not in self._bulk_answered
+        ]
+        if user_input is None and unanswered:
+            labels = {
+                serial: _get_unit_label(raw_unit, serial)
+                for serial, raw_unit in _iter_zone_units(self._kumo_cache)
+            }
+            return self.async_show_form(
+                step_id="bulk_result",
+                data_schema=vol.Schema(
+                    {vol.Required(CONF_APPLY_UNANSWERED, default=False): bool}
+                ),
+                description_placeholders={
+                    "answered": str(len(self._bulk_answered)),
+                    "unanswered": "\n".join(
+                        f"{labels[serial]}: {self._bulk_addresses[serial]}"
+                        for serial in unanswered
+                    ),
+                },
+            )
+
+        apply = dict(self._bulk_answered)
+        if user_input is not None and user_input[CONF_APPLY_UNANSWERED]:
+            apply = self._bulk_addresses
+        for serial, raw_unit in _iter_zone_units(self._kumo_cache):
+            if serial in apply:
+                raw_unit["address"] = apply[serial]
+        if apply:
+            await async_save_cache(
+                self.hass, self._config_entry.entry_id, self._kumo_cache
+            )
+            self.hass.config_entries.async_schedule_reload(self._config_entry.entry_id)
+        return self.async_create_entry(title="", data=dict(self._config_entry.options))
+
 
 class CannotConnect(exceptions.HomeAssistantError):
     """Error to indicate we cannot connect."""
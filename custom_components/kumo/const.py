@@ -9,18 +9,64 @@ DEFAULT_NAME = "Kumo"
 DOMAIN = "kumo"
 KUMO_DATA = "data"
 KUMO_DATA_COORDINATORS = "coordinators"
-KUMO_CONFIG_CACHE = "kumo_cache.json"
+KUMO_DATA_FLEET = "fleet"
+KUMO_DATA_HEALTH = "health"
+KUMO_DATA_LAST_HVAC_MODE = "last_hvac_mode"
+# Cache files of each entry, formatted with the entry id.
+KUMO_CONFIG_CACHE = "kumo_cache.{}.json"
+KUMO_CONFIG_CACHE_META = "kumo_cache.{}.meta.json"
+KUMO_CONFIG_CACHE_BACKUP = "kumo_cache.{}.json.bak"
+# Cache files shared by all entries before each had its own.
+KUMO_LEGACY_CACHE = "kumo_cache.json"
+KUMO_LEGACY_CACHE_META = "kumo_cache.meta.json"
+KUMO_LEGACY_CACHE_BACKUP = "kumo_cache.json.bak"
+# Entry data key handing the cache built by the config flow to the first setup.
+CONF_KUMO_CACHE = "kumo_cache"
 CONF_PREFER_CACHE = "prefer_cache"
 CONF_CONNECT_TIMEOUT = "connect_timeout"
 CONF_RESPONSE_TIMEOUT = "response_timeout"
+DEFAULT_CONNECT_TIMEOUT = 1.2  # seconds
+DEFAULT_RESPONSE_TIMEOUT = 8.0  # seconds
 CONF_SCAN_INTERVAL = "scan_interval"
 DEFAULT_SCAN_INTERVAL = 60  # seconds
+CONF_STATION_SCAN_INTERVAL = "station_scan_interval"
+DEFAULT_STATION_SCAN_INTERVAL = 300  # seconds
 CONF_POST_COMMAND_REFRESH_DELAY = "post_command_refresh_delay"
 DEFAULT_POST_COMMAND_REFRESH_DELAY = 2.0  # seconds
+CONF_SIGNAL_DEADBAND = "signal_deadband"
+DEFAULT_SIGNAL_DEADBAND = 3.0  # dB
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+DEFAULT_TEMPERATURE_DEADBAND = 0.0  # degrees, in the unit shown
+CONF_HUMIDITY_DEADBAND = "humidity_deadband"
+DEFAULT_HUMIDITY_DEADBAND = 1.0  # percent
+CONF_HEARTBEAT_INTERVAL = "heartbeat_interval"
+DEFAULT_HEARTBEAT_INTERVAL = 900  # seconds
+CONF_TOPOLOGY_SYNC_INTERVAL = "topology_sync_interval"
+DEFAULT_TOPOLOGY_SYNC_INTERVAL = 0  # minutes, 0 disables the resync
+CONF_CLIMATE_ATTRIBUTES = "climate_attributes"
+DEFAULT_CLIMATE_ATTRIBUTES = False
 MAX_AVAILABILITY_TRIES = 3  # How many times we will attempt to update from a kumo before marking it unavailable
 
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+DEFAULT_PROFILE_CYCLES = 3
+SERVICE_CAPTURE = "capture"
+ATTR_DURATION = "duration"
+DEFAULT_CAPTURE_DURATION = 300  # seconds
+KUMO_DATA_CAPTURE = "capture"
+SERVICE_REFRESH_CLOUD = "refresh_cloud"
+# Entry ids whose next setup should refresh the cache from KumoCloud.
+KUMO_DATA_CLOUD_REFRESH = "cloud_refresh"
+
 DHCP_DISCOVERED_KEY = f"{DOMAIN}_dhcp_discovered"
 
-PLATFORMS: Final = [Platform.CLIMATE, Platform.SENSOR]
+# Dispatcher signals of the topology resync, formatted with the entry id and
+# the unit serial respectively.
+SIGNAL_UNIT_ADDED = f"{DOMAIN}_unit_added_{{}}"
+SIGNAL_UNIT_RENAMED = f"{DOMAIN}_unit_renamed_{{}}"
+# Dispatcher signal sent when an entry unloads, formatted with the entry id.
+SIGNAL_ENTRY_UNLOADED = f"{DOMAIN}_entry_unloaded_{{}}"
+
+PLATFORMS: Final = [Platform.BINARY_SENSOR, Platform.CLIMATE, Platform.SENSOR]
 
 SCAN_INTERVAL = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
@@ -1,27 +1,87 @@
 """Coordinator to gather data for the Kumo integration"""
 
 import logging
+import time
 from collections.abc import Awaitable, Callable
 from datetime import timedelta
-from typing import TypeVar
+from typing import Any, TypeVar
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from pykumo import PyKumoBase
+from pykumo import PyKumo, PyKumoBase
 
 from .const import (
+    CONF_CONNECT_TIMEOUT,
     CONF_POST_COMMAND_REFRESH_DELAY,
+    CONF_RESPONSE_TIMEOUT,
+    CONF_SCAN_INTERVAL,
+    CONF_STATION_SCAN_INTERVAL,
+    DEFAULT_CONNECT_TIMEOUT,
     DEFAULT_POST_COMMAND_REFRESH_DELAY,
+    DEFAULT_RESPONSE_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATION_SCAN_INTERVAL,
     SCAN_INTERVAL,
 )
+from .deadband import KumoDeadbandFilter
+from .metrics import (
+    KIND_POLL,
+    OUTCOME_ERROR,
+    OUTCOME_OK,
+    OUTCOME_TIMEOUT,
+    KumoDeviceMetrics,
+)
+from .history import KumoHistory, history_readings
+from .profiler import KumoProfiler
+from .runtime import KumoRuntimeAccumulator, runtime_state
+from .trace import KumoTraceBuffer
+from .transport import get_transport
 
 _LOGGER = logging.getLogger(__name__)
 MAX_AVAILABILITY_TRIES = 3
 
+# Fields of a unit snapshot and the pykumo getters that provide them.
+INDOOR_UNIT_SNAPSHOT = {
+    "mode": "get_mode",
+    "standby": "get_standby",
+    "current_temperature": "get_current_temperature",
+    "heat_setpoint": "get_heat_setpoint",
+    "cool_setpoint": "get_cool_setpoint",
+    "fan_speed": "get_fan_speed",
+    "vane_direction": "get_vane_direction",
+    "humidity": "get_current_humidity",
+    "filter_dirty": "get_filter_dirty",
+    "defrost": "get_defrost",
+}
+STATION_SNAPSHOT = {"outdoor_temperature": "get_outdoor_temperature"}
+
 T = TypeVar("T")
 
 
+def device_timeouts(options) -> tuple[float, float]:
+    """Return the pykumo (connect, response) timeouts configured in `options`."""
+    return (
+        float(options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)),
+        float(options.get(CONF_RESPONSE_TIMEOUT, DEFAULT_RESPONSE_TIMEOUT)),
+    )
+
+
+def device_update_interval(options, device: PyKumoBase) -> timedelta:
+    """Return the poll interval configured in `options` for `device`."""
+    if isinstance(device, PyKumo):
+        return timedelta(
+            seconds=float(options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+        )
+    # Outdoor temperature changes slowly, so Kumo Stations are polled less
+    # often and their reading is shared with the indoor units.
+    return timedelta(
+        seconds=float(
+            options.get(CONF_STATION_SCAN_INTERVAL, DEFAULT_STATION_SCAN_INTERVAL)
+        )
+    )
+
+
 class KumoDataUpdateCoordinator(DataUpdateCoordinator):
     """DataUpdateCoordinator to gather data for a specific Kumo device."""
 
@@ -34,9 +94,25 @@ class KumoDataUpdateCoordinator(DataUpdateCoordinator):
     ) -> None:
         """Initialize DataUpdateCoordinator to gather data for specific Kumo device."""
         self.device = device
+        # The unit's name in KumoCloud, kept up to date by the topology resync.
+        self.label: str = device.get_name()
         self._available = False
         self._unavailable_count = 0
         self._additional_update_methods = []
+        self.metrics = KumoDeviceMetrics()
+        self.trace = KumoTraceBuffer()
+        self.profiler: KumoProfiler | None = None
+        self.filters: dict[str, KumoDeadbandFilter] = {}
+        self.indoor_unit = isinstance(device, PyKumo)
+        self.runtime: KumoRuntimeAccumulator | None = (
+            KumoRuntimeAccumulator() if self.indoor_unit else None
+        )
+        self.history: KumoHistory | None = KumoHistory() if self.indoor_unit else None
+        # Set by the account's KumoFleet, which shares the outdoor temperature.
+        self.fleet = None
+        # Set by the account's KumoHealthMonitor while this unit is shed.
+        self.shed = False
+        self._snapshot: dict[str, Any] | None = None
         super().__init__(
             hass,
             _LOGGER,
@@ -58,6 +134,47 @@ class KumoDataUpdateCoordinator(DataUpdateCoordinator):
             )
         return DEFAULT_POST_COMMAND_REFRESH_DELAY
 
+    @property
+    def _timeout_threshold(self) -> float:
+        """Return the elapsed time after which a failed call counts as a timeout."""
+        if self.config_entry is not None:
+            return float(
+                self.config_entry.options.get(
+                    CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT
+                )
+            )
+        return DEFAULT_CONNECT_TIMEOUT
+
+    def get_filter(self, key: str, measurement: str) -> KumoDeadbandFilter:
+        """Return the deadband filter for `key`, creating it from the options."""
+        deadband_filter = self.filters.get(key)
+        if deadband_filter is None:
+            options = self.config_entry.options if self.config_entry else {}
+            deadband_filter = KumoDeadbandFilter.from_options(options, measurement)
+            self.filters[key] = deadband_filter
+        return deadband_filter
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the unit's latest polled state as a flat dict.
+
+        The snapshot is built at most once per update, however many
+        subscribers ask for it.
+        """
+        if self._snapshot is None:
+            device = self.device
+            getters = INDOOR_UNIT_SNAPSHOT if self.indoor_unit else STATION_SNAPSHOT
+            snapshot = {"name": self.label, "available": self._available}
+            for field, getter in getters.items():
+                snapshot[field] = getattr(device, getter)()
+            self._snapshot = snapshot
+        return self._snapshot
+
+    @callback
+    def async_set_label(self, label: str) -> None:
+        """Record a new name of the unit in KumoCloud."""
+        self.label = label
+        self._snapshot = None
+
     def get_device(self) -> PyKumoBase:
         return self.device
 
@@ -68,17 +185,99 @@ class KumoDataUpdateCoordinator(DataUpdateCoordinator):
         """Register update methods that will be called after updating status"""
         self._additional_update_methods.append(update_method)
 
+    async def async_device_call(self, kind: str, func: Callable[..., T], *args) -> T:
+        """Run a blocking pykumo call through the transport and record its latency.
+
+        pykumo swallows transport errors and returns an empty response (or
+        False from update_status), so a falsy result that took at least the
+        connect timeout is counted as a timeout and anything else as an error.
+        """
+        metrics = self.metrics
+        start = time.monotonic()
+        started = start
+
+        def _job():
+            nonlocal started
+            started = time.monotonic()
+            return func(*args)
+
+        request_type = getattr(func, "__name__", kind)
+        wall_start = time.time()
+        metrics.in_flight += 1
+        try:
+            result = await get_transport(self.hass).async_run(
+                self.config_entry.entry_id if self.config_entry else None,
+                kind,
+                _job,
+                shed=self.shed and kind == KIND_POLL,
+            )
+        except Exception:
+            elapsed = time.monotonic() - start
+            metrics.record(kind, elapsed, OUTCOME_ERROR)
+            self.trace.record(request_type, wall_start, elapsed, OUTCOME_ERROR, 0)
+            raise
+        finally:
+            metrics.in_flight -= 1
+            metrics.executor_wait.observe(started - start)
+        elapsed = time.monotonic() - start
+        if result:
+            outcome = OUTCOME_OK
+        elif elapsed >= self._timeout_threshold:
+            outcome = OUTCOME_TIMEOUT
+        else:
+            outcome = OUTCOME_ERROR
+        metrics.record(kind, elapsed, outcome)
+        # The payload size is the number of top-level fields in the response
+        # (or, for a poll, in the refreshed status); pykumo does not expose
+        # byte counts and serializing just to measure would defeat the point.
+        if isinstance(result, dict):
+            payload_size = len(result)
+        elif kind == KIND_POLL:
+            payload_size = len(self.device.get_status())
+        else:
+            payload_size = 0
+        self.trace.record(request_type, wall_start, elapsed, outcome, payload_size)
+        return result
+
     async def _async_update_data(self) -> None:
         """Fetch data from Kumo device."""
-        success = await self.hass.async_add_executor_job(self.device.update_status)
+        success = await self.async_device_call(KIND_POLL, self.device.update_status)
         self._update_availability(success)
         if success:
+            now = time.monotonic()
+            if self.runtime is not None:
+                outdoor = self.fleet.outdoor_temperature if self.fleet else None
+                self.runtime.sample(runtime_state(self.device), now, outdoor)
+            if self.history is not None:
+                self.history.append(now, history_readings(self.device))
+            profiler = self.profiler
             for update_method in self._additional_update_methods:
-                await update_method()
+                if profiler is None:
+                    await update_method()
+                else:
+                    await profiler.profiled(update_method())
         else:
-            raise UpdateFailed(
-                f"Failed to update Kumo device: {self.device.get_name()}"
-            )
+            raise UpdateFailed(f"Failed to update Kumo device: {self.label}")
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, under the profiler if one is attached."""
+        self._snapshot = None
+        profiler = self.profiler
+        if profiler is None:
+            super().async_update_listeners()
+            return
+        profiler.enable()
+        try:
+            super().async_update_listeners()
+        finally:
+            profiler.disable()
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Count the finished refresh towards an attached profiling run."""
+        if self.profiler is not None:
+            self.profiler.cycle_finished(self)
 
     def _update_availability(self, success: bool) -> None:
         if success:
@@ -86,5 +285,8 @@ class KumoDataUpdateCoordinator(DataUpdateCoordinator):
             self._unavailable_count = 0
         else:
             self._unavailable_count += 1
-            if self._unavailable_count >= MAX_AVAILABILITY_TRIES:
+            if self._unavailable_count >= MAX_AVAILABILITY_TRIES and self._available:
                 self._available = False
+                # DataUpdateCoordinator only notifies listeners on the first
+                # of a run of failed updates, so push this change ourselves.
+                self.async_update_listeners()
@@ -0,0 +1,95 @@
+"""Deadband filtering of noisy measurements before they are published."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from .const import (
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_SIGNAL_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_HUMIDITY_DEADBAND,
+    DEFAULT_SIGNAL_DEADBAND,
+    DEFAULT_TEMPERATURE_DEADBAND,
+)
+
+MEASUREMENT_SIGNAL = "signal"
+MEASUREMENT_TEMPERATURE = "temperature"
+MEASUREMENT_HUMIDITY = "humidity"
+
+_DEADBAND_OPTIONS = {
+    MEASUREMENT_SIGNAL: (CONF_SIGNAL_DEADBAND, DEFAULT_SIGNAL_DEADBAND),
+    MEASUREMENT_TEMPERATURE: (CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+    MEASUREMENT_HUMIDITY: (CONF_HUMIDITY_DEADBAND, DEFAULT_HUMIDITY_DEADBAND),
+}
+
+
+class KumoDeadbandFilter:
+    """Decide whether a new reading of a measurement is worth publishing.
+
+    A reading is published when it differs from the last published one by at
+    least the deadband, when it appears or disappears, or when the heartbeat
+    interval has passed since the last publication. Everything else is
+    suppressed and counted.
+    """
+
+    __slots__ = ("deadband", "heartbeat", "value", "published", "suppressed", "_last")
+
+    def __init__(self, deadband: float, heartbeat: float) -> None:
+        """Initialize a filter that has not published anything yet."""
+        self.deadband = deadband
+        self.heartbeat = heartbeat
+        self.value: Any = None
+        self.published = 0
+        self.suppressed = 0
+        self._last: float | None = None
+
+    @classmethod
+    def from_options(
+        cls, options: Mapping[str, Any], measurement: str
+    ) -> KumoDeadbandFilter:
+        """Create a filter for `measurement` from config entry options."""
+        key, default = _DEADBAND_OPTIONS[measurement]
+        return cls(
+            float(options.get(key, default)),
+            float(options.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL)),
+        )
+
+    def update(self, value: Any, now: float) -> bool:
+        """Offer a new reading; return True if it was published."""
+        if self._last is not None and not self._significant(value):
+            if now - self._last < self.heartbeat:
+                self.suppressed += 1
+                return False
+        self.value = value
+        self.published += 1
+        self._last = now
+        return True
+
+    def _significant(self, value: Any) -> bool:
+        previous = self.value
+        if value is None or previous is None:
+            return value is not previous
+        try:
+            change = abs(value - previous)
+        except TypeError:
+            return value != previous
+        if not self.deadband:
+            return change > 0
+        return change >= self.deadband
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly representation."""
+        offered = self.published + self.suppressed
+        return {
+            "deadband": self.deadband,
+            "heartbeat_seconds": self.heartbeat,
+            "published": self.published,
+            "suppressed": self.suppressed,
+            "suppression_rate": round(self.suppressed / offered, 3)
+            if offered
+            else None,
+        }
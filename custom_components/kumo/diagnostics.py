@@ -9,7 +9,14 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry
 
-from .const import DOMAIN, KUMO_DATA, KUMO_DATA_COORDINATORS
+from .const import (
+    DOMAIN,
+    KUMO_DATA,
+    KUMO_DATA_COORDINATORS,
+    KUMO_DATA_FLEET,
+    KUMO_DATA_HEALTH,
+)
+from .transport import get_transport
 
 TO_REDACT = {
     "username",
@@ -31,11 +38,16 @@ async def async_get_config_entry_diagnostics(
     """Return diagnostics for a config entry."""
     kumo_settings = hass.data[DOMAIN][entry.entry_id][KUMO_DATA]
     account = kumo_settings.get_account()
+    fleet = hass.data[DOMAIN][entry.entry_id].get(KUMO_DATA_FLEET)
+    health = hass.data[DOMAIN][entry.entry_id].get(KUMO_DATA_HEALTH)
 
     # Redact config entry and raw account JSON
     return {
         "config_entry": async_redact_data(entry.as_dict(), TO_REDACT),
         "kumo_dict": async_redact_data(account.get_raw_json(), TO_REDACT),
+        "fleet": fleet.as_dict() if fleet else None,
+        "health": health.as_dict() if health else None,
+        "transport": get_transport(hass).as_dict(),
     }
 
 
@@ -64,4 +76,12 @@ async def async_get_device_diagnostics(
             "manufacturer": device.manufacturer,
         },
         "pykumo_state": async_redact_data(pykumo_device.__dict__, TO_REDACT),
+        "metrics": coordinator.metrics.as_dict(),
+        "trace": async_redact_data(coordinator.trace.as_dict(), TO_REDACT),
+        "filters": {
+            key: deadband_filter.as_dict()
+            for key, deadband_filter in coordinator.filters.items()
+        },
+        "runtime": coordinator.runtime.as_dict() if coordinator.runtime else None,
+        "history": coordinator.history.as_dict() if coordinator.history else None,
     }
@@ -0,0 +1,164 @@
+"""Concurrent probing of Kumo adapters on the local network.
+
+pykumo probes addresses one at a time, so finding the units of a large
+account can take minutes when some of them do not answer. Here each probe
+runs in the executor and up to `PROBE_CONCURRENCY` of them are in flight at
+once, so the wait is bounded by the slowest few adapters instead of the sum
+of all timeouts.
+
+A subnet scan first opens a plain TCP connection to every host, many at a
+time and with a short timeout. Only the hosts that accept one are then asked
+for a unit's status with each unit's credentials; the unit whose
+credentials the host accepts is the one behind it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import contextlib
+import ipaddress
+import logging
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from pykumo.py_kumo_discovery import probe_ip
+
+_LOGGER = logging.getLogger(__name__)
+
+PROBE_CONCURRENCY = 8
+PROBE_TIMEOUT = 2.0  # seconds
+SCAN_CONCURRENCY = 64
+SCAN_CONNECT_TIMEOUT = 0.5  # seconds
+SCAN_MAX_HOSTS = 1024
+KUMO_PORT = 80
+
+
+def unit_credentials(unit: dict[str, Any]) -> dict[str, Any] | None:
+    """Return the decoded local API credentials of a cached unit, if valid."""
+    try:
+        credentials = {
+            "password": base64.b64decode(unit["password"]),
+            "crypto_serial": bytearray.fromhex(unit["cryptoSerial"]),
+        }
+    except (KeyError, TypeError, ValueError, binascii.Error):
+        return None
+    # The token uses the ninth byte of the crypto serial.
+    if len(credentials["crypto_serial"]) < 9:
+        return None
+    return credentials
+
+
+async def async_probe_units(
+    hass: HomeAssistant,
+    units: dict[str, dict[str, Any]],
+    candidate_ips: Iterable[str] = (),
+    on_found: Callable[[str, str], None] | None = None,
+    timeout: float = PROBE_TIMEOUT,
+) -> dict[str, str]:
+    """Return serial -> address for the units that answered.
+
+    Each unit is tried at its own address first. The units that did not
+    answer there are then tried at each of `candidate_ips`. `on_found` is
+    called on the event loop with the serial and address of each unit as it
+    answers.
+    """
+    credentials = {
+        serial: creds
+        for serial, unit in units.items()
+        if (creds := unit_credentials(unit)) is not None
+    }
+    semaphore = asyncio.Semaphore(PROBE_CONCURRENCY)
+    found: dict[str, str] = {}
+
+    async def _probe(serial: str, address: str) -> bool:
+        if serial in found:
+            return False
+        async with semaphore:
+            if serial in found:
+                return False
+            answered = await hass.async_add_executor_job(
+                probe_ip, address, credentials[serial], timeout
+            )
+        if not answered or serial in found:
+            return False
+        found[serial] = address
+        _LOGGER.debug("Kumo unit %s answered at %s", serial, address)
+        if on_found is not None:
+            on_found(serial, address)
+        return True
+
+    await asyncio.gather(
+        *(
+            _probe(serial, units[serial]["address"])
+            for serial in credentials
+            if units[serial].get("address")
+        )
+    )
+
+    candidates = [address for address in candidate_ips if address]
+    missing = [serial for serial in credentials if serial not in found]
+    if candidates and missing:
+
+        async def _probe_candidate(address: str) -> None:
+            # An address belongs to at most one unit.
+            for serial in missing:
+                if await _probe(serial, address):
+                    return
+
+        await asyncio.gather(*(_probe_candidate(address) for address in candidates))
+    return found
+
+
+def _host_address(host: str, port: int) -> str:
+    return host if port == KUMO_PORT else f"{host}:{port}"
+
+
+async def _async_accepts(host: str, port: int, timeout: float) -> bool:
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, TimeoutError):
+        return False
+    writer.close()
+    with contextlib.suppress(OSError):
+        await writer.wait_closed()
+    return True
+
+
+async def async_scan_network(
+    hass: HomeAssistant,
+    network: ipaddress.IPv4Network,
+    units: dict[str, dict[str, Any]],
+    port: int = KUMO_PORT,
+    on_progress: Callable[[float], None] | None = None,
+    timeout: float = SCAN_CONNECT_TIMEOUT,
+) -> dict[str, str]:
+    """Scan `network` for the adapters of `units`; return serial -> address.
+
+    `on_progress` is called with the fraction of hosts checked so far.
+    """
+    hosts = [str(host) for host in network.hosts()]
+    if len(hosts) > SCAN_MAX_HOSTS:
+        raise ValueError(f"{network} has more than {SCAN_MAX_HOSTS} hosts")
+    semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+    checked = 0
+
+    async def _check(host: str) -> str | None:
+        nonlocal checked
+        async with semaphore:
+            accepts = await _async_accepts(host, port, timeout)
+        checked += 1
+        if on_progress is not None:
+            on_progress(checked / len(hosts))
+        return _host_address(host, port) if accepts else None
+
+    listening = [
+        address
+        for address in await asyncio.gather(*(_check(host) for host in hosts))
+        if address
+    ]
+    _LOGGER.debug("Kumo scan of %s: %d hosts listening", network, len(listening))
+    unaddressed = {serial: {**unit, "address": ""} for serial, unit in units.items()}
+    return await async_probe_units(hass, unaddressed, listening)
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import time
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_UNIT_RENAMED
 from .coordinator import KumoDataUpdateCoordinator
+from .deadband import KumoDeadbandFilter
 
 
 class CoordinatedKumoEntity(CoordinatorEntity):
@@ -18,6 +24,8 @@ class CoordinatedKumoEntity(CoordinatorEntity):
         self._coordinator = coordinator
         self._pykumo = coordinator.get_device()
         self._identifier = self._pykumo.get_serial()
+        # The unit name `_name` starts with, replaced when the unit is renamed.
+        self._label = coordinator.label
 
     @property
     def device_info(self) -> DeviceInfo | None:
@@ -28,9 +36,34 @@ class CoordinatedKumoEntity(CoordinatorEntity):
         return DeviceInfo(
             identifiers={(DOMAIN, self._identifier)},
             manufacturer="Mitsubishi",
-            name=self._pykumo.get_name(),
+            name=self._coordinator.label,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Follow renames of the unit in KumoCloud."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_UNIT_RENAMED.format(self._identifier),
+                self._async_unit_renamed,
+            )
         )
 
+    @callback
+    def _async_unit_renamed(self) -> None:
+        """Replace the unit name at the start of the entity name."""
+        label = self._coordinator.label
+        self._name = label + self._name[len(self._label) :]
+        self._label = label
+        self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to the state machine, counting the write."""
+        self._coordinator.metrics.state_writes += 1
+        super().async_write_ha_state()
+
     @property
     def available(self):
         """Return whether Home Assistant is able to read the state and control the underlying device."""
@@ -40,3 +73,49 @@ class CoordinatedKumoEntity(CoordinatorEntity):
     def name(self):
         """Return the name of the thermostat, if any."""
         return self._name
+
+
+class FilteredKumoEntity(CoordinatedKumoEntity):
+    """Kumo sensor whose state is only written when its value changes enough.
+
+    Subclasses set `_filter_key` and `_measurement` and implement
+    `_read_value`; `native_value` returns the last published reading.
+    """
+
+    _filter_key: str
+    _measurement: str
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator) -> None:
+        """Initialize the entity and its deadband filter."""
+        super().__init__(coordinator)
+        self._filter: KumoDeadbandFilter = coordinator.get_filter(
+            self._filter_key, self._measurement
+        )
+        self._written_available: bool | None = None
+
+    def _read_value(self) -> Any:
+        """Return the current reading from the device."""
+        raise NotImplementedError
+
+    @property
+    def native_value(self) -> Any:
+        """Return the last published reading."""
+        return self._filter.value
+
+    async def async_added_to_hass(self) -> None:
+        """Publish the current reading when added."""
+        await super().async_added_to_hass()
+        self._filter.update(self._read_value(), time.monotonic())
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only for a significant change or availability change."""
+        published = self._filter.update(self._read_value(), time.monotonic())
+        if published or self.available != self._written_available:
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, remembering the availability written."""
+        self._written_available = self.available
+        super().async_write_ha_state()
@@ -0,0 +1,220 @@
+"""Account-wide aggregates over the indoor units of a config entry.
+
+Each indoor unit's coordinator reduces its latest poll to a small snapshot.
+When a snapshot differs from the unit's previous one, only the difference is
+applied to the account totals, so aggregates cost O(1) per unit update
+instead of a pass over every climate entity.
+
+The outdoor temperature reported by Kumo Stations is published here once
+and shared with the indoor units.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import partial
+from typing import NamedTuple
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .runtime import RUNTIME_COOLING, RUNTIME_HEATING
+
+FLEET_HEATING = "units_heating"
+FLEET_COOLING = "units_cooling"
+FLEET_UNAVAILABLE = "units_unavailable"
+FLEET_FILTER_DIRTY = "dirty_filters"
+FLEET_COUNTS = (FLEET_HEATING, FLEET_COOLING, FLEET_UNAVAILABLE, FLEET_FILTER_DIRTY)
+FLEET_MEAN_TEMPERATURE = "mean_temperature"
+FLEET_MIN_TEMPERATURE = "min_temperature"
+FLEET_MAX_TEMPERATURE = "max_temperature"
+FLEET_OUTDOOR_TEMPERATURE = "outdoor_temperature"
+FLEET_TEMPERATURES = (
+    FLEET_MEAN_TEMPERATURE,
+    FLEET_MIN_TEMPERATURE,
+    FLEET_MAX_TEMPERATURE,
+    FLEET_OUTDOOR_TEMPERATURE,
+)
+
+
+class KumoUnitSnapshot(NamedTuple):
+    """The parts of an indoor unit's state that feed the aggregates."""
+
+    available: bool
+    state: str | None
+    temperature: float | None
+    filter_dirty: bool
+
+
+def unit_snapshot(coordinator) -> KumoUnitSnapshot:
+    """Return the snapshot of an indoor unit coordinator's latest poll."""
+    if not coordinator.get_available():
+        return KumoUnitSnapshot(False, None, None, False)
+    device = coordinator.get_device()
+    return KumoUnitSnapshot(
+        True,
+        coordinator.runtime.state,
+        device.get_current_temperature(),
+        bool(device.get_filter_dirty()),
+    )
+
+
+class KumoFleet:
+    """Incrementally maintained aggregates over an account's indoor units.
+
+    Counts and the temperature sum are adjusted by each unit's change. The
+    minimum and maximum are extended in place and only recomputed over the
+    known temperatures when the unit holding one of them changes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty aggregates."""
+        self.counts: dict[str, int] = dict.fromkeys(FLEET_COUNTS, 0)
+        self.min_temperature: float | None = None
+        self.max_temperature: float | None = None
+        self.outdoor_temperature: float | None = None
+        self._outdoor_temperatures: dict[str, float] = {}
+        self._units: dict[str, KumoUnitSnapshot] = {}
+        self._temperatures: dict[str, float] = {}
+        self._temperature_sum = 0.0
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def mean_temperature(self) -> float | None:
+        """Return the mean indoor temperature of the available units."""
+        if not self._temperatures:
+            return None
+        return self._temperature_sum / len(self._temperatures)
+
+    def value(self, key: str) -> float | int | None:
+        """Return the aggregate `key`."""
+        if key in self.counts:
+            return self.counts[key]
+        return getattr(self, key)
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Call `update_callback` whenever the aggregates change."""
+        self._listeners.append(update_callback)
+        return partial(self._listeners.remove, update_callback)
+
+    @callback
+    def async_track(self, entry: ConfigEntry, coordinators: dict) -> None:
+        """Follow the unit and station coordinators until `entry` is unloaded."""
+        for serial, coordinator in coordinators.items():
+            if coordinator.indoor_unit:
+                coordinator.fleet = self
+                update_callback = self._async_coordinator_updated
+            else:
+                update_callback = self._async_station_updated
+            entry.async_on_unload(
+                coordinator.async_add_listener(
+                    partial(update_callback, serial, coordinator)
+                )
+            )
+
+    @callback
+    def _async_coordinator_updated(self, serial: str, coordinator) -> None:
+        self.async_update_unit(serial, unit_snapshot(coordinator))
+
+    @callback
+    def _async_station_updated(self, serial: str, coordinator) -> None:
+        value = None
+        if coordinator.get_available():
+            value = coordinator.get_device().get_outdoor_temperature()
+        self.async_update_outdoor_temperature(serial, value)
+
+    @callback
+    def async_update_outdoor_temperature(
+        self, serial: str, value: float | None
+    ) -> None:
+        """Publish a station's outdoor temperature; stations are averaged."""
+        if value is None:
+            self._outdoor_temperatures.pop(serial, None)
+        else:
+            self._outdoor_temperatures[serial] = value
+        temperatures = self._outdoor_temperatures.values()
+        outdoor = sum(temperatures) / len(temperatures) if temperatures else None
+        if outdoor == self.outdoor_temperature:
+            return
+        self.outdoor_temperature = outdoor
+        self._notify()
+
+    @callback
+    def async_update_unit(self, serial: str, snapshot: KumoUnitSnapshot) -> None:
+        """Apply a unit's new snapshot and notify listeners if it changed."""
+        old = self._units.get(serial)
+        if old == snapshot:
+            return
+        self._units[serial] = snapshot
+        self._apply(old, snapshot, serial)
+
+    @callback
+    def async_remove_unit(self, serial: str) -> None:
+        """Drop a unit that no longer belongs to the account."""
+        old = self._units.pop(serial, None)
+        if old is not None:
+            self._apply(old, None, serial)
+
+    def _apply(
+        self,
+        old: KumoUnitSnapshot | None,
+        new: KumoUnitSnapshot | None,
+        serial: str,
+    ) -> None:
+        if old is not None:
+            self._count(old, -1)
+        if new is not None:
+            self._count(new, 1)
+        self._update_temperature(
+            serial,
+            old.temperature if old is not None else None,
+            new.temperature if new is not None else None,
+        )
+        self._notify()
+
+    def _notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def _count(self, snapshot: KumoUnitSnapshot, sign: int) -> None:
+        counts = self.counts
+        if not snapshot.available:
+            counts[FLEET_UNAVAILABLE] += sign
+            return
+        if snapshot.state == RUNTIME_HEATING:
+            counts[FLEET_HEATING] += sign
+        elif snapshot.state == RUNTIME_COOLING:
+            counts[FLEET_COOLING] += sign
+        if snapshot.filter_dirty:
+            counts[FLEET_FILTER_DIRTY] += sign
+
+    def _update_temperature(
+        self, serial: str, old: float | None, new: float | None
+    ) -> None:
+        temperatures = self._temperatures
+        if old is not None:
+            self._temperature_sum -= old
+            del temperatures[serial]
+        if new is not None:
+            self._temperature_sum += new
+            temperatures[serial] = new
+        if not temperatures:
+            self._temperature_sum = 0.0
+            self.min_temperature = self.max_temperature = None
+        elif old is not None and old in (self.min_temperature, self.max_temperature):
+            self.min_temperature = min(temperatures.values())
+            self.max_temperature = max(temperatures.values())
+        elif new is not None:
+            if self.min_temperature is None or new < self.min_temperature:
+                self.min_temperature = new
+            if self.max_temperature is None or new > self.max_temperature:
+                self.max_temperature = new
+
+    def as_dict(self) -> dict:
+        """Return a JSON-friendly representation."""
+        return {
+            **self.counts,
+            "units": len(self._units),
+            **{key: self.value(key) for key in FLEET_TEMPERATURES},
+        }
@@ -0,0 +1,131 @@
+"""Load shedding when many of an account's adapters fail at once.
+
+A failing adapter costs a full timeout on every poll. When a large part of
+an account fails together, e.g. during a Wi-Fi outage in one wing, those
+timeouts occupy the shared transport and delay the healthy units. The
+monitor follows the outcome of each unit's last poll. Once at least
+`SHED_MIN_FAILING` units and `SHED_ENTER_RATIO` of them fail, it switches
+the account to shedding: failing units poll `SHED_INTERVAL_FACTOR` times
+less often and their polls only get the transport's shed share of slots.
+A failing unit that answers again gets its normal schedule back at once.
+The account returns to normal once no more than `SHED_EXIT_RATIO` of its
+units fail; the gap between the two ratios keeps it from flapping.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import timedelta
+from functools import partial
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+HEALTH_NORMAL = "normal"
+HEALTH_SHEDDING = "shedding"
+HEALTH_MODES = (HEALTH_NORMAL, HEALTH_SHEDDING)
+
+SHED_MIN_FAILING = 3
+SHED_ENTER_RATIO = 0.5
+SHED_EXIT_RATIO = 0.2
+SHED_INTERVAL_FACTOR = 5
+
+
+class KumoHealthMonitor:
+    """Switch an account between normal polling and load shedding."""
+
+    def __init__(self) -> None:
+        """Initialize a monitor in normal mode."""
+        self.mode = HEALTH_NORMAL
+        self._coordinators: dict = {}
+        self._intervals: dict[str, timedelta | None] = {}
+        self._failing: set[str] = set()
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @property
+    def failing(self) -> int:
+        """Return the number of units whose last poll failed."""
+        return len(self._failing)
+
+    @property
+    def failure_ratio(self) -> float:
+        """Return the share of units whose last poll failed."""
+        if not self._coordinators:
+            return 0.0
+        return len(self._failing) / len(self._coordinators)
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Call `update_callback` whenever the mode or failing units change."""
+        self._listeners.append(update_callback)
+        return partial(self._listeners.remove, update_callback)
+
+    @callback
+    def async_track(self, entry: ConfigEntry, coordinators: dict) -> None:
+        """Follow the coordinators until `entry` is unloaded."""
+        for serial, coordinator in coordinators.items():
+            self._coordinators[serial] = coordinator
+            self._intervals[serial] = coordinator.update_interval
+            entry.async_on_unload(
+                coordinator.async_add_listener(
+                    partial(self._async_coordinator_updated, serial, coordinator)
+                )
+            )
+
+    @callback
+    def async_remove_unit(self, serial: str) -> None:
+        """Drop a unit that no longer belongs to the account."""
+        self._coordinators.pop(serial, None)
+        self._intervals.pop(serial, None)
+        self._failing.discard(serial)
+        self._async_evaluate()
+
+    @callback
+    def _async_coordinator_updated(self, serial: str, coordinator) -> None:
+        failing = not coordinator.last_update_success
+        if failing == (serial in self._failing):
+            return
+        if failing:
+            self._failing.add(serial)
+        else:
+            self._failing.discard(serial)
+        self._async_evaluate()
+
+    @callback
+    def _async_evaluate(self) -> None:
+        ratio = self.failure_ratio
+        if (
+            self.mode == HEALTH_NORMAL
+            and len(self._failing) >= SHED_MIN_FAILING
+            and ratio >= SHED_ENTER_RATIO
+        ):
+            self.mode = HEALTH_SHEDDING
+            _LOGGER.warning(
+                "%d of %d Kumo units are failing; polling them less often",
+                len(self._failing),
+                len(self._coordinators),
+            )
+        elif self.mode == HEALTH_SHEDDING and ratio <= SHED_EXIT_RATIO:
+            self.mode = HEALTH_NORMAL
+            _LOGGER.info("Kumo units recovered; back to normal polling")
+        for serial, coordinator in self._coordinators.items():
+            shed = self.mode == HEALTH_SHEDDING and serial in self._failing
+            interval = self._intervals[serial]
+            coordinator.shed = shed
+            coordinator.update_interval = (
+                interval * SHED_INTERVAL_FACTOR if shed and interval else interval
+            )
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def as_dict(self) -> dict:
+        """Return a JSON-friendly representation."""
+        return {
+            "mode": self.mode,
+            "units": len(self._coordinators),
+            "failing": len(self._failing),
+            "failure_ratio": round(self.failure_ratio, 3),
+        }
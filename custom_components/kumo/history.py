@@ -0,0 +1,221 @@
+"""Short-term in-memory history of indoor unit readings.
+
+Every successful poll appends the room temperature, both setpoints and the
+humidity to fixed-size ring buffers backed by ``array('d')``, with NaN for a
+missing reading. Least-squares sums for the temperature and humidity series
+are updated as samples enter and leave the window, so trends and the time to
+reach the setpoint are O(1) per poll and need no recorder queries. The
+operating mode and standby flag of the latest poll are kept alongside, to
+tell which setpoint the unit is working towards.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any
+
+HISTORY_SIZE = 64
+# A trend needs this many samples spanning at least this many seconds.
+MIN_TREND_SAMPLES = 5
+MIN_TREND_SPAN = 300.0
+
+CHANNEL_TEMPERATURE = "temperature"
+CHANNEL_HEAT_SETPOINT = "heat_setpoint"
+CHANNEL_COOL_SETPOINT = "cool_setpoint"
+CHANNEL_HUMIDITY = "humidity"
+HISTORY_CHANNELS = (
+    CHANNEL_TEMPERATURE,
+    CHANNEL_HEAT_SETPOINT,
+    CHANNEL_COOL_SETPOINT,
+    CHANNEL_HUMIDITY,
+)
+# Channels with a maintained regression.
+TREND_CHANNELS = (CHANNEL_TEMPERATURE, CHANNEL_HUMIDITY)
+# Readings kept for the latest poll only.
+READING_MODE = "mode"
+READING_STANDBY = "standby"
+
+# pykumo operating modes that work towards each setpoint.
+_HEATING_MODES = frozenset(("heat", "auto", "autoHeat"))
+_COOLING_MODES = frozenset(("cool", "auto", "autoCool"))
+
+_NAN = math.nan
+
+
+class _Regression:
+    """Running sums for a least-squares line through (t, y) samples."""
+
+    __slots__ = ("n", "st", "sy", "stt", "sty")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.n = 0
+        self.st = self.sy = self.stt = self.sty = 0.0
+
+    def add(self, t: float, y: float, sign: int = 1) -> None:
+        self.n += sign
+        self.st += sign * t
+        self.sy += sign * y
+        self.stt += sign * t * t
+        self.sty += sign * t * y
+
+    def slope(self) -> float | None:
+        denominator = self.n * self.stt - self.st * self.st
+        if self.n < 2 or denominator <= 0:
+            return None
+        return (self.n * self.sty - self.st * self.sy) / denominator
+
+
+class KumoHistory:
+    """Ring buffers of recent readings with incremental trend computation.
+
+    Sample times are stored relative to a base time. Whenever the write
+    position wraps around, the base moves to the oldest sample and the sums
+    are recomputed from the buffer, which keeps them numerically stable at an
+    amortized O(1) cost.
+    """
+
+    __slots__ = (
+        "size",
+        "count",
+        "mode",
+        "standby",
+        "_index",
+        "_base",
+        "_times",
+        "_values",
+        "_fits",
+    )
+
+    def __init__(self, size: int = HISTORY_SIZE) -> None:
+        """Initialize empty buffers holding `size` samples."""
+        self.size = size
+        self.count = 0
+        self.mode: str | None = None
+        self.standby = False
+        self._index = 0
+        self._base: float | None = None
+        self._times = array("d", [_NAN]) * size
+        self._values = {
+            channel: array("d", [_NAN]) * size for channel in HISTORY_CHANNELS
+        }
+        self._fits = {channel: _Regression() for channel in TREND_CHANNELS}
+
+    def append(self, now: float, readings: dict[str, Any]) -> None:
+        """Add the readings of one poll taken at monotonic time `now`."""
+        self.mode = readings.get(READING_MODE)
+        self.standby = bool(readings.get(READING_STANDBY))
+        if self._base is None:
+            self._base = now
+        index = self._index
+        if self.count == self.size:
+            self._remove(index)
+        else:
+            self.count += 1
+        t = now - self._base
+        self._times[index] = t
+        for channel, values in self._values.items():
+            value = readings.get(channel)
+            values[index] = _NAN if value is None else float(value)
+        for channel, fit in self._fits.items():
+            y = self._values[channel][index]
+            if not math.isnan(y):
+                fit.add(t, y)
+        self._index = (index + 1) % self.size
+        if self._index == 0:
+            self._rebase()
+
+    def _remove(self, index: int) -> None:
+        t = self._times[index]
+        for channel, fit in self._fits.items():
+            y = self._values[channel][index]
+            if not math.isnan(y):
+                fit.add(t, y, -1)
+
+    def _rebase(self) -> None:
+        # The oldest sample is at the write position after a wrap.
+        offset = self._times[self._index]
+        self._base += offset
+        for fit in self._fits.values():
+            fit.reset()
+        for index in range(self.count):
+            t = self._times[index] - offset
+            self._times[index] = t
+            for channel, fit in self._fits.items():
+                y = self._values[channel][index]
+                if not math.isnan(y):
+                    fit.add(t, y)
+
+    def latest(self, channel: str) -> float | None:
+        """Return the most recent reading of `channel`, if any."""
+        if not self.count:
+            return None
+        value = self._values[channel][(self._index - 1) % self.size]
+        return None if math.isnan(value) else value
+
+    def _span(self) -> float:
+        newest = self._times[(self._index - 1) % self.size]
+        oldest = self._times[self._index if self.count == self.size else 0]
+        return newest - oldest
+
+    def trend(self, channel: str) -> float | None:
+        """Return the rate of change of `channel` per hour, if known."""
+        fit = self._fits[channel]
+        if fit.n < MIN_TREND_SAMPLES or self._span() < MIN_TREND_SPAN:
+            return None
+        slope = fit.slope()
+        return None if slope is None else slope * 3600
+
+    def time_to_setpoint(self) -> float | None:
+        """Return the estimated seconds until the temperature reaches its setpoint.
+
+        The setpoint is the one the active mode works towards: the heat
+        setpoint in heat mode, the cool setpoint in cool mode and either in
+        auto mode. None means the unit is off, in standby or in a mode
+        without a setpoint, or the temperature is moving away from it.
+        """
+        if self.standby:
+            return None
+        slope = self.trend(CHANNEL_TEMPERATURE)
+        temperature = self.latest(CHANNEL_TEMPERATURE)
+        if not slope or temperature is None:
+            return None
+        if slope > 0 and self.mode in _HEATING_MODES:
+            setpoint = self.latest(CHANNEL_HEAT_SETPOINT)
+            if setpoint is not None and setpoint > temperature:
+                return (setpoint - temperature) / slope * 3600
+        if slope < 0 and self.mode in _COOLING_MODES:
+            setpoint = self.latest(CHANNEL_COOL_SETPOINT)
+            if setpoint is not None and setpoint < temperature:
+                return (setpoint - temperature) / slope * 3600
+        return None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly representation."""
+        return {
+            "samples": self.count,
+            "size": self.size,
+            "mode": self.mode,
+            "standby": self.standby,
+            "span_seconds": round(self._span(), 1) if self.count else 0,
+            "latest": {channel: self.latest(channel) for channel in HISTORY_CHANNELS},
+            "trends_per_hour": {
+                channel: self.trend(channel) for channel in TREND_CHANNELS
+            },
+            "time_to_setpoint_seconds": self.time_to_setpoint(),
+        }
+
+
+def history_readings(device) -> dict[str, Any]:
+    """Return the readings of a pykumo indoor unit for the history."""
+    return {
+        READING_MODE: device.get_mode(),
+        READING_STANDBY: device.get_standby(),
+        CHANNEL_TEMPERATURE: device.get_current_temperature(),
+        CHANNEL_HEAT_SETPOINT: device.get_heat_setpoint(),
+        CHANNEL_COOL_SETPOINT: device.get_cool_setpoint(),
+        CHANNEL_HUMIDITY: device.get_current_humidity(),
+    }
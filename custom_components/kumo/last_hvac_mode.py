@@ -1,76 +1,127 @@
-"""Shared storage for last active HVAC mode."""
+"""Persistent storage for the last active HVAC mode of each unit."""
 
 from __future__ import annotations
 
-from homeassistant.components.climate.const import HVACMode
-
-from .const import DOMAIN
-
-_LAST_HVAC_MODE_KEY = "last_hvac_mode"
-_LAST_HVAC_MODE_LISTENERS = "last_hvac_mode_listeners"
-
-
-def _get_store(hass):
-    domain_data = hass.data.setdefault(DOMAIN, {})
-    return domain_data.setdefault(_LAST_HVAC_MODE_KEY, {})
+import logging
+from collections.abc import Callable
 
-
-def _get_listeners(hass):
-    domain_data = hass.data.setdefault(DOMAIN, {})
-    return domain_data.setdefault(_LAST_HVAC_MODE_LISTENERS, {})
-
-
-def get_last_hvac_mode_value(hass, identifier):
-    """Return the cached last HVAC mode string, if any."""
-    if not hass or not identifier:
+from homeassistant.components.climate.const import HVACMode
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import restore_state
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, KUMO_DATA_LAST_HVAC_MODE
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10  # seconds
+LAST_HVAC_MODE_SUFFIX = "-last-hvac-mode"
+
+
+class KumoLastHvacModeStore:
+    """Last active HVAC mode per unit of a config entry.
+
+    Modes are loaded once at setup, so `climate.turn_on` has them right after
+    a restart. Changes are written to ``.storage`` in batches after
+    `SAVE_DELAY` seconds and listeners are called directly; every caller is
+    on the event loop.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store of a config entry."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._store: Store[dict[str, dict[str, str]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.last_hvac_mode"
+        )
+        self._modes: dict[str, str] = {}
+        self._listeners: dict[str, list[Callable[[str], None]]] = {}
+
+    async def async_load(self) -> None:
+        """Load the saved modes, migrating restored sensor states the first time."""
+        data = await self._store.async_load()
+        if data is not None:
+            self._modes = dict(data.get("modes", {}))
+            return
+        self._modes = self._restored_sensor_states()
+        if self._modes:
+            _LOGGER.debug("Migrated last HVAC modes of %s", list(self._modes))
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _restored_sensor_states(self) -> dict[str, str]:
+        # Before this store existed, each Last HVAC Mode sensor restored the
+        # mode as its own state.
+        last_states = restore_state.async_get(self._hass).last_states
+        registry = er.async_get(self._hass)
+        modes = {}
+        for entity in er.async_entries_for_config_entry(registry, self._entry_id):
+            if not entity.unique_id.endswith(LAST_HVAC_MODE_SUFFIX):
+                continue
+            stored = last_states.get(entity.entity_id)
+            if stored is None or stored.state.state in (
+                STATE_UNKNOWN,
+                STATE_UNAVAILABLE,
+            ):
+                continue
+            modes[entity.unique_id.removesuffix(LAST_HVAC_MODE_SUFFIX)] = (
+                stored.state.state
+            )
+        return modes
+
+    def _data_to_save(self) -> dict[str, dict[str, str]]:
+        return {"modes": dict(self._modes)}
+
+    async def async_save(self) -> None:
+        """Write the modes now, e.g. before unloading."""
+        await self._store.async_save(self._data_to_save())
+
+    def get(self, identifier: str | None) -> str | None:
+        """Return the last HVAC mode string of a unit, if any."""
+        if not identifier:
+            return None
+        return self._modes.get(identifier)
+
+    def get_mode(self, identifier: str | None, hvac_modes) -> HVACMode | None:
+        """Return the last HVAC mode of a unit if it is one of `hvac_modes`."""
+        value = self.get(identifier)
+        if value:
+            for mode in hvac_modes:
+                if mode != HVACMode.OFF and mode.value == value:
+                    return mode
         return None
-    return _get_store(hass).get(identifier)
-
-
-def set_last_hvac_mode_value(hass, identifier, value):
-    """Store the cached last HVAC mode string."""
-    if not hass or not identifier or not value:
-        return
-    store = _get_store(hass)
-    if store.get(identifier) == value:
-        return
-    store[identifier] = value
-    _notify_listeners(hass, identifier, value)
-
-
-def get_last_hvac_mode(hass, identifier, hvac_modes):
-    """Return the cached last HVAC mode as an HVACMode, if any."""
-    value = get_last_hvac_mode_value(hass, identifier)
-    if value:
-        for mode in hvac_modes:
-            if mode != HVACMode.OFF and mode.value == value:
-                return mode
-    return None
-
-
-def register_last_hvac_mode_listener(hass, identifier, callback):
-    """Register a callback for last HVAC mode updates."""
-    if not hass or not identifier:
-        return lambda: None
-    listeners = _get_listeners(hass)
-    callbacks = listeners.setdefault(identifier, set())
-    callbacks.add(callback)
-
-    def _unsubscribe():
-        callbacks.discard(callback)
-        if not callbacks:
-            listeners.pop(identifier, None)
-
-    return _unsubscribe
-
-
-def _notify_listeners(hass, identifier, value):
-    callbacks = _get_listeners(hass).get(identifier)
-    if not callbacks:
-        return
-
-    def _run():
-        for callback in list(callbacks):
-            callback(value)
 
-    hass.loop.call_soon_threadsafe(_run)
+    @callback
+    def async_set(self, identifier: str | None, value: str | None) -> None:
+        """Remember a unit's last HVAC mode and schedule a write."""
+        if not identifier or not value or self._modes.get(identifier) == value:
+            return
+        self._modes[identifier] = value
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        for listener in list(self._listeners.get(identifier, ())):
+            listener(value)
+
+    @callback
+    def async_add_listener(
+        self, identifier: str, listener: Callable[[str], None]
+    ) -> Callable[[], None]:
+        """Call `listener` with the new mode whenever a unit's mode changes."""
+        listeners = self._listeners.setdefault(identifier, [])
+        listeners.append(listener)
+
+        @callback
+        def _unsubscribe() -> None:
+            listeners.remove(listener)
+            if not listeners:
+                self._listeners.pop(identifier, None)
+
+        return _unsubscribe
+
+
+def get_last_hvac_mode_store(
+    hass: HomeAssistant, entry_id: str
+) -> KumoLastHvacModeStore | None:
+    """Return the last HVAC mode store of a loaded config entry."""
+    return hass.data.get(DOMAIN, {}).get(entry_id, {}).get(KUMO_DATA_LAST_HVAC_MODE)
@@ -0,0 +1,138 @@
+"""Latency and failure accounting for Kumo adapter I/O."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+KIND_POLL = "poll"
+KIND_COMMAND = "command"
+
+OUTCOME_OK = "ok"
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_ERROR = "error"
+
+# Upper bounds (seconds) of the latency histogram buckets. Anything slower
+# than the last bound lands in the implicit overflow bucket.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_INTEGRATION_METRICS_KEY = "integration_metrics"
+
+
+class KumoLatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("counts", "count", "total", "last")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.last: float | None = None
+
+    def observe(self, seconds: float) -> None:
+        """Add one observation."""
+        index = 0
+        for bound in LATENCY_BUCKETS:
+            if seconds <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean latency in seconds, if anything was observed."""
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly representation."""
+        buckets = {f"le_{bound}": n for bound, n in zip(LATENCY_BUCKETS, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 4),
+            "mean_seconds": None if self.mean is None else round(self.mean, 4),
+            "last_seconds": None if self.last is None else round(self.last, 4),
+            "buckets": buckets,
+        }
+
+
+class KumoDeviceMetrics:
+    """Per-device I/O metrics recorded by the coordinator."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.latency = {
+            KIND_POLL: KumoLatencyHistogram(),
+            KIND_COMMAND: KumoLatencyHistogram(),
+        }
+        self.executor_wait = KumoLatencyHistogram()
+        self.timeouts = {KIND_POLL: 0, KIND_COMMAND: 0}
+        self.errors = {KIND_POLL: 0, KIND_COMMAND: 0}
+        self.last_success: datetime | None = None
+        self.in_flight = 0
+        self.noop_commands = 0
+        self.state_writes = 0
+
+    def record(self, kind: str, seconds: float, outcome: str) -> None:
+        """Record the result of one adapter call."""
+        self.latency[kind].observe(seconds)
+        if outcome == OUTCOME_OK:
+            self.last_success = dt_util.utcnow()
+        elif outcome == OUTCOME_TIMEOUT:
+            self.timeouts[kind] += 1
+        else:
+            self.errors[kind] += 1
+
+    @property
+    def timeout_count(self) -> int:
+        """Return the total number of timed-out calls."""
+        return sum(self.timeouts.values())
+
+    @property
+    def error_count(self) -> int:
+        """Return the total number of failed calls that did not time out."""
+        return sum(self.errors.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly representation."""
+        return {
+            "latency": {kind: hist.as_dict() for kind, hist in self.latency.items()},
+            "executor_wait": self.executor_wait.as_dict(),
+            "timeouts": dict(self.timeouts),
+            "errors": dict(self.errors),
+            "last_success": (
+                self.last_success.isoformat() if self.last_success else None
+            ),
+            "in_flight": self.in_flight,
+            "noop_commands": self.noop_commands,
+            "state_writes": self.state_writes,
+        }
+
+
+class KumoIntegrationMetrics:
+    """Counters that are not tied to a single device."""
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.cache_writes = 0
+
+
+def get_integration_metrics(hass: HomeAssistant) -> KumoIntegrationMetrics:
+    """Return the integration-wide metrics object, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    metrics = domain_data.get(_INTEGRATION_METRICS_KEY)
+    if metrics is None:
+        metrics = domain_data[_INTEGRATION_METRICS_KEY] = KumoIntegrationMetrics()
+    return metrics
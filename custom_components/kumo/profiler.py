@@ -0,0 +1,164 @@
+"""On-demand profiling of the Kumo poll and entity-update paths."""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+from collections.abc import Awaitable, Callable, Generator
+from datetime import timedelta
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_FILE_PREFIX = "kumo_profile_"
+
+T = TypeVar("T")
+
+
+class KumoProfiler:
+    """Run cProfile around coordinator refresh sections for N cycles.
+
+    Only the synchronous sections executed on the event loop are profiled:
+    the entity update methods run after each poll and the listener updates
+    that compute sensor values and write states. The blocking adapter I/O
+    runs in executor threads and is already covered by the I/O metrics.
+    The profile is shared by all coordinators, so it is never left enabled
+    across an await: other tasks run then and would be profiled too.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: list,
+        cycles: int,
+        max_duration: timedelta,
+    ) -> None:
+        """Initialize the profiler for the given coordinators."""
+        self._hass = hass
+        self._profile = cProfile.Profile()
+        self._depth = 0
+        self._cycles = cycles
+        self._remaining = {coordinator: cycles for coordinator in coordinators}
+        self._unsub_timeout: Callable[[], None] | None = None
+        self._finished = False
+        self._max_duration = max_duration
+        self.path = hass.config.path(
+            f"{PROFILE_FILE_PREFIX}{dt_util.utcnow().strftime('%Y%m%d-%H%M%S')}.prof"
+        )
+
+    @callback
+    def async_start(self) -> None:
+        """Attach to the coordinators."""
+        for coordinator in self._remaining:
+            coordinator.profiler = self
+        self._unsub_timeout = async_call_later(
+            self._hass, self._max_duration, self._async_timeout
+        )
+        _LOGGER.info(
+            "Profiling %d Kumo coordinators for %d cycles",
+            len(self._remaining),
+            self._cycles,
+        )
+
+    def enable(self) -> None:
+        """Start (or nest) a profiled section."""
+        if self._depth == 0:
+            try:
+                self._profile.enable()
+            except ValueError:
+                # Another profiler (e.g. the core profiler integration) is
+                # active; skip this section rather than fail the poll.
+                return
+        self._depth += 1
+
+    def disable(self) -> None:
+        """End a profiled section."""
+        if self._depth == 0:
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            self._profile.disable()
+
+    def profiled(self, awaitable: Awaitable[T]) -> Awaitable[T]:
+        """Return `awaitable`, profiled only while it runs on the event loop."""
+        return _ProfiledAwaitable(self, awaitable)
+
+    @callback
+    def cycle_finished(self, coordinator) -> None:
+        """Count a finished refresh cycle of `coordinator`."""
+        remaining = self._remaining.get(coordinator)
+        if remaining is None:
+            return
+        if remaining > 1:
+            self._remaining[coordinator] = remaining - 1
+            return
+        del self._remaining[coordinator]
+        # Detach in a task so the listener update that follows this refresh
+        # is still captured; a task (unlike a bare loop callback) is also
+        # waited for by hass.async_block_till_done().
+        self._hass.async_create_task(self._async_detach(coordinator))
+
+    async def _async_detach(self, coordinator) -> None:
+        if coordinator.profiler is self:
+            coordinator.profiler = None
+        if not self._remaining:
+            self._async_finish()
+
+    @callback
+    def _async_timeout(self, _now) -> None:
+        self._unsub_timeout = None
+        _LOGGER.warning(
+            "Kumo profiling timed out waiting for %d coordinators", len(self._remaining)
+        )
+        for coordinator in self._remaining:
+            if coordinator.profiler is self:
+                coordinator.profiler = None
+        self._remaining.clear()
+        self._async_finish()
+
+    @callback
+    def _async_finish(self) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        if self._unsub_timeout is not None:
+            self._unsub_timeout()
+            self._unsub_timeout = None
+        self._hass.async_create_task(self._async_dump())
+
+    async def _async_dump(self) -> None:
+        await self._hass.async_add_executor_job(self._profile.dump_stats, self.path)
+        _LOGGER.info("Kumo profile written to %s", self.path)
+
+
+class _ProfiledAwaitable:
+    """Profile each step of an awaitable, but not the waits between steps."""
+
+    def __init__(self, profiler: KumoProfiler, awaitable: Awaitable[Any]) -> None:
+        self._profiler = profiler
+        self._awaitable = awaitable
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        steps = self._awaitable.__await__()
+        value: Any = None
+        error: BaseException | None = None
+        while True:
+            self._profiler.enable()
+            try:
+                if error is None:
+                    yielded = steps.send(value)
+                else:
+                    yielded = steps.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self._profiler.disable()
+            # Suspended: pass the future up to the event loop unprofiled.
+            try:
+                value, error = (yield yielded), None
+            except BaseException as err:  # noqa: BLE001 - handed to the awaitable
+                value, error = None, err
@@ -0,0 +1,181 @@
+"""Prometheus text-format export of the Kumo integration's internal metrics."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, KUMO_DATA_COORDINATORS
+from .metrics import (
+    KIND_COMMAND,
+    KIND_POLL,
+    LATENCY_BUCKETS,
+    KumoLatencyHistogram,
+    get_integration_metrics,
+)
+from .transport import get_transport
+
+METRICS_URL = "/api/kumo/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_VIEW_REGISTERED_KEY = "metrics_view_registered"
+
+
+@callback
+def async_register_metrics_view(hass: HomeAssistant) -> None:
+    """Register the metrics view once per Home Assistant instance."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if domain_data.get(_VIEW_REGISTERED_KEY) or hass.http is None:
+        return
+    hass.http.register_view(KumoMetricsView())
+    domain_data[_VIEW_REGISTERED_KEY] = True
+
+
+class KumoMetricsView(HomeAssistantView):
+    """Serve Kumo metrics to an authenticated Prometheus scraper."""
+
+    url = METRICS_URL
+    name = "api:kumo:metrics"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the current metrics."""
+        hass = request.app["hass"]
+        return web.Response(
+            body=render_metrics(hass).encode("utf-8"),
+            status=HTTPStatus.OK,
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+
+
+class _Family:
+    """Lines of one metric family, emitted with its HELP and TYPE header."""
+
+    def __init__(self, name: str, metric_type: str, help_text: str) -> None:
+        self.name = name
+        self.lines = [
+            f"# HELP {name} {help_text}",
+            f"# TYPE {name} {metric_type}",
+        ]
+
+    def sample(self, labels: str, value: float, suffix: str = "") -> None:
+        label_set = f"{{{labels}}}" if labels else ""
+        self.lines.append(f"{self.name}{suffix}{label_set} {value}")
+
+    def histogram(self, labels: str, histogram: KumoLatencyHistogram) -> None:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+            cumulative += count
+            self.sample(f'{labels},le="{bound}"', cumulative, "_bucket")
+        self.sample(f'{labels},le="+Inf"', histogram.count, "_bucket")
+        self.sample(labels, round(histogram.total, 6), "_sum")
+        self.sample(labels, histogram.count, "_count")
+
+
+def render_metrics(hass: HomeAssistant) -> str:
+    """Render all Kumo metrics in the Prometheus text exposition format."""
+    families = {
+        KIND_POLL: _Family(
+            "kumo_poll_duration_seconds",
+            "histogram",
+            "Time taken by status polls, including executor wait.",
+        ),
+        KIND_COMMAND: _Family(
+            "kumo_command_duration_seconds",
+            "histogram",
+            "Time taken by commands, including executor wait.",
+        ),
+    }
+    executor_wait = _Family(
+        "kumo_executor_wait_seconds",
+        "histogram",
+        "Time adapter calls spent queued before an executor thread picked them up.",
+    )
+    queue_depth = _Family(
+        "kumo_queue_depth",
+        "gauge",
+        "Adapter calls of the account waiting for a transport slot right now.",
+    )
+    in_flight = _Family(
+        "kumo_in_flight", "gauge", "Adapter calls of the unit running right now."
+    )
+    timeouts = _Family(
+        "kumo_timeouts_total", "counter", "Adapter calls that timed out."
+    )
+    errors = _Family(
+        "kumo_errors_total", "counter", "Adapter calls that failed without timing out."
+    )
+    noop = _Family(
+        "kumo_noop_commands_total",
+        "counter",
+        "Commands sent while the last known state already matched them.",
+    )
+    state_writes = _Family(
+        "kumo_state_writes_total", "counter", "Entity state writes per unit."
+    )
+    last_success = _Family(
+        "kumo_last_success_timestamp_seconds",
+        "gauge",
+        "Unix time of the last successful adapter call.",
+    )
+
+    transport = get_transport(hass)
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+        coordinators = entry_data.get(KUMO_DATA_COORDINATORS)
+        if coordinators is None:
+            continue
+        queue_depth.sample(
+            _labels(account=entry.entry_id), transport.entry_waiting(entry.entry_id)
+        )
+        for serial, coordinator in coordinators.items():
+            metrics = coordinator.metrics
+            # Labels are not unique, so the serial tells units apart.
+            labels = _labels(
+                account=entry.entry_id, serial=serial, unit=coordinator.label
+            )
+            for kind, family in families.items():
+                family.histogram(labels, metrics.latency[kind])
+            executor_wait.histogram(labels, metrics.executor_wait)
+            in_flight.sample(labels, metrics.in_flight)
+            for kind in (KIND_POLL, KIND_COMMAND):
+                kind_labels = f'{labels},kind="{kind}"'
+                timeouts.sample(kind_labels, metrics.timeouts[kind])
+                errors.sample(kind_labels, metrics.errors[kind])
+            noop.sample(labels, metrics.noop_commands)
+            state_writes.sample(labels, metrics.state_writes)
+            if metrics.last_success is not None:
+                last_success.sample(labels, metrics.last_success.timestamp())
+
+    cache_writes = _Family(
+        "kumo_cache_writes_total", "counter", "Writes of the Kumo config cache."
+    )
+    cache_writes.sample("", get_integration_metrics(hass).cache_writes)
+
+    lines = []
+    for family in (
+        *families.values(),
+        executor_wait,
+        queue_depth,
+        in_flight,
+        timeouts,
+        errors,
+        noop,
+        state_writes,
+        last_success,
+        cache_writes,
+    ):
+        lines.extend(family.lines)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,159 @@
+"""Streaming runtime and compressor cycle statistics for indoor units.
+
+Every successful poll classifies the unit as heating, cooling, defrosting,
+idle or off, and the time since the previous poll is credited to the state
+seen then. Totals, the number of compressor cycles and a sliding-window
+cycle rate are kept in constant memory, so runtime dashboards need no
+recorder history queries.
+
+When a Kumo Station shares the outdoor temperature, heating time is also
+weighted by it and each defrost records the temperature it started at.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+RUNTIME_HEATING = "heating"
+RUNTIME_COOLING = "cooling"
+RUNTIME_DEFROST = "defrost"
+RUNTIME_IDLE = "idle"
+RUNTIME_STATES = (RUNTIME_HEATING, RUNTIME_COOLING, RUNTIME_DEFROST, RUNTIME_IDLE)
+RUNTIME_CYCLES = "cycles"
+
+# pykumo operating modes. Dry mode runs the compressor in cooling, so its
+# time counts as cooling; auto and vent without an active call count as idle.
+_MODE_STATES = {
+    "heat": RUNTIME_HEATING,
+    "autoHeat": RUNTIME_HEATING,
+    "cool": RUNTIME_COOLING,
+    "autoCool": RUNTIME_COOLING,
+    "dry": RUNTIME_COOLING,
+    "auto": RUNTIME_IDLE,
+    "vent": RUNTIME_IDLE,
+}
+# A compressor cycle starts when the unit enters one of these states from
+# any state other than defrost, which is part of a heating cycle.
+_ACTIVE_STATES = frozenset({RUNTIME_HEATING, RUNTIME_COOLING, RUNTIME_DEFROST})
+
+# Never credit more than this many seconds between two polls; longer gaps
+# mean the unit was unreachable and its state is unknown.
+MAX_SAMPLE_GAP = 600.0
+CYCLE_WINDOW = 3600.0
+
+
+def runtime_state(device) -> str | None:
+    """Return the runtime state of a pykumo indoor unit, or None when off."""
+    if device.get_defrost():
+        return RUNTIME_DEFROST
+    mode = device.get_mode()
+    if mode is None or mode == "off":
+        return None
+    if device.get_standby():
+        return RUNTIME_IDLE
+    return _MODE_STATES.get(mode, RUNTIME_IDLE)
+
+
+class KumoRuntimeAccumulator:
+    """Accumulate time per runtime state and count compressor cycles.
+
+    The cycle rate uses two fixed one-hour windows: the count of the current
+    window plus the previous window's count weighted by how much of it still
+    overlaps the trailing hour.
+    """
+
+    __slots__ = (
+        "totals",
+        "state",
+        "cycles_per_hour",
+        "max_gap",
+        "_last",
+        "defrosts",
+        "last_defrost_outdoor_temperature",
+        "_heating_outdoor",
+        "_restored",
+        "_window_start",
+        "_window_cycles",
+        "_previous_window_cycles",
+    )
+
+    def __init__(self, max_gap: float = MAX_SAMPLE_GAP) -> None:
+        """Initialize an accumulator that has not seen a poll yet."""
+        self.totals: dict[str, float] = dict.fromkeys(
+            (*RUNTIME_STATES, RUNTIME_CYCLES), 0.0
+        )
+        self.state: str | None = None
+        self.cycles_per_hour = 0.0
+        self.max_gap = max_gap
+        self.defrosts = 0
+        self.last_defrost_outdoor_temperature: float | None = None
+        self._heating_outdoor = [0.0, 0.0]  # temperature-seconds, seconds
+        self._last: float | None = None
+        self._restored: set[str] = set()
+        self._window_start: float | None = None
+        self._window_cycles = 0
+        self._previous_window_cycles = 0
+
+    def sample(
+        self, state: str | None, now: float, outdoor_temperature: float | None = None
+    ) -> None:
+        """Record the state seen by a poll at monotonic time `now`."""
+        previous = self.state
+        if self._last is not None:
+            if previous is not None:
+                elapsed = min(now - self._last, self.max_gap)
+                self.totals[previous] += elapsed
+                if previous == RUNTIME_HEATING and outdoor_temperature is not None:
+                    self._heating_outdoor[0] += outdoor_temperature * elapsed
+                    self._heating_outdoor[1] += elapsed
+            if state in _ACTIVE_STATES and previous not in _ACTIVE_STATES:
+                self.totals[RUNTIME_CYCLES] += 1
+                self._window_cycles += 1
+            if state == RUNTIME_DEFROST and previous != RUNTIME_DEFROST:
+                self.defrosts += 1
+                self.last_defrost_outdoor_temperature = outdoor_temperature
+        self.state = state
+        self._last = now
+        self._update_rate(now)
+
+    def _update_rate(self, now: float) -> None:
+        if self._window_start is None:
+            self._window_start = now
+        elapsed = now - self._window_start
+        if elapsed >= CYCLE_WINDOW:
+            windows = elapsed // CYCLE_WINDOW
+            self._previous_window_cycles = self._window_cycles if windows == 1 else 0
+            self._window_cycles = 0
+            self._window_start += windows * CYCLE_WINDOW
+            elapsed = now - self._window_start
+        overlap = 1.0 - elapsed / CYCLE_WINDOW
+        self.cycles_per_hour = round(
+            self._previous_window_cycles * overlap + self._window_cycles, 2
+        )
+
+    @property
+    def heating_outdoor_temperature(self) -> float | None:
+        """Return the mean outdoor temperature over the time spent heating."""
+        weighted, seconds = self._heating_outdoor
+        return weighted / seconds if seconds else None
+
+    def restore(self, key: str, value: float) -> None:
+        """Add a total restored from before a restart, once per key."""
+        if key in self._restored:
+            return
+        self._restored.add(key)
+        self.totals[key] += value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly representation."""
+        return {
+            "state": self.state,
+            "seconds": {
+                state: round(self.totals[state], 1) for state in RUNTIME_STATES
+            },
+            "cycles": int(self.totals[RUNTIME_CYCLES]),
+            "cycles_per_hour": self.cycles_per_hour,
+            "defrosts": self.defrosts,
+            "last_defrost_outdoor_temperature": self.last_defrost_outdoor_temperature,
+            "heating_outdoor_temperature": self.heating_outdoor_temperature,
+        }
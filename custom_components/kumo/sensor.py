@@ -5,9 +5,20 @@ import logging
 import voluptuous as vol
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 
-from .const import DOMAIN, KUMO_DATA_COORDINATORS
+from .const import (
+    DOMAIN,
+    KUMO_DATA_COORDINATORS,
+    KUMO_DATA_FLEET,
+    KUMO_DATA_HEALTH,
+    SIGNAL_UNIT_ADDED,
+)
 from .coordinator import KumoDataUpdateCoordinator
-from .entity import CoordinatedKumoEntity
+from .deadband import (
+    MEASUREMENT_HUMIDITY,
+    MEASUREMENT_SIGNAL,
+    MEASUREMENT_TEMPERATURE,
+)
+from .entity import CoordinatedKumoEntity, FilteredKumoEntity
 from .temperature import c_to_f
 
 try:
@@ -19,21 +30,45 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     SIGNAL_STRENGTH_DECIBELS,
+    EntityCategory,
     UnitOfTemperature,
+    UnitOfTime,
     PERCENTAGE,
     PRECISION_TENTHS,
-    STATE_UNAVAILABLE,
-    STATE_UNKNOWN,
 )
-from homeassistant.components.sensor import SensorDeviceClass
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorDeviceClass,
+    SensorStateClass,
+)
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo
 
 from . import KUMO_DATA
-from .last_hvac_mode import (
-    get_last_hvac_mode_value,
-    register_last_hvac_mode_listener,
-    set_last_hvac_mode_value,
+from .last_hvac_mode import get_last_hvac_mode_store
+from .fleet import (
+    FLEET_COOLING,
+    FLEET_FILTER_DIRTY,
+    FLEET_HEATING,
+    FLEET_MAX_TEMPERATURE,
+    FLEET_MEAN_TEMPERATURE,
+    FLEET_MIN_TEMPERATURE,
+    FLEET_OUTDOOR_TEMPERATURE,
+    FLEET_TEMPERATURES,
+    FLEET_UNAVAILABLE,
+    KumoFleet,
+)
+from .health import HEALTH_MODES, KumoHealthMonitor
+from .history import CHANNEL_HUMIDITY, CHANNEL_TEMPERATURE
+from .metrics import KIND_COMMAND, KIND_POLL
+from .runtime import (
+    RUNTIME_COOLING,
+    RUNTIME_CYCLES,
+    RUNTIME_HEATING,
+    RUNTIME_STATES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -58,37 +93,13 @@ async def async_setup_entry(
     account = hass.data[DOMAIN][entry.entry_id][KUMO_DATA].get_account()
     coordinators = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]
 
+    registry = er.async_get(hass)
+
     entities = []
     all_serials = await hass.async_add_executor_job(account.get_all_units)
     for serial in all_serials:
-        coordinator = coordinators[serial]
-
-        entities.append(KumoCurrentHumidity(coordinator))
-        _LOGGER.debug(
-            "Adding entity: current_humidity for %s",
-            coordinator.get_device().get_name(),
-        )
-        entities.append(KumoCurrentTemperature(coordinator))
-        _LOGGER.debug(
-            "Adding entity: current_temperature for %s",
-            coordinator.get_device().get_name(),
-        )
-        entities.append(KumoLastHvacModeSensor(coordinator))
-        _LOGGER.debug(
-            "Adding entity: last_hvac_mode for %s", coordinator.get_device().get_name()
-        )
-        entities.append(KumoSensorBattery(coordinator))
-        _LOGGER.debug(
-            "Adding entity: sensor_battery for %s", coordinator.get_device().get_name()
-        )
-        entities.append(KumoSensorSignalStrength(coordinator))
-        _LOGGER.debug(
-            "Adding entity: sensor_signal_strength for %s",
-            coordinator.get_device().get_name(),
-        )
-        entities.append(KumoWifiSignal(coordinator))
-        _LOGGER.debug(
-            "Adding entity: wifi_signal for %s", coordinator.get_device().get_name()
+        entities.extend(
+            _unit_entities(entry, coordinators[serial], registry, async_add_entities)
         )
 
     kumo_station_serials = await hass.async_add_executor_job(account.get_kumo_stations)
@@ -100,17 +111,154 @@ async def async_setup_entry(
             coordinator.get_device().get_name(),
         )
 
+    fleet = hass.data[DOMAIN][entry.entry_id].get(KUMO_DATA_FLEET)
+    indoor_coordinators = [
+        coordinator for coordinator in coordinators.values() if coordinator.indoor_unit
+    ]
+    if fleet is not None and indoor_coordinators:
+        for key in FLEET_SENSOR_NAMES:
+            if key != FLEET_OUTDOOR_TEMPERATURE or kumo_station_serials:
+                entities.append(KumoFleetSensor(fleet, entry, key))
+        _LOGGER.debug("Adding entity: account aggregates for %s", entry.title)
+        if kumo_station_serials:
+            # The station's reading, shared with each indoor unit.
+            for coordinator in indoor_coordinators:
+                entities.append(KumoUnitOutdoorTemperature(coordinator))
+
+    health = hass.data[DOMAIN][entry.entry_id].get(KUMO_DATA_HEALTH)
+    if health is not None:
+        entities.append(KumoPollingMode(health, entry))
+        _LOGGER.debug("Adding entity: polling mode for %s", entry.title)
+
     if entities:
         async_add_entities(entities, True)
 
+    @callback
+    def _async_unit_added(serial: str) -> None:
+        coordinator = coordinators[serial]
+        unit_entities = _unit_entities(entry, coordinator, registry, async_add_entities)
+        if not coordinator.indoor_unit:
+            unit_entities.append(KumoStationOutdoorTemperature(coordinator))
+        elif any(not other.indoor_unit for other in coordinators.values()):
+            unit_entities.append(KumoUnitOutdoorTemperature(coordinator))
+        async_add_entities(unit_entities, True)
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_UNIT_ADDED.format(entry.entry_id), _async_unit_added
+        )
+    )
+
 
-class KumoCurrentHumidity(CoordinatedKumoEntity, SensorEntity):
+@callback
+def _unit_entities(
+    entry: ConfigEntry,
+    coordinator: KumoDataUpdateCoordinator,
+    registry: er.EntityRegistry,
+    async_add_entities,
+) -> list:
+    """Return the sensors of a unit; capability sensors may be added later."""
+    entities = []
+    entities.append(KumoCurrentTemperature(coordinator))
+    _LOGGER.debug(
+        "Adding entity: current_temperature for %s",
+        coordinator.get_device().get_name(),
+    )
+    entities.append(KumoLastHvacModeSensor(coordinator))
+    _LOGGER.debug(
+        "Adding entity: last_hvac_mode for %s", coordinator.get_device().get_name()
+    )
+    pending = []
+    for sensor_class, getter in CAPABILITY_SENSORS:
+        entity = sensor_class(coordinator)
+        registered = registry.async_get_entity_id(
+            SENSOR_DOMAIN, DOMAIN, entity.unique_id
+        )
+        if registered or _reports(coordinator.get_device(), getter):
+            entities.append(entity)
+            _LOGGER.debug("Adding entity: %s", entity.name)
+        else:
+            pending.append((entity, getter))
+    if pending:
+        _async_add_when_reported(entry, coordinator, pending, async_add_entities)
+    if coordinator.runtime is not None:
+        for state in RUNTIME_STATES:
+            entities.append(KumoRuntime(coordinator, state))
+        entities.append(KumoCompressorCycles(coordinator))
+        entities.append(KumoCyclesPerHour(coordinator))
+        _LOGGER.debug(
+            "Adding entity: runtime statistics for %s",
+            coordinator.get_device().get_name(),
+        )
+    if coordinator.history is not None:
+        entities.append(KumoTemperatureTrend(coordinator))
+        entities.append(KumoTimeToSetpoint(coordinator))
+        _LOGGER.debug(
+            "Adding entity: trends for %s", coordinator.get_device().get_name()
+        )
+    entities.append(KumoLatency(coordinator, KIND_POLL))
+    entities.append(KumoLatency(coordinator, KIND_COMMAND))
+    entities.append(KumoTimeoutCount(coordinator))
+    entities.append(KumoErrorCount(coordinator))
+    entities.append(KumoLastSuccess(coordinator))
+    _LOGGER.debug(
+        "Adding entity: I/O diagnostics for %s",
+        coordinator.get_device().get_name(),
+    )
+    return entities
+
+
+def _reports(device, getter: str) -> bool:
+    """Return True if `device` has a value for the pykumo `getter`."""
+    method = getattr(device, getter, None)
+    return method is not None and method() is not None
+
+
+@callback
+def _async_add_when_reported(
+    entry: ConfigEntry,
+    coordinator: KumoDataUpdateCoordinator,
+    pending,
+    async_add_entities,
+) -> None:
+    """Add capability sensors once their unit first reports the data they show."""
+    unsub = None
+
+    @callback
+    def _async_check() -> None:
+        nonlocal unsub
+        device = coordinator.get_device()
+        ready = [entity for entity, getter in pending if _reports(device, getter)]
+        if not ready:
+            return
+        pending[:] = [item for item in pending if item[0] not in ready]
+        for entity in ready:
+            _LOGGER.debug("Adding entity: %s", entity.name)
+        async_add_entities(ready)
+        if not pending and unsub is not None:
+            unsub()
+            unsub = None
+
+    unsub = coordinator.async_add_listener(_async_check)
+
+    @callback
+    def _async_unsub() -> None:
+        if unsub is not None:
+            unsub()
+
+    entry.async_on_unload(_async_unsub)
+
+
+class KumoCurrentHumidity(FilteredKumoEntity, SensorEntity):
     """Representation of a Kumo's Unit's Current Humidity"""
 
+    _filter_key = "current_humidity"
+    _measurement = MEASUREMENT_HUMIDITY
+
     def __init__(self, coordinator: KumoDataUpdateCoordinator):
         """Initialize the kumo station."""
         super().__init__(coordinator)
-        self._name = self._pykumo.get_name() + " Current Humidity"
+        self._name = self._label + " Current Humidity"
 
     @property
     def unique_id(self):
@@ -122,8 +270,7 @@ class KumoCurrentHumidity(CoordinatedKumoEntity, SensorEntity):
         """Return the unit of measurement which this thermostat uses."""
         return PERCENTAGE
 
-    @property
-    def native_value(self):
+    def _read_value(self):
         """Return the current humidity level."""
         return self._pykumo.get_current_humidity()
 
@@ -142,13 +289,16 @@ class KumoCurrentHumidity(CoordinatedKumoEntity, SensorEntity):
         return False
 
 
-class KumoCurrentTemperature(CoordinatedKumoEntity, SensorEntity):
+class KumoCurrentTemperature(FilteredKumoEntity, SensorEntity):
     """Representation of a Kumo's Unit's Current Temperature"""
 
+    _filter_key = "current_temperature"
+    _measurement = MEASUREMENT_TEMPERATURE
+
     def __init__(self, coordinator: KumoDataUpdateCoordinator):
         """Initialize the kumo station."""
         super().__init__(coordinator)
-        self._name = self._pykumo.get_name() + " Current Temperature"
+        self._name = self._label + " Current Temperature"
 
     @property
     def _use_fahrenheit(self):
@@ -167,8 +317,7 @@ class KumoCurrentTemperature(CoordinatedKumoEntity, SensorEntity):
             return UnitOfTemperature.FAHRENHEIT
         return UnitOfTemperature.CELSIUS
 
-    @property
-    def native_value(self):
+    def _read_value(self):
         """Return the current temperature."""
         temp = self._pykumo.get_current_temperature()
         if self._use_fahrenheit:
@@ -190,15 +339,16 @@ class KumoCurrentTemperature(CoordinatedKumoEntity, SensorEntity):
         return True
 
 
-class KumoLastHvacModeSensor(CoordinatedKumoEntity, SensorEntity, RestoreEntity):
+class KumoLastHvacModeSensor(CoordinatedKumoEntity, SensorEntity):
     """Representation of a Kumo's last active HVAC mode."""
 
     def __init__(self, coordinator: KumoDataUpdateCoordinator):
         """Initialize the kumo station."""
         super().__init__(coordinator)
-        self._name = self._pykumo.get_name() + " Last HVAC Mode"
-        self._last_mode = None
-        self._unsub_last_hvac_mode = None
+        self._name = self._label + " Last HVAC Mode"
+        self._last_hvac_modes = get_last_hvac_mode_store(
+            coordinator.hass, coordinator.config_entry.entry_id
+        )
 
     @property
     def unique_id(self):
@@ -208,31 +358,19 @@ class KumoLastHvacModeSensor(CoordinatedKumoEntity, SensorEntity, RestoreEntity)
     @property
     def native_value(self):
         """Return the last active HVAC mode."""
-        self._last_mode = self._last_mode or get_last_hvac_mode_value(
-            self.hass, self._identifier
-        )
-        return self._last_mode
+        return self._last_hvac_modes.get(self._identifier)
 
     async def async_added_to_hass(self):
-        """Restore last state and listen for updates."""
+        """Listen for updates of the stored mode."""
         await super().async_added_to_hass()
-        self._unsub_last_hvac_mode = register_last_hvac_mode_listener(
-            self.hass, self._identifier, self._handle_last_hvac_mode_update
+        self.async_on_remove(
+            self._last_hvac_modes.async_add_listener(
+                self._identifier, self._handle_last_hvac_mode_update
+            )
         )
-        last_state = await self.async_get_last_state()
-        if last_state and last_state.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
-            set_last_hvac_mode_value(self.hass, self._identifier, last_state.state)
-            self._last_mode = last_state.state
-
-    async def async_will_remove_from_hass(self):
-        """Unregister listeners."""
-        await super().async_will_remove_from_hass()
-        if self._unsub_last_hvac_mode:
-            self._unsub_last_hvac_mode()
-            self._unsub_last_hvac_mode = None
 
+    @callback
     def _handle_last_hvac_mode_update(self, value):
-        self._last_mode = value
         self.async_write_ha_state()
 
     @property
@@ -247,7 +385,7 @@ class KumoSensorBattery(CoordinatedKumoEntity, SensorEntity):
     def __init__(self, coordinator: KumoDataUpdateCoordinator):
         """Initialize the kumo station."""
         super().__init__(coordinator)
-        self._name = self._pykumo.get_name() + " Sensor Battery"
+        self._name = self._label + " Sensor Battery"
 
     @property
     def unique_id(self):
@@ -274,13 +412,16 @@ class KumoSensorBattery(CoordinatedKumoEntity, SensorEntity):
         return False
 
 
-class KumoSensorSignalStrength(CoordinatedKumoEntity, SensorEntity):
+class KumoSensorSignalStrength(FilteredKumoEntity, SensorEntity):
     """Representation of a Kumo Sensor's Signal Strength."""
 
+    _filter_key = "sensor_rssi"
+    _measurement = MEASUREMENT_SIGNAL
+
     def __init__(self, coordinator: KumoDataUpdateCoordinator):
         """Initialize the kumo station."""
         super().__init__(coordinator)
-        self._name = self._pykumo.get_name() + " Sensor Signal Strength"
+        self._name = self._label + " Sensor Signal Strength"
 
     @property
     def unique_id(self):
@@ -292,9 +433,8 @@ class KumoSensorSignalStrength(CoordinatedKumoEntity, SensorEntity):
         """Return the unit of measurement which this thermostat uses."""
         return SIGNAL_STRENGTH_DECIBELS
 
-    @property
-    def native_value(self):
-        """Return the sengor's signal strength in rssi."""
+    def _read_value(self):
+        """Return the sensor's signal strength in rssi."""
         return self._pykumo.get_sensor_rssi()
 
     @property
@@ -307,13 +447,16 @@ class KumoSensorSignalStrength(CoordinatedKumoEntity, SensorEntity):
         return False
 
 
-class KumoStationOutdoorTemperature(CoordinatedKumoEntity, SensorEntity):
+class KumoStationOutdoorTemperature(FilteredKumoEntity, SensorEntity):
     """Representation of a Kumo Station Outdoor Temperature Sensor."""
 
+    _filter_key = "outdoor_temperature"
+    _measurement = MEASUREMENT_TEMPERATURE
+
     def __init__(self, coordinator: KumoDataUpdateCoordinator):
         """Initialize the kumo station."""
         super().__init__(coordinator)
-        self._name = self._pykumo.get_name() + " Outdoor Temperature"
+        self._name = self._label + " Outdoor Temperature"
 
     @property
     def _use_fahrenheit(self):
@@ -332,8 +475,7 @@ class KumoStationOutdoorTemperature(CoordinatedKumoEntity, SensorEntity):
             return UnitOfTemperature.FAHRENHEIT
         return UnitOfTemperature.CELSIUS
 
-    @property
-    def native_value(self):
+    def _read_value(self):
         """Return the unit's reported outdoor temperature."""
         temp = self._pykumo.get_outdoor_temperature()
         if self._use_fahrenheit:
@@ -355,13 +497,84 @@ class KumoStationOutdoorTemperature(CoordinatedKumoEntity, SensorEntity):
         return False
 
 
-class KumoWifiSignal(CoordinatedKumoEntity, SensorEntity):
+class KumoUnitOutdoorTemperature(CoordinatedKumoEntity, SensorEntity):
+    """Representation of the outdoor temperature shared with a Kumo unit."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator):
+        """Initialize the shared outdoor temperature sensor."""
+        super().__init__(coordinator)
+        self._name = self._label + " Outdoor Temperature"
+        self._written = None
+
+    @property
+    def _use_fahrenheit(self):
+        """Return True if the user's HA config is set to Fahrenheit."""
+        return self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-outdoor-temperature"
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return the unit of measurement which this thermostat uses."""
+        if self._use_fahrenheit:
+            return UnitOfTemperature.FAHRENHEIT
+        return UnitOfTemperature.CELSIUS
+
+    @property
+    def native_value(self):
+        """Return the account's Kumo Station outdoor temperature."""
+        temp = self._coordinator.fleet.outdoor_temperature
+        if temp is not None and self._use_fahrenheit:
+            temp = c_to_f(temp)
+        return temp
+
+    @property
+    def device_class(self):
+        return SensorDeviceClass.TEMPERATURE
+
+    @property
+    def precision(self):
+        """Return the precision of the system."""
+        return PRECISION_TENTHS
+
+    async def async_added_to_hass(self):
+        """Follow the shared outdoor temperature as well as the unit."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._coordinator.fleet.async_add_listener(self._handle_fleet_update)
+        )
+
+    @callback
+    def _handle_fleet_update(self):
+        """Write the state when the shared reading changed."""
+        if self._coordinator.fleet.outdoor_temperature != self._written:
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, remembering the reading written."""
+        self._written = self._coordinator.fleet.outdoor_temperature
+        super().async_write_ha_state()
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        """Disable entity by default."""
+        return False
+
+
+class KumoWifiSignal(FilteredKumoEntity, SensorEntity):
     """Representation of a Kumo's WiFi Signal Strength."""
 
+    _filter_key = "wifi_rssi"
+    _measurement = MEASUREMENT_SIGNAL
+
     def __init__(self, coordinator: KumoDataUpdateCoordinator):
         """Initialize the kumo station."""
         super().__init__(coordinator)
-        self._name = self._pykumo.get_name() + " Signal Strength"
+        self._name = self._label + " Signal Strength"
 
     @property
     def unique_id(self):
@@ -373,8 +586,7 @@ class KumoWifiSignal(CoordinatedKumoEntity, SensorEntity):
         """Return the unit of measurement which this thermostat uses."""
         return SIGNAL_STRENGTH_DECIBELS
 
-    @property
-    def native_value(self):
+    def _read_value(self):
         """Return the WiFi signal rssi."""
         return self._pykumo.get_wifi_rssi()
 
@@ -386,3 +598,581 @@ class KumoWifiSignal(CoordinatedKumoEntity, SensorEntity):
     def entity_registry_enabled_default(self) -> bool:
         """Disable entity by default."""
         return False
+
+
+class KumoRunState(CoordinatedKumoEntity, SensorEntity):
+    """Representation of a Kumo's adapter run state."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator):
+        """Initialize the run state sensor."""
+        super().__init__(coordinator)
+        self._name = self._label + " Run State"
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-runstate"
+
+    @property
+    def native_value(self):
+        """Return the adapter's run state, e.g. normal."""
+        return self._pykumo.get_runstate()
+
+    @property
+    def entity_category(self):
+        return EntityCategory.DIAGNOSTIC
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        """Disable entity by default."""
+        return False
+
+
+class KumoRuntime(CoordinatedKumoEntity, RestoreSensor):
+    """Representation of the total time a Kumo spent in one runtime state."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator, state: str):
+        """Initialize the runtime sensor for `state`."""
+        super().__init__(coordinator)
+        self._state = state
+        self._name = f"{self._label} {state.capitalize()} Runtime"
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-runtime-{self._state}"
+
+    async def async_added_to_hass(self):
+        """Continue from the total saved before a restart."""
+        await super().async_added_to_hass()
+        last_data = await self.async_get_last_sensor_data()
+        if last_data is not None and last_data.native_value is not None:
+            self._coordinator.runtime.restore(
+                self._state, float(last_data.native_value) * 3600
+            )
+
+    @property
+    def native_unit_of_measurement(self):
+        return UnitOfTime.HOURS
+
+    @property
+    def native_value(self):
+        """Return the hours spent in this state."""
+        return round(self._coordinator.runtime.totals[self._state] / 3600, 4)
+
+    @property
+    def suggested_display_precision(self):
+        return 2
+
+    @property
+    def device_class(self):
+        return SensorDeviceClass.DURATION
+
+    @property
+    def state_class(self):
+        return SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        """Enable heating and cooling runtime by default."""
+        return self._state in (RUNTIME_HEATING, RUNTIME_COOLING)
+
+
+class KumoCompressorCycles(CoordinatedKumoEntity, RestoreSensor):
+    """Representation of the number of compressor cycles of a Kumo."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator):
+        """Initialize the cycle counter."""
+        super().__init__(coordinator)
+        self._name = self._label + " Compressor Cycles"
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-compressor-cycles"
+
+    async def async_added_to_hass(self):
+        """Continue from the count saved before a restart."""
+        await super().async_added_to_hass()
+        last_data = await self.async_get_last_sensor_data()
+        if last_data is not None and last_data.native_value is not None:
+            self._coordinator.runtime.restore(
+                RUNTIME_CYCLES, int(last_data.native_value)
+            )
+
+    @property
+    def native_value(self):
+        """Return the number of times heating or cooling started."""
+        return int(self._coordinator.runtime.totals[RUNTIME_CYCLES])
+
+    @property
+    def state_class(self):
+        return SensorStateClass.TOTAL_INCREASING
+
+
+class KumoCyclesPerHour(CoordinatedKumoEntity, SensorEntity):
+    """Representation of the compressor cycle rate of a Kumo."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator):
+        """Initialize the cycle rate sensor."""
+        super().__init__(coordinator)
+        self._name = self._label + " Cycles Per Hour"
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-cycles-per-hour"
+
+    @property
+    def native_unit_of_measurement(self):
+        return "cycles/h"
+
+    @property
+    def native_value(self):
+        """Return the compressor cycles over the trailing hour."""
+        return self._coordinator.runtime.cycles_per_hour
+
+    @property
+    def state_class(self):
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        """Disable entity by default."""
+        return False
+
+
+class KumoTemperatureTrend(CoordinatedKumoEntity, SensorEntity):
+    """Representation of a Kumo's room temperature trend."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator):
+        """Initialize the temperature trend sensor."""
+        super().__init__(coordinator)
+        self._name = self._label + " Temperature Trend"
+
+    @property
+    def _use_fahrenheit(self):
+        """Return True if the user's HA config is set to Fahrenheit."""
+        return self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-temperature-trend"
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return degrees per hour in the configured temperature unit."""
+        if self._use_fahrenheit:
+            return f"{UnitOfTemperature.FAHRENHEIT}/h"
+        return f"{UnitOfTemperature.CELSIUS}/h"
+
+    @property
+    def native_value(self):
+        """Return the rate of change of the room temperature."""
+        trend = self._coordinator.history.trend(CHANNEL_TEMPERATURE)
+        if trend is None:
+            return None
+        if self._use_fahrenheit:
+            trend *= 1.8
+        return round(trend, 2)
+
+    @property
+    def state_class(self):
+        return SensorStateClass.MEASUREMENT
+
+
+class KumoTimeToSetpoint(CoordinatedKumoEntity, SensorEntity):
+    """Representation of a Kumo's estimated time to reach its setpoint."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator):
+        """Initialize the time to setpoint sensor."""
+        super().__init__(coordinator)
+        self._name = self._label + " Time To Setpoint"
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-time-to-setpoint"
+
+    @property
+    def native_unit_of_measurement(self):
+        return UnitOfTime.MINUTES
+
+    @property
+    def native_value(self):
+        """Return the minutes until the setpoint is reached at the current trend."""
+        seconds = self._coordinator.history.time_to_setpoint()
+        if seconds is None:
+            return None
+        return round(seconds / 60, 1)
+
+    @property
+    def device_class(self):
+        return SensorDeviceClass.DURATION
+
+
+class KumoHumidityTrend(CoordinatedKumoEntity, SensorEntity):
+    """Representation of a Kumo's humidity trend."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator):
+        """Initialize the humidity trend sensor."""
+        super().__init__(coordinator)
+        self._name = self._label + " Humidity Trend"
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-humidity-trend"
+
+    @property
+    def native_unit_of_measurement(self):
+        return f"{PERCENTAGE}/h"
+
+    @property
+    def native_value(self):
+        """Return the rate of change of the humidity."""
+        trend = self._coordinator.history.trend(CHANNEL_HUMIDITY)
+        return None if trend is None else round(trend, 2)
+
+    @property
+    def state_class(self):
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        """Disable entity by default."""
+        return False
+
+
+FLEET_SENSOR_NAMES = {
+    FLEET_HEATING: "Units Heating",
+    FLEET_COOLING: "Units Cooling",
+    FLEET_UNAVAILABLE: "Units Unavailable",
+    FLEET_FILTER_DIRTY: "Dirty Filters",
+    FLEET_MEAN_TEMPERATURE: "Mean Temperature",
+    FLEET_MIN_TEMPERATURE: "Min Temperature",
+    FLEET_MAX_TEMPERATURE: "Max Temperature",
+    FLEET_OUTDOOR_TEMPERATURE: "Outdoor Temperature",
+}
+
+
+class KumoFleetSensor(SensorEntity):
+    """Representation of an aggregate over all indoor units of an account."""
+
+    _attr_should_poll = False
+
+    def __init__(self, fleet: KumoFleet, entry: ConfigEntry, key: str):
+        """Initialize the aggregate sensor for `key`."""
+        self._fleet = fleet
+        self._entry_id = entry.entry_id
+        self._key = key
+        self._name = f"Kumo {FLEET_SENSOR_NAMES[key]}"
+        self._written = None
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._entry_id}-fleet-{self._key}"
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return self._name
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the account device."""
+        return DeviceInfo(identifiers={(DOMAIN, self._entry_id)})
+
+    @property
+    def _is_temperature(self):
+        return self._key in FLEET_TEMPERATURES
+
+    @property
+    def _use_fahrenheit(self):
+        """Return True if the user's HA config is set to Fahrenheit."""
+        return self.hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return the unit of measurement."""
+        if not self._is_temperature:
+            return None
+        if self._use_fahrenheit:
+            return UnitOfTemperature.FAHRENHEIT
+        return UnitOfTemperature.CELSIUS
+
+    @property
+    def native_value(self):
+        """Return the aggregate value."""
+        value = self._fleet.value(self._key)
+        if value is None or not self._is_temperature:
+            return value
+        if self._use_fahrenheit:
+            value = c_to_f(value)
+        return round(value, 1)
+
+    @property
+    def device_class(self):
+        if self._is_temperature:
+            return SensorDeviceClass.TEMPERATURE
+        return None
+
+    @property
+    def state_class(self):
+        return SensorStateClass.MEASUREMENT
+
+    async def async_added_to_hass(self):
+        """Follow the account aggregates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._fleet.async_add_listener(self._handle_fleet_update))
+
+    @callback
+    def _handle_fleet_update(self):
+        """Write the state only when this aggregate changed."""
+        if self._fleet.value(self._key) != self._written:
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, remembering the value written."""
+        self._written = self._fleet.value(self._key)
+        super().async_write_ha_state()
+
+
+class KumoPollingMode(SensorEntity):
+    """Representation of whether an account is shedding failing units."""
+
+    _attr_should_poll = False
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = list(HEALTH_MODES)
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, health: KumoHealthMonitor, entry: ConfigEntry):
+        """Initialize the polling mode sensor."""
+        self._health = health
+        self._entry_id = entry.entry_id
+        self._name = "Kumo Polling Mode"
+        self._written = None
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._entry_id}-polling-mode"
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return self._name
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the account device."""
+        return DeviceInfo(identifiers={(DOMAIN, self._entry_id)})
+
+    @property
+    def native_value(self):
+        """Return the polling mode."""
+        return self._health.mode
+
+    @property
+    def extra_state_attributes(self):
+        """Return how many units are failing."""
+        return {
+            "failing_units": self._health.failing,
+            "failure_ratio": round(self._health.failure_ratio, 3),
+        }
+
+    async def async_added_to_hass(self):
+        """Follow the health monitor."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._health.async_add_listener(self._handle_health_update)
+        )
+
+    @callback
+    def _handle_health_update(self):
+        """Write the state when the mode or the failing units changed."""
+        state = (self._health.mode, self._health.failing)
+        if state != self._written:
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, remembering what was written."""
+        self._written = (self._health.mode, self._health.failing)
+        super().async_write_ha_state()
+
+
+class KumoLatency(CoordinatedKumoEntity, SensorEntity):
+    """Representation of the latency of a Kumo's poll or command calls."""
+
+    _unrecorded_attributes = frozenset({"mean", "count", "buckets"})
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator, kind: str):
+        """Initialize the latency sensor."""
+        super().__init__(coordinator)
+        self._kind = kind
+        self._name = f"{self._label} {kind.capitalize()} Latency"
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-{self._kind}-latency"
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return UnitOfTime.MILLISECONDS
+
+    @property
+    def native_value(self):
+        """Return the latency of the most recent call."""
+        last = self._coordinator.metrics.latency[self._kind].last
+        if last is None:
+            return None
+        return round(last * 1000)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the latency histogram; the mean is in ms, like the state."""
+        latency = self._coordinator.metrics.latency[self._kind]
+        histogram = latency.as_dict()
+        return {
+            "mean": None if latency.mean is None else round(latency.mean * 1000),
+            "count": histogram["count"],
+            "buckets": histogram["buckets"],
+        }
+
+    @property
+    def device_class(self):
+        return SensorDeviceClass.DURATION
+
+    @property
+    def state_class(self):
+        return SensorStateClass.MEASUREMENT
+
+    @property
+    def entity_category(self):
+        return EntityCategory.DIAGNOSTIC
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        """Disable entity by default."""
+        return False
+
+
+class KumoTimeoutCount(CoordinatedKumoEntity, SensorEntity):
+    """Representation of the number of timed-out calls to a Kumo."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator):
+        """Initialize the timeout counter."""
+        super().__init__(coordinator)
+        self._name = self._label + " Timeouts"
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-timeouts"
+
+    @property
+    def native_value(self):
+        """Return the number of timeouts since startup."""
+        return self._coordinator.metrics.timeout_count
+
+    @property
+    def state_class(self):
+        return SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def entity_category(self):
+        return EntityCategory.DIAGNOSTIC
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        """Disable entity by default."""
+        return False
+
+
+class KumoErrorCount(CoordinatedKumoEntity, SensorEntity):
+    """Representation of the number of failed calls to a Kumo."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator):
+        """Initialize the error counter."""
+        super().__init__(coordinator)
+        self._name = self._label + " Errors"
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-errors"
+
+    @property
+    def native_value(self):
+        """Return the number of non-timeout errors since startup."""
+        return self._coordinator.metrics.error_count
+
+    @property
+    def state_class(self):
+        return SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def entity_category(self):
+        return EntityCategory.DIAGNOSTIC
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        """Disable entity by default."""
+        return False
+
+
+class KumoLastSuccess(CoordinatedKumoEntity, SensorEntity):
+    """Representation of the last successful call to a Kumo."""
+
+    def __init__(self, coordinator: KumoDataUpdateCoordinator):
+        """Initialize the last success sensor."""
+        super().__init__(coordinator)
+        self._name = self._label + " Last Success"
+
+    @property
+    def unique_id(self):
+        """Return unique id"""
+        return f"{self._identifier}-last-success"
+
+    @property
+    def available(self):
+        """Return True; the last success time is known even while offline."""
+        return True
+
+    @property
+    def native_value(self):
+        """Return the time of the last successful call."""
+        return self._coordinator.metrics.last_success
+
+    @property
+    def device_class(self):
+        return SensorDeviceClass.TIMESTAMP
+
+    @property
+    def entity_category(self):
+        return EntityCategory.DIAGNOSTIC
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        """Disable entity by default."""
+        return False
+
+
+# Sensors that are only created once the unit reports a value for them (or
+# that already exist in the entity registry), with the pykumo getter that
+# tells. Units without a wireless sensor never get battery, sensor signal or
+# humidity entities.
+CAPABILITY_SENSORS = (
+    (KumoCurrentHumidity, "get_current_humidity"),
+    (KumoSensorBattery, "get_sensor_battery"),
+    (KumoSensorSignalStrength, "get_sensor_rssi"),
+    (KumoWifiSignal, "get_wifi_rssi"),
+    (KumoRunState, "get_runstate"),
+    (KumoHumidityTrend, "get_current_humidity"),
+)
@@ -0,0 +1,103 @@
+"""Services for the Kumo integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ServiceValidationError
+
+from .capture import KumoCapture
+from .const import (
+    ATTR_CYCLES,
+    ATTR_DURATION,
+    DEFAULT_CAPTURE_DURATION,
+    DEFAULT_PROFILE_CYCLES,
+    DOMAIN,
+    KUMO_DATA_CAPTURE,
+    KUMO_DATA_CLOUD_REFRESH,
+    KUMO_DATA_COORDINATORS,
+    SERVICE_CAPTURE,
+    SERVICE_PROFILE,
+    SERVICE_REFRESH_CLOUD,
+)
+from .profiler import KumoProfiler
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_CAPTURE_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=3600)
+        ),
+    }
+)
+
+
+def _all_coordinators(hass: HomeAssistant) -> list:
+    coordinators = []
+    for entry in hass.config_entries.async_loaded_entries(DOMAIN):
+        entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+        coordinators.extend(entry_data.get(KUMO_DATA_COORDINATORS, {}).values())
+    return coordinators
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Kumo services."""
+
+    async def _async_profile(call: ServiceCall) -> None:
+        coordinators = _all_coordinators(hass)
+        if not coordinators:
+            raise ServiceValidationError("No Kumo units are loaded")
+        if any(coordinator.profiler is not None for coordinator in coordinators):
+            raise ServiceValidationError("A Kumo profiling run is already active")
+        cycles = call.data[ATTR_CYCLES]
+        longest_interval = max(
+            coordinator.update_interval or timedelta() for coordinator in coordinators
+        )
+        # Allow for a slow unit or two before giving up on stragglers.
+        max_duration = longest_interval * (cycles + 2)
+        KumoProfiler(hass, coordinators, cycles, max_duration).async_start()
+
+    async def _async_capture(call: ServiceCall) -> None:
+        coordinators = _all_coordinators(hass)
+        if not coordinators:
+            raise ServiceValidationError("No Kumo units are loaded")
+        domain_data = hass.data.setdefault(DOMAIN, {})
+        current = domain_data.get(KUMO_DATA_CAPTURE)
+        if current is not None and current.active:
+            raise ServiceValidationError("A Kumo capture is already running")
+        capture = KumoCapture(
+            hass, coordinators, timedelta(seconds=call.data[ATTR_DURATION])
+        )
+        domain_data[KUMO_DATA_CAPTURE] = capture
+        capture.async_start()
+
+    async def _async_refresh_cloud(call: ServiceCall) -> None:
+        entries = hass.config_entries.async_loaded_entries(DOMAIN)
+        if not entries:
+            raise ServiceValidationError("No Kumo accounts are loaded")
+        refresh = hass.data.setdefault(DOMAIN, {}).setdefault(
+            KUMO_DATA_CLOUD_REFRESH, set()
+        )
+        for entry in entries:
+            # The next setup fetches from KumoCloud even if the entry
+            # prefers the cache.
+            refresh.add(entry.entry_id)
+            await hass.config_entries.async_reload(entry.entry_id)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_CAPTURE, _async_capture, schema=CAPTURE_SCHEMA
+    )
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH_CLOUD, _async_refresh_cloud)
@@ -0,0 +1,313 @@
+"""Background resync of the account topology with KumoCloud.
+
+The units of an account are normally read once at setup. When enabled, a
+low-frequency task lists the account's zones from the cloud, compares them
+with the loaded units, and only touches what differs: new units get a
+coordinator and entities, removed units lose theirs, and renamed units are
+renamed in place. Healthy units keep polling throughout.
+
+A resync only counts if every site and zone listing succeeded, and a unit
+is only removed once it has been missing from `REMOVE_AFTER_MISSES`
+consecutive resyncs, so a cloud hiccup never deletes devices.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+import pykumo
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DHCP_DISCOVERED_KEY,
+    DOMAIN,
+    KUMO_DATA,
+    KUMO_DATA_COORDINATORS,
+    KUMO_DATA_FLEET,
+    KUMO_DATA_HEALTH,
+    SIGNAL_UNIT_ADDED,
+    SIGNAL_UNIT_RENAMED,
+)
+from .cache import async_save_cache, normalize_mac, zone_units
+from .coordinator import (
+    KumoDataUpdateCoordinator,
+    device_timeouts,
+    device_update_interval,
+)
+from .transport import get_transport
+
+_LOGGER = logging.getLogger(__name__)
+
+REMOVE_AFTER_MISSES = 3
+
+
+@dataclass
+class KumoTopologyChanges:
+    """Serials added, removed and renamed by a resync."""
+
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    renamed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.renamed)
+
+
+class KumoTopologySync:
+    """Periodically reconcile an entry's units with the cloud topology."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, interval: timedelta
+    ) -> None:
+        """Initialize the resync of `entry`."""
+        self._hass = hass
+        self._entry = entry
+        self._interval = interval
+        # Serial -> number of consecutive resyncs the unit was missing from.
+        self._misses: dict[str, int] = {}
+        # Resyncs read and replace the account's zone table; one at a time.
+        self._lock = asyncio.Lock()
+
+    @callback
+    def async_start(self) -> None:
+        """Run the resync every interval until the entry is unloaded."""
+        self._entry.async_on_unload(
+            async_track_time_interval(
+                self._hass,
+                self._async_scheduled,
+                self._interval,
+                name=f"Kumo topology resync {self._entry.title}",
+                cancel_on_shutdown=True,
+            )
+        )
+
+    @callback
+    def _async_scheduled(self, _now) -> None:
+        if self._lock.locked():
+            _LOGGER.debug("Kumo topology resync still running; skipping this one")
+            return
+        # As an entry task, a resync still running is cancelled on unload.
+        self._entry.async_create_background_task(
+            self._hass,
+            self.async_sync(),
+            name=f"Kumo topology resync {self._entry.title}",
+        )
+
+    def _fetch_zones(self) -> dict[str, dict[str, Any]] | None:
+        """Return serial -> {label, unitType, mac} from the cloud, or None.
+
+        pykumo answers a failed site or zone listing with an empty list, so an
+        empty listing fails the whole fetch rather than hiding units.
+        """
+        cloud = pykumo.KumoCloudV3(
+            self._entry.data.get(CONF_USERNAME), self._entry.data.get(CONF_PASSWORD)
+        )
+        if not cloud.login():
+            return None
+        zones = {}
+        for site in cloud.get_sites():
+            if not site.get("id"):
+                continue
+            site_zones = cloud.get_zones(site["id"])
+            if not site_zones:
+                _LOGGER.debug("Kumo site %s listed no zones", site["id"])
+                return None
+            for zone in site_zones:
+                adapter = zone.get("adapter", {})
+                serial = adapter.get("deviceSerial")
+                if serial:
+                    zones[serial] = {
+                        "label": zone.get("name", ""),
+                        "unitType": adapter.get("unitType", "ductless"),
+                        "mac": adapter.get("macAddress", ""),
+                    }
+        return zones
+
+    def _fetch_credentials(self) -> dict[str, dict[str, Any]]:
+        cloud = pykumo.KumoCloudV3(
+            self._entry.data.get(CONF_USERNAME), self._entry.data.get(CONF_PASSWORD)
+        )
+        return cloud.get_all_device_credentials()
+
+    async def async_sync(self) -> KumoTopologyChanges:
+        """Fetch the cloud topology and apply the differences."""
+        async with self._lock:
+            return await self._async_sync()
+
+    async def _async_sync(self) -> KumoTopologyChanges:
+        changes = KumoTopologyChanges()
+        try:
+            zones = await self._hass.async_add_executor_job(self._fetch_zones)
+        except Exception as err:  # noqa: BLE001 - pykumo raises anything
+            _LOGGER.warning("Kumo topology resync failed: %s", err)
+            return changes
+        if not zones:
+            # An empty answer is far more likely a cloud problem than an
+            # account without units; never remove everything because of it.
+            _LOGGER.debug("Kumo topology resync got no units; keeping topology")
+            return changes
+
+        entry_data = self._hass.data[DOMAIN][self._entry.entry_id]
+        settings = entry_data[KUMO_DATA]
+        coordinators = entry_data[KUMO_DATA_COORDINATORS]
+        try:
+            cached_units = zone_units(settings.get_account().get_raw_json())
+        except (KeyError, IndexError, TypeError):
+            cached_units = {}
+        # The rebuilt cache keeps every unit in a single zone table.
+        zone_table = {serial: dict(unit) for serial, unit in cached_units.items()}
+
+        changes.added = [serial for serial in zones if serial not in coordinators]
+        changes.removed = self._update_misses(coordinators, zones)
+        # pykumo suffixes duplicate names, so compare with the cached label.
+        changes.renamed = [
+            serial
+            for serial, zone in zones.items()
+            if serial in coordinators
+            and serial in zone_table
+            and zone["label"]
+            and zone["label"] != zone_table[serial].get("label")
+        ]
+        if not changes:
+            return changes
+        _LOGGER.info(
+            "Kumo topology changed: added %s, removed %s, renamed %s",
+            changes.added,
+            changes.removed,
+            changes.renamed,
+        )
+
+        if changes.added:
+            try:
+                credentials = await self._hass.async_add_executor_job(
+                    self._fetch_credentials
+                )
+            except Exception as err:  # noqa: BLE001 - pykumo raises anything
+                _LOGGER.warning("Kumo could not fetch new unit credentials: %s", err)
+                credentials = {}
+            candidate_ips = {
+                normalize_mac(mac): address
+                for mac, address in self._hass.data.get(DHCP_DISCOVERED_KEY, {}).items()
+            }
+            for serial in list(changes.added):
+                unit = {**zones[serial], **credentials.get(serial, {})}
+                if not (unit.get("password") and unit.get("cryptoSerial")):
+                    _LOGGER.warning("Kumo unit %s has no credentials yet", serial)
+                    changes.added.remove(serial)
+                    continue
+                unit["serial"] = serial
+                unit["address"] = candidate_ips.get(normalize_mac(unit["mac"]), "")
+                zone_table[serial] = unit
+        for serial in changes.removed:
+            zone_table.pop(serial, None)
+        for serial in changes.renamed:
+            if serial in zone_table:
+                zone_table[serial]["label"] = zones[serial]["label"]
+
+        kumo_dict = [{}, {}, {"children": [{"zoneTable": zone_table}]}]
+        account = pykumo.KumoCloudAccount(
+            self._entry.data.get(CONF_USERNAME),
+            self._entry.data.get(CONF_PASSWORD),
+            kumo_dict=kumo_dict,
+        )
+        settings.set_account(account)
+        get_transport(self._hass).async_register_entry(self._entry.entry_id, kumo_dict)
+        await async_save_cache(self._hass, self._entry.entry_id, kumo_dict)
+
+        for serial in changes.removed:
+            await self._async_remove_unit(coordinators, serial)
+        for serial in changes.renamed:
+            self._async_rename_unit(coordinators[serial], zones[serial]["label"])
+        if changes.added:
+            await self._async_add_units(account, coordinators, changes.added)
+        return changes
+
+    def _update_misses(self, coordinators, zones) -> list[str]:
+        """Count the resyncs each unit was missing from; return those to remove."""
+        removed = []
+        for serial in coordinators:
+            if serial in zones:
+                self._misses.pop(serial, None)
+                continue
+            misses = self._misses[serial] = self._misses.get(serial, 0) + 1
+            if misses >= REMOVE_AFTER_MISSES:
+                removed.append(serial)
+            else:
+                _LOGGER.debug(
+                    "Kumo unit %s missing from %d of %d resyncs before removal",
+                    serial,
+                    misses,
+                    REMOVE_AFTER_MISSES,
+                )
+        for serial in removed:
+            del self._misses[serial]
+        return removed
+
+    async def _async_add_units(self, account, coordinators, serials) -> None:
+        options = self._entry.options
+        devices = await self._hass.async_add_executor_job(
+            account.make_pykumos, device_timeouts(options), False
+        )
+        added = {}
+        for device in devices.values():
+            serial = device.get_serial()
+            if serial in serials:
+                added[serial] = KumoDataUpdateCoordinator(
+                    self._hass,
+                    device,
+                    config_entry=self._entry,
+                    update_interval=device_update_interval(options, device),
+                )
+        for serial, coordinator in added.items():
+            coordinators[serial] = coordinator
+            await coordinator.async_refresh()
+        entry_data = self._hass.data[DOMAIN][self._entry.entry_id]
+        for tracker in (
+            entry_data.get(KUMO_DATA_FLEET),
+            entry_data.get(KUMO_DATA_HEALTH),
+        ):
+            if tracker is not None:
+                tracker.async_track(self._entry, added)
+        for serial in added:
+            async_dispatcher_send(
+                self._hass, SIGNAL_UNIT_ADDED.format(self._entry.entry_id), serial
+            )
+
+    async def _async_remove_unit(self, coordinators, serial: str) -> None:
+        coordinator = coordinators.pop(serial)
+        await coordinator.async_shutdown()
+        entry_data = self._hass.data[DOMAIN][self._entry.entry_id]
+        for tracker in (
+            entry_data.get(KUMO_DATA_FLEET),
+            entry_data.get(KUMO_DATA_HEALTH),
+        ):
+            if tracker is not None:
+                tracker.async_remove_unit(serial)
+        # Removing the device from the entry removes its entities too.
+        device_registry = dr.async_get(self._hass)
+        device = device_registry.async_get_device(identifiers={(DOMAIN, serial)})
+        if device is not None:
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=self._entry.entry_id
+            )
+
+    @callback
+    def _async_rename_unit(self, coordinator, label: str) -> None:
+        serial = coordinator.get_device().get_serial()
+        coordinator.async_set_label(label)
+        device_registry = dr.async_get(self._hass)
+        registry_device = device_registry.async_get_device(
+            identifiers={(DOMAIN, serial)}
+        )
+        if registry_device is not None:
+            device_registry.async_update_device(registry_device.id, name=label)
+        async_dispatcher_send(self._hass, SIGNAL_UNIT_RENAMED.format(serial))
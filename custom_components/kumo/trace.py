@@ -0,0 +1,83 @@
+"""Fixed-size ring buffer of recent adapter requests."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+TRACE_SIZE = 64
+
+
+class KumoTraceBuffer:
+    """Preallocated ring buffer of structured request events.
+
+    Events are stored column-wise in preallocated arrays, so recording one
+    costs a handful of slot assignments and no allocation. Formatting only
+    happens when the buffer is read, e.g. for a diagnostics download.
+    """
+
+    __slots__ = (
+        "_types",
+        "_outcomes",
+        "_starts",
+        "_durations",
+        "_sizes",
+        "_next",
+        "_recorded",
+    )
+
+    def __init__(self, size: int = TRACE_SIZE) -> None:
+        """Initialize an empty buffer holding up to `size` events."""
+        self._types: list[str | None] = [None] * size
+        self._outcomes: list[str | None] = [None] * size
+        self._starts = array("d", bytes(8 * size))
+        self._durations = array("d", bytes(8 * size))
+        self._sizes = array("l", [0] * size)
+        self._next = 0
+        self._recorded = 0
+
+    def __len__(self) -> int:
+        """Return the number of events currently held."""
+        return min(self._recorded, len(self._types))
+
+    def record(
+        self,
+        request_type: str,
+        start: float,
+        duration: float,
+        outcome: str,
+        payload_size: int,
+    ) -> None:
+        """Record one request event, overwriting the oldest if full."""
+        index = self._next
+        self._types[index] = request_type
+        self._outcomes[index] = outcome
+        self._starts[index] = start
+        self._durations[index] = duration
+        self._sizes[index] = payload_size
+        index += 1
+        self._next = 0 if index == len(self._types) else index
+        self._recorded += 1
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the held events, oldest first."""
+        size = len(self._types)
+        count = len(self)
+        first = (self._next - count) % size
+        events = []
+        for offset in range(count):
+            index = (first + offset) % size
+            events.append(
+                {
+                    "type": self._types[index],
+                    "start": round(self._starts[index], 3),
+                    "duration": round(self._durations[index], 4),
+                    "outcome": self._outcomes[index],
+                    "payload_size": self._sizes[index],
+                }
+            )
+        return events
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly representation."""
+        return {"recorded": self._recorded, "events": self.as_list()}
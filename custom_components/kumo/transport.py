@@ -0,0 +1,304 @@
+"""Process-wide I/O pool and request scheduler shared by all Kumo entries.
+
+Every adapter call of every config entry runs in one small thread pool
+owned by the integration, instead of in Home Assistant's shared executor.
+At most `MAX_CONCURRENT_REQUESTS` calls are in flight at once. When all
+slots are taken, waiting calls are queued per entry and the next free slot
+goes to the entries in turn, so an account with many units (or many slow
+ones) cannot starve another. Within an entry, commands go before polls.
+Polls of units shed by an account's health monitor go last and never hold
+more than `SHED_SHARE` of the slots, so the rest stays free for healthy
+units and commands.
+
+pykumo keeps its HTTP sessions per thread, so a fixed pool also bounds the
+number of open connections to each adapter.
+
+The transport also knows which entry each adapter belongs to, by MAC, so a
+DHCP discovery only reloads the entry that owns the adapter.
+
+When an entry unloads, its queued calls are dropped and its in-flight calls
+are abandoned: their callers return at once while the worker threads wait
+out the adapter on their own. Until they do, each abandoned call keeps its
+thread out of the slots handed out, so no call queues behind it inside the
+pool. Only when abandoned calls tie up `RETIRE_SHARE` of the pool is it
+retired and a fresh one started; a retired pool is joined and dropped as
+soon as its last abandoned call ends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .cache import normalize_mac, zone_units
+from .const import DOMAIN
+from .metrics import KIND_COMMAND
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_CONCURRENT_REQUESTS = 16
+SHED_SHARE = 0.25
+RETIRE_SHARE = 0.5
+
+_TRANSPORT_KEY = "transport"
+
+T = TypeVar("T")
+
+
+class _EntryQueue:
+    """The calls of one entry waiting for a slot."""
+
+    __slots__ = ("commands", "polls", "shed")
+
+    def __init__(self) -> None:
+        self.commands: deque[asyncio.Future] = deque()
+        self.polls: deque[asyncio.Future] = deque()
+        self.shed: deque[asyncio.Future] = deque()
+
+    def __len__(self) -> int:
+        return len(self.commands) + len(self.polls) + len(self.shed)
+
+    def popleft(self, allow_shed: bool) -> tuple[asyncio.Future, bool] | None:
+        """Return the next call and whether it is shed, if one may start."""
+        if self.commands:
+            return self.commands.popleft(), False
+        if self.polls:
+            return self.polls.popleft(), False
+        if self.shed and allow_shed:
+            return self.shed.popleft(), True
+        return None
+
+
+class KumoTransport:
+    """Run adapter calls of all entries with a global limit and fair turns."""
+
+    def __init__(
+        self, hass: HomeAssistant, limit: int = MAX_CONCURRENT_REQUESTS
+    ) -> None:
+        """Initialize an idle transport; the pool starts on first use."""
+        self._hass = hass
+        self.limit = limit
+        self.shed_limit = max(1, int(limit * SHED_SHARE))
+        self.active = 0
+        self.shed_active = 0
+        # Insertion order is the round-robin order of the entries waiting.
+        self._queues: dict[str | None, _EntryQueue] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        # Pools that still run abandoned calls, by number of such calls.
+        self._abandoned: dict[ThreadPoolExecutor, int] = {}
+        self._retired: list[ThreadPoolExecutor] = []
+        self._in_flight: dict[
+            str | None,
+            dict[asyncio.Future, tuple[ThreadPoolExecutor, Future]],
+        ] = {}
+        self._adapters: dict[str, dict[str, str]] = {}
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close)
+
+    @property
+    def capacity(self) -> int:
+        """Return the number of slots, less the threads of abandoned calls."""
+        return self.limit - self._abandoned.get(self._executor, 0)
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of calls waiting for a slot."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def entry_waiting(self, entry_id: str | None) -> int:
+        """Return the number of calls of `entry_id` waiting for a slot."""
+        queue = self._queues.get(entry_id)
+        return 0 if queue is None else len(queue)
+
+    async def async_run(
+        self,
+        entry_id: str | None,
+        kind: str,
+        func: Callable[..., T],
+        *args: Any,
+        shed: bool = False,
+    ) -> T:
+        """Run the blocking `func(*args)` in the pool when `entry_id` gets a slot.
+
+        `shed` marks the poll of a unit the entry's health monitor sheds.
+        """
+        await self._async_acquire(entry_id, kind, shed)
+        try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.limit, thread_name_prefix="kumo"
+                )
+            executor = self._executor
+            call = executor.submit(func, *args)
+            future = asyncio.wrap_future(call, loop=self._hass.loop)
+            in_flight = self._in_flight.setdefault(entry_id, {})
+            in_flight[future] = (executor, call)
+            try:
+                return await future
+            finally:
+                in_flight.pop(future, None)
+        finally:
+            self._release(shed)
+
+    async def _async_acquire(self, entry_id: str | None, kind: str, shed: bool) -> None:
+        if self.active < self.capacity and (
+            not shed or self.shed_active < self.shed_limit
+        ):
+            self.active += 1
+            self.shed_active += shed
+            return
+        future = self._hass.loop.create_future()
+        queue = self._queues.setdefault(entry_id, _EntryQueue())
+        if shed:
+            queue.shed.append(future)
+        elif kind == KIND_COMMAND:
+            queue.commands.append(future)
+        else:
+            queue.polls.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just as the caller gave up.
+                self._release(shed)
+            raise
+
+    def _release(self, shed: bool) -> None:
+        self.active -= 1
+        self.shed_active -= shed
+        self._grant()
+
+    def _grant(self) -> None:
+        queues = self._queues
+        while self.active < self.capacity:
+            allow_shed = self.shed_active < self.shed_limit
+            for entry_id, queue in queues.items():
+                if (call := queue.popleft(allow_shed)) is not None:
+                    break
+            else:
+                return
+            # The entry goes to the back of the line.
+            del queues[entry_id]
+            if queue:
+                queues[entry_id] = queue
+            future, shed = call
+            if future.cancelled():
+                continue
+            self.active += 1
+            self.shed_active += shed
+            future.set_result(None)
+
+    @callback
+    def async_cancel_entry(self, entry_id: str | None) -> int:
+        """Cancel the queued and in-flight calls of `entry_id`; return how many."""
+        cancelled = 0
+        queue = self._queues.pop(entry_id, None)
+        if queue is not None:
+            for future in (*queue.commands, *queue.polls, *queue.shed):
+                cancelled += future.cancel()
+        in_flight = self._in_flight.pop(entry_id, {})
+        for future, (executor, call) in in_flight.items():
+            cancelled += future.cancel()
+            if not call.cancel() and not call.done():
+                self._abandon(executor, call)
+        if self._abandoned.get(self._executor, 0) >= self.limit * RETIRE_SHARE:
+            self._retire_executor()
+        if cancelled:
+            _LOGGER.debug("Kumo cancelled %d calls of entry %s", cancelled, entry_id)
+        return cancelled
+
+    def _abandon(self, executor: ThreadPoolExecutor, call: Future) -> None:
+        self._abandoned[executor] = self._abandoned.get(executor, 0) + 1
+        loop = self._hass.loop
+        call.add_done_callback(
+            lambda _call: loop.call_soon_threadsafe(
+                self._async_abandoned_done, executor
+            )
+        )
+
+    @callback
+    def _async_abandoned_done(self, executor: ThreadPoolExecutor) -> None:
+        remaining = self._abandoned[executor] - 1
+        if remaining:
+            self._abandoned[executor] = remaining
+        else:
+            del self._abandoned[executor]
+            if executor in self._retired:
+                self._retired.remove(executor)
+                self._hass.async_add_executor_job(executor.shutdown, True)
+        self._grant()
+
+    def _retire_executor(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        # Threads still blocked on an adapter exit when their call ends.
+        executor.shutdown(wait=False)
+        if executor in self._abandoned:
+            self._retired.append(executor)
+        else:
+            self._hass.async_add_executor_job(executor.shutdown, True)
+
+    @callback
+    def async_register_entry(self, entry_id: str, kumo_dict: list[Any]) -> None:
+        """Record the adapters of `entry_id` from its account's raw JSON."""
+        try:
+            units = zone_units(kumo_dict)
+        except (KeyError, IndexError, TypeError):
+            units = {}
+        self._adapters[entry_id] = {
+            normalize_mac(unit.get("mac")): unit.get("address", "")
+            for unit in units.values()
+            if unit.get("mac")
+        }
+
+    @callback
+    def async_unregister_entry(self, entry_id: str) -> None:
+        """Forget an unloaded entry; stop the pool once no entry is left."""
+        self._adapters.pop(entry_id, None)
+        if not self._adapters and not self.active:
+            self._retire_executor()
+
+    def adapter_owner(self, mac: str) -> tuple[str, str] | None:
+        """Return the entry id and known address of the adapter with `mac`."""
+        mac = normalize_mac(mac)
+        for entry_id, adapters in self._adapters.items():
+            if mac in adapters:
+                return entry_id, adapters[mac]
+        return None
+
+    async def _async_close(self, _event: Event) -> None:
+        self._retire_executor()
+        retired, self._retired = self._retired, []
+        for executor in retired:
+            await self._hass.async_add_executor_job(executor.shutdown, True)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly representation."""
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "shed_active": self.shed_active,
+            "abandoned": sum(self._abandoned.values()),
+            "retired_pools": len(self._retired),
+            "waiting": {
+                str(entry_id): len(queue) for entry_id, queue in self._queues.items()
+            },
+            "entries": len(self._adapters),
+        }
+
+
+@callback
+def get_transport(hass: HomeAssistant) -> KumoTransport:
+    """Return the process-wide transport, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    transport = domain_data.get(_TRANSPORT_KEY)
+    if transport is None:
+        transport = domain_data[_TRANSPORT_KEY] = KumoTransport(hass)
+    return transport
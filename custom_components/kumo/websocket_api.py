@@ -0,0 +1,101 @@
+"""Websocket API streaming Kumo unit state."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, KUMO_DATA_COORDINATORS, SIGNAL_ENTRY_UNLOADED
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the Kumo websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "kumo/subscribe",
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream the state of every unit as a snapshot followed by deltas.
+
+    The first event carries the full snapshot of each unit, keyed by serial.
+    Every later event carries, for one unit, only the fields that changed
+    since the last event sent for it. Entries loaded after subscribing are
+    not included; a unit whose entry is unloaded stops sending.
+    """
+    entries = {
+        entry_id: data[KUMO_DATA_COORDINATORS]
+        for entry_id, data in hass.data.get(DOMAIN, {}).items()
+        if isinstance(data, dict) and KUMO_DATA_COORDINATORS in data
+    }
+    if "entry_id" in msg:
+        if msg["entry_id"] not in entries:
+            connection.send_error(
+                msg["id"], websocket_api.ERR_NOT_FOUND, "Kumo entry not loaded"
+            )
+            return
+        entries = {msg["entry_id"]: entries[msg["entry_id"]]}
+
+    sent: dict[str, dict[str, Any]] = {}
+    unsubs: dict[str, list] = {}
+
+    @callback
+    def _async_unit_updated(serial: str, coordinator) -> None:
+        snapshot = coordinator.snapshot()
+        previous = sent[serial]
+        delta = {
+            field: value
+            for field, value in snapshot.items()
+            if previous.get(field) != value
+        }
+        if not delta:
+            return
+        sent[serial] = snapshot
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"units": {serial: delta}})
+        )
+
+    @callback
+    def _async_unsubscribe_entry(entry_id: str) -> None:
+        for unsub in unsubs.pop(entry_id, ()):
+            unsub()
+
+    @callback
+    def _async_unsubscribe() -> None:
+        for entry_id in list(unsubs):
+            _async_unsubscribe_entry(entry_id)
+
+    for entry_id, coordinators in entries.items():
+        unsubs[entry_id] = [
+            async_dispatcher_connect(
+                hass,
+                SIGNAL_ENTRY_UNLOADED.format(entry_id),
+                partial(_async_unsubscribe_entry, entry_id),
+            )
+        ]
+        for serial, coordinator in coordinators.items():
+            sent[serial] = coordinator.snapshot()
+            unsubs[entry_id].append(
+                coordinator.async_add_listener(
+                    partial(_async_unit_updated, serial, coordinator)
+                )
+            )
+
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {"units": sent}))
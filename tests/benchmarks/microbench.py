@@ -0,0 +1,127 @@
+"""Tiny micro-benchmark harness: ns/op, allocations and baseline comparison."""
+
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+
+def run_coroutine(coro) -> Any:
+    """Drive a coroutine that never suspends, without an event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("coroutine suspended; it cannot be micro-benchmarked")
+
+
+def count_allocations(func: Callable[[], Any], number: int = 1000) -> float:
+    """Return the memory blocks `func` allocates per call, freed or not.
+
+    A profile hook reads the number of allocated blocks at every Python and
+    C call and return; each increase since the previous event counts as new
+    allocations. Blocks allocated and freed between two events, and objects
+    served from CPython's free lists, are not seen, so this is a lower bound.
+    """
+    total = 0
+    last = 0
+
+    def _hook(frame, event, arg):
+        nonlocal total, last
+        now = sys.getallocatedblocks()
+        if now > last:
+            total += now - last
+        last = now
+
+    func()
+    last = sys.getallocatedblocks()
+    sys.setprofile(_hook)
+    try:
+        for _ in range(number):
+            func()
+    finally:
+        sys.setprofile(None)
+    return total / number
+
+
+def _noop() -> None:
+    pass
+
+
+def measure(func: Callable[[], Any], number: int = 1000, repeat: int = 5) -> dict:
+    """Time `func` and count the memory blocks it allocates per call.
+
+    The reported time is the best of `repeat` runs of `number` calls, which
+    filters out scheduler noise. ``alloc_blocks`` is the number of blocks
+    allocated per call by `count_allocations`, less the harness's own
+    overhead. ``alloc_peak_bytes`` is the largest amount of memory a single
+    call held at once, measured under tracemalloc.
+    """
+    func()
+    best = min(timeit.repeat(func, number=number, repeat=repeat))
+    blocks = count_allocations(func, number) - count_allocations(_noop, number)
+
+    tracemalloc.start()
+    try:
+        func()
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ns_per_op": round(best / number * 1e9, 1),
+        "alloc_blocks": round(max(blocks, 0.0), 1),
+        "alloc_peak_bytes": max(peak - current, 0),
+    }
+
+
+def load_baseline(path: str) -> dict:
+    """Return the stored baseline report, or {} if there is none."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def compare(
+    report: dict, baseline: dict, tolerance: float, alloc_tolerance: float
+) -> list[str]:
+    """Return a description of every benchmark that regressed against `baseline`.
+
+    Timings depend on the machine, so they are only compared with a baseline
+    recorded on the same host and Python; a run is slower when it exceeds
+    the baseline by more than `tolerance` (relative). Allocation counts only
+    depend on the Python version; they vary a little with hash seeds and
+    container growth, so they regress when they exceed the baseline by more
+    than `alloc_tolerance` (relative), and at least one block per call.
+    """
+    same_python = baseline.get("python") == report["python"]
+    same_host = same_python and baseline.get("host") == report["host"]
+    regressions = []
+    for name, result in report["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        limit = reference["ns_per_op"] * (1 + tolerance)
+        if same_host and result["ns_per_op"] > limit:
+            regressions.append(
+                f"{name}: {result['ns_per_op']} ns/op, "
+                f"baseline {reference['ns_per_op']} ns/op"
+            )
+        limit = reference["alloc_blocks"] + max(
+            reference["alloc_blocks"] * alloc_tolerance, 1.0
+        )
+        if same_python and result["alloc_blocks"] > limit:
+            regressions.append(
+                f"{name}: {result['alloc_blocks']} blocks/op, "
+                f"baseline {reference['alloc_blocks']} blocks/op"
+            )
+    return regressions
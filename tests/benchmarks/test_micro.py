@@ -0,0 +1,128 @@
+"""Micro-benchmarks for the per-poll entity update and serialization paths.
+
+Run with ``pytest tests/benchmarks --kumo-benchmark``. Each path is timed
+against a real pykumo device whose state was fetched once from a simulated
+adapter, so no I/O happens while measuring. Results (ns/op and allocations)
+are written to ``kumo-benchmark-micro.json`` in ``--kumo-benchmark-output``
+and compared against ``micro_baseline.json``; pass
+``--kumo-benchmark-update-baseline`` to record a new baseline.
+
+Allocation counts are compared whenever the baseline was recorded with the
+same Python version. Timings are only compared against a baseline recorded
+on the same host, so record one locally before comparing timings.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_system import METRIC_SYSTEM, US_CUSTOMARY_SYSTEM
+from pykumo import PyKumo
+
+from custom_components.kumo.climate import KumoThermostat
+from custom_components.kumo.coordinator import KumoDataUpdateCoordinator
+from custom_components.kumo.temperature import c_to_f, f_to_c
+
+from .microbench import compare, load_baseline, measure, run_coroutine
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "micro_baseline.json")
+
+
+@pytest.fixture
+async def thermostat(hass: HomeAssistant, kumo_simulator) -> KumoThermostat:
+    """Return a thermostat entity backed by a fully populated pykumo device."""
+    unit = kumo_simulator.add_unit(
+        "BENCH1",
+        "Bench",
+        sensor={"humidity": 41.0, "temperature": 20.5, "battery": 87, "rssi": -61},
+    )
+    cache = unit.cache_entry()
+    device = PyKumo(
+        unit.label,
+        unit.address,
+        {"password": cache["password"], "crypto_serial": cache["cryptoSerial"]},
+        (0.5, 1.0),
+        unit.serial,
+    )
+    assert await hass.async_add_executor_job(device.update_status)
+    coordinator = KumoDataUpdateCoordinator(hass, device)
+    coordinator._available = True
+    entity = KumoThermostat(coordinator)
+    entity.hass = hass
+    entity._legacy_attributes = True
+    return entity
+
+
+def _cases(entity: KumoThermostat) -> dict:
+    return {
+        "thermostat_update": lambda: run_coroutine(entity.update()),
+        "update_property_hvac_mode": lambda: entity._update_property("hvac_mode"),
+        "update_property_target_temperature": lambda: entity._update_property(
+            "target_temperature"
+        ),
+        "update_property_current_humidity": lambda: entity._update_property(
+            "current_humidity"
+        ),
+        "refresh_capabilities": entity._refresh_capabilities,
+        "extra_state_attributes": lambda: entity.extra_state_attributes,
+        "c_to_f_table": lambda: c_to_f(21.5),
+        "c_to_f_fallback": lambda: c_to_f(30.0),
+        "f_to_c_table": lambda: f_to_c(70.0),
+        "f_to_c_fallback": lambda: f_to_c(85.0),
+    }
+
+
+async def test_micro_harness_smoke(hass: HomeAssistant, thermostat: KumoThermostat):
+    """Every benchmarked path runs and the harness reports sane numbers."""
+    for name, case in _cases(thermostat).items():
+        result = measure(case, number=3, repeat=1)
+        assert result["ns_per_op"] > 0, name
+    assert thermostat.hvac_mode is not None
+    assert thermostat.extra_state_attributes["battery_level"] == 87
+
+
+@pytest.mark.kumo_benchmark
+async def test_micro_benchmarks(
+    hass: HomeAssistant, thermostat: KumoThermostat, request
+):
+    """Measure the update paths and compare them against the baseline."""
+    config = request.config
+    results = {name: measure(case) for name, case in _cases(thermostat).items()}
+    hass.config.units = US_CUSTOMARY_SYSTEM
+    results["thermostat_update_fahrenheit"] = measure(
+        lambda: run_coroutine(thermostat.update())
+    )
+    hass.config.units = METRIC_SYSTEM
+
+    report = {
+        "benchmark": "micro",
+        "created": dt_util.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "host": platform.node(),
+        "results": results,
+    }
+    output = os.path.join(
+        config.getoption("--kumo-benchmark-output"), "kumo-benchmark-micro.json"
+    )
+    baseline_path = config.getoption("--kumo-benchmark-baseline") or DEFAULT_BASELINE
+    paths = [output]
+    if config.getoption("--kumo-benchmark-update-baseline"):
+        paths.append(baseline_path)
+    for path in paths:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+
+    regressions = compare(
+        report,
+        load_baseline(baseline_path),
+        config.getoption("--kumo-benchmark-tolerance"),
+        config.getoption("--kumo-benchmark-alloc-tolerance"),
+    )
+    assert not regressions, "Worse than baseline:\n" + "\n".join(regressions)
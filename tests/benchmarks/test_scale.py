@@ -0,0 +1,177 @@
+"""Scale benchmark: set up the integration against a large simulated fleet.
+
+Run with ``pytest tests/benchmarks --kumo-benchmark``. For every fleet size
+in ``--kumo-benchmark-sizes`` the integration is set up against that many
+simulated adapters and polled for a few cycles. Results are written to
+``kumo-benchmark-scale.json`` in ``--kumo-benchmark-output`` so runs can be
+compared over time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import platform
+import statistics
+import threading
+import time
+
+import pytest
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.util import dt as dt_util
+
+from custom_components.kumo.const import DOMAIN, KUMO_DATA_COORDINATORS
+
+pytestmark = pytest.mark.kumo_benchmark
+
+POLL_CYCLES = 3
+PROBE_INTERVAL = 0.005
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize the scale benchmark by the requested fleet sizes."""
+    if "fleet_size" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("--kumo-benchmark-sizes")
+        metafunc.parametrize(
+            "fleet_size", [int(size) for size in sizes.split(",") if size.strip()]
+        )
+
+
+@pytest.fixture(scope="module")
+def benchmark_results(request):
+    """Collect results from every fleet size and write them out at the end."""
+    results: list[dict] = []
+    yield results
+    if not results:
+        return
+    path = os.path.join(
+        request.config.getoption("--kumo-benchmark-output"),
+        "kumo-benchmark-scale.json",
+    )
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "benchmark": "scale",
+                "created": dt_util.utcnow().isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+
+
+class LoopProbe:
+    """Measure event loop lag and peak thread count while running."""
+
+    def __init__(self) -> None:
+        self.lags: list[float] = []
+        self.peak_threads = threading.active_count()
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + PROBE_INTERVAL
+            await asyncio.sleep(PROBE_INTERVAL)
+            self.lags.append(max(0.0, loop.time() - expected))
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+
+    def start(self) -> None:
+        self.lags.clear()
+        self.peak_threads = threading.active_count()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> dict:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        lags = sorted(self.lags) or [0.0]
+        return {
+            "loop_lag_max_ms": round(lags[-1] * 1000, 3),
+            "loop_lag_p95_ms": round(lags[int(0.95 * (len(lags) - 1))] * 1000, 3),
+            "peak_threads": self.peak_threads,
+        }
+
+
+async def test_scale(
+    hass: HomeAssistant,
+    kumo_simulator,
+    setup_simulated_entry,
+    benchmark_results,
+    fleet_size: int,
+):
+    """Measure setup, poll cycles and loop health for one fleet size."""
+    kumo_simulator.add_fleet(fleet_size)
+    baseline_threads = threading.active_count()
+    probe = LoopProbe()
+
+    probe.start()
+    start = time.perf_counter()
+    entry = await setup_simulated_entry()
+    setup_seconds = time.perf_counter() - start
+    setup_loop = await probe.stop()
+
+    coordinators = list(
+        hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS].values()
+    )
+    assert len(coordinators) == fleet_size
+
+    state_changes = 0
+
+    @callback
+    def _count_state_change(_event: Event) -> None:
+        nonlocal state_changes
+        state_changes += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_change)
+    cycles = []
+    for _ in range(POLL_CYCLES):
+        for coordinator in coordinators:
+            # Defeat pykumo's status cache so every cycle goes to the wire.
+            coordinator.get_device()._last_status_update = 0
+        writes_before = sum(c.metrics.state_writes for c in coordinators)
+        state_changes = 0
+        probe.start()
+        start = time.perf_counter()
+        await asyncio.gather(*(c.async_refresh() for c in coordinators))
+        await hass.async_block_till_done()
+        cycle_seconds = time.perf_counter() - start
+        cycle_loop = await probe.stop()
+        cycles.append(
+            {
+                "wall_seconds": round(cycle_seconds, 4),
+                "state_writes": sum(c.metrics.state_writes for c in coordinators)
+                - writes_before,
+                "state_changed_events": state_changes,
+                "executor_threads": cycle_loop["peak_threads"] - baseline_threads,
+                **cycle_loop,
+            }
+        )
+    unsub()
+
+    assert all(c.last_update_success for c in coordinators)
+    benchmark_results.append(
+        {
+            "fleet_size": fleet_size,
+            "setup_seconds": round(setup_seconds, 4),
+            "setup_executor_threads": setup_loop["peak_threads"] - baseline_threads,
+            "setup_loop_lag_max_ms": setup_loop["loop_lag_max_ms"],
+            "setup_loop_lag_p95_ms": setup_loop["loop_lag_p95_ms"],
+            "poll_cycle_seconds_median": statistics.median(
+                cycle["wall_seconds"] for cycle in cycles
+            ),
+            "state_writes_per_cycle": statistics.median(
+                cycle["state_writes"] for cycle in cycles
+            ),
+            "cycles": cycles,
+        }
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
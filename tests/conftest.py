@@ -1,7 +1,127 @@
 import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import save_json
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kumo.const import (
+    CONF_CONNECT_TIMEOUT,
+    CONF_POST_COMMAND_REFRESH_DELAY,
+    CONF_RESPONSE_TIMEOUT,
+    DOMAIN,
+    KUMO_CONFIG_CACHE,
+)
+
+from .kumo_simulator import KumoSimulator
+
+
+def pytest_addoption(parser):
+    """Add options for the opt-in benchmark suites."""
+    group = parser.getgroup("kumo benchmarks")
+    group.addoption(
+        "--kumo-benchmark",
+        action="store_true",
+        default=False,
+        help="Run the Kumo benchmark suites under tests/benchmarks.",
+    )
+    group.addoption(
+        "--kumo-benchmark-sizes",
+        default="10,50,100,250,500",
+        help="Comma-separated simulated fleet sizes for the scale benchmark.",
+    )
+    group.addoption(
+        "--kumo-benchmark-output",
+        default=".",
+        help="Directory for the kumo-benchmark-<suite>.json result files.",
+    )
+    group.addoption(
+        "--kumo-benchmark-baseline",
+        default=None,
+        help="Baseline JSON for the micro-benchmarks "
+        "(default: tests/benchmarks/micro_baseline.json).",
+    )
+    group.addoption(
+        "--kumo-benchmark-tolerance",
+        type=float,
+        default=0.5,
+        help="Allowed relative ns/op slowdown against a baseline from the same host.",
+    )
+    group.addoption(
+        "--kumo-benchmark-alloc-tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative increase in allocated blocks per call.",
+    )
+    group.addoption(
+        "--kumo-benchmark-update-baseline",
+        action="store_true",
+        default=False,
+        help="Rewrite the micro-benchmark baseline with this run's results.",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmarks unless they were asked for."""
+    if config.getoption("--kumo-benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --kumo-benchmark")
+    for item in items:
+        if "kumo_benchmark" in item.keywords:
+            item.add_marker(skip)
 
 
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations):
     """Enable custom integrations for all tests."""
     yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_config_dir(request, tmp_path):
+    """Keep kumo_cache.json and other files written by a test out of the shared config dir."""
+    if "hass" in request.fixturenames:
+        request.getfixturevalue("hass").config.config_dir = str(tmp_path)
+
+
+@pytest.fixture
+def kumo_simulator(socket_enabled):
+    """Run simulated Kumo adapters on loopback for the duration of a test."""
+    simulator = KumoSimulator().start()
+    yield simulator
+    simulator.stop()
+
+
+@pytest.fixture
+def setup_simulated_entry(hass: HomeAssistant, kumo_simulator: KumoSimulator):
+    """Return a coroutine that sets up a config entry against the simulator.
+
+    The simulator's units are written to the entry's cache and the entry
+    prefers the cache, so setup runs pykumo's real I/O paths without the cloud.
+    """
+
+    async def _setup(
+        minor_version: int = 3, unique_id: str | None = None, **options
+    ) -> MockConfigEntry:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title="simulated",
+            unique_id=unique_id,
+            minor_version=minor_version,
+            data={"username": "u", "password": "p", "prefer_cache": True},
+            options={
+                CONF_CONNECT_TIMEOUT: 0.5,
+                CONF_RESPONSE_TIMEOUT: 1.0,
+                CONF_POST_COMMAND_REFRESH_DELAY: 0.0,
+                **options,
+            },
+        )
+        await hass.async_add_executor_job(
+            save_json,
+            hass.config.path(KUMO_CONFIG_CACHE.format(entry.entry_id)),
+            kumo_simulator.kumo_cache(),
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        return entry
+
+    return _setup
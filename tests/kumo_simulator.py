@@ -0,0 +1,338 @@
+"""Local stand-in for Kumo WiFi adapters.
+
+Each simulated unit listens on its own loopback address/port and speaks the
+same protocol as a real adapter: an HTTP ``PUT /api?m=<token>`` whose body is
+a JSON query (``{}`` leaves are reads, other leaves are writes) and whose
+token is derived from the unit's password and crypto serial exactly as
+pykumo computes it. Requests with a bad token get the adapter's
+authentication error.
+
+All listeners share one background thread running its own event loop, so a
+few hundred units cost a few hundred sockets rather than threads. Units can
+be given latency, packet loss, a new address (as after a DHCP renewal) or a
+reboot, and a simulator can produce the ``kumo_cache.json`` contents that
+point the integration at them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import copy
+import hashlib
+import json
+import os
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from pykumo.const import S_PARAM, W_PARAM
+
+DEFAULT_HOST = "127.0.0.1"
+POSSIBLE_SENSORS = 4
+AUTH_ERROR = {"_api_error": "device_authentication_error"}
+
+
+def compute_token(password: bytes, crypto_serial: bytes, post_data: bytes) -> str:
+    """Compute the request token the way the adapter firmware checks it."""
+    data_hash = hashlib.sha256(password + post_data).digest()
+    intermediate = bytearray(88)
+    intermediate[0:32] = W_PARAM[0:32]
+    intermediate[32:64] = data_hash[0:32]
+    intermediate[64:66] = bytearray.fromhex("0840")
+    intermediate[66] = S_PARAM
+    intermediate[79] = crypto_serial[8]
+    intermediate[80:84] = crypto_serial[4:8]
+    intermediate[84:88] = crypto_serial[0:4]
+    return hashlib.sha256(intermediate).hexdigest()
+
+
+def _default_profile() -> dict[str, Any]:
+    return {
+        "numberOfFanSpeeds": 5,
+        "hasFanSpeedAuto": True,
+        "hasVaneSwing": True,
+        "hasModeDry": True,
+        "hasModeHeat": True,
+        "hasModeVent": True,
+        "hasModeAuto": True,
+        "hasVaneDir": True,
+        "maximumSetPoints": {"cool": 31, "heat": 31, "auto": 31},
+        "minimumSetPoints": {"cool": 16, "heat": 10, "auto": 16},
+    }
+
+
+def _default_status() -> dict[str, Any]:
+    return {
+        "mode": "heat",
+        "standby": False,
+        "spHeat": 21.0,
+        "spCool": 24.0,
+        "roomTemp": 20.5,
+        "fanSpeed": "auto",
+        "vaneDir": "auto",
+        "filterDirty": False,
+        "defrost": False,
+        "tempSource": "unset",
+        "activeThermistor": "unset",
+    }
+
+
+def _empty_sensor() -> dict[str, Any]:
+    return {
+        "uuid": None,
+        "humidity": None,
+        "temperature": None,
+        "battery": None,
+        "rssi": None,
+        "txPower": None,
+    }
+
+
+def _query(tree: Any, query: dict[str, Any]) -> dict[str, Any]:
+    """Apply a Kumo query to `tree`, performing writes and returning reads."""
+    result: dict[str, Any] = {}
+    for key, sub in query.items():
+        node = tree.get(key) if isinstance(tree, dict) else None
+        if isinstance(sub, dict) and sub:
+            result[key] = _query(node, sub) if isinstance(node, dict) else node
+        elif isinstance(sub, dict):
+            if isinstance(tree, dict) and key in tree:
+                result[key] = copy.deepcopy(node)
+        elif isinstance(tree, dict):
+            tree[key] = sub
+            result[key] = sub
+    return result
+
+
+@dataclass
+class SimulatedUnit:
+    """One simulated adapter and the indoor unit (or Kumo Station) behind it."""
+
+    serial: str
+    label: str
+    unit_type: str = "ductless"
+    latency: float = 0.0
+    jitter: float = 0.0
+    packet_loss: float = 0.0
+    loss_stall: float = 0.0
+    reboot_seconds: float = 1.0
+    rssi: int | None = -55
+    outdoor_temperature: float | None = 4.5
+    profile: dict[str, Any] = field(default_factory=_default_profile)
+    status: dict[str, Any] = field(default_factory=_default_status)
+    sensor: dict[str, Any] | None = None
+    mhk2_humidity: float | None = None
+    mac: str = ""
+    password: bytes = field(default_factory=lambda: os.urandom(32))
+    crypto_serial: bytes = field(default_factory=lambda: os.urandom(16))
+    host: str = DEFAULT_HOST
+    port: int = 0
+    requests: int = 0
+    writes: list[dict[str, Any]] = field(default_factory=list)
+    _server: asyncio.AbstractServer | None = field(default=None, repr=False)
+    _connections: set = field(default_factory=set, repr=False)
+    _rebooting_until: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Fill in derived fields."""
+        if not self.mac:
+            self.mac = "".join(f"{b:02x}" for b in os.urandom(6))
+
+    @property
+    def address(self) -> str:
+        """Return the address pykumo should use to reach this unit."""
+        if self.port == 80:
+            return self.host
+        return f"{self.host}:{self.port}"
+
+    def cache_entry(self) -> dict[str, Any]:
+        """Return this unit's entry for the kumo_cache.json zone table."""
+        return {
+            "serial": self.serial,
+            "label": self.label,
+            "address": self.address,
+            "password": base64.b64encode(self.password).decode(),
+            "cryptoSerial": self.crypto_serial.hex(),
+            "mac": self.mac,
+            "unitType": self.unit_type,
+        }
+
+    def _tree(self) -> dict[str, Any]:
+        sensors = {str(i): _empty_sensor() for i in range(POSSIBLE_SENSORS)}
+        if self.sensor is not None:
+            sensors["0"] = {**_empty_sensor(), "uuid": "sensor-0", **self.sensor}
+        adapter_status = {
+            "autoModePrevention": False,
+            "userHasModeDry": True,
+            "userHasModeHeat": True,
+            "localNetwork": {"stationMode": {"RSSI": self.rssi}},
+            "runState": "normal",
+        }
+        tree = {
+            "indoorUnit": {"status": self.status, "profile": self.profile},
+            "sensors": sensors,
+            "adapter": {
+                "status": adapter_status,
+                "info": {"macAddress": self.mac, "serialNumber": self.serial},
+            },
+            "mhk2": None,
+        }
+        if self.mhk2_humidity is not None:
+            tree["mhk2"] = {"status": {"indoorHumid": self.mhk2_humidity}}
+        if self.unit_type == "headless":
+            tree["eqc"] = {"oat": self.outdoor_temperature}
+        return tree
+
+    def handle(self, token: str, body: bytes) -> dict[str, Any]:
+        """Answer one request body."""
+        self.requests += 1
+        if token != compute_token(self.password, self.crypto_serial, body):
+            return AUTH_ERROR
+        query = json.loads(body.decode("utf-8"))["c"]
+        tree = self._tree()
+        response = _query(tree, query)
+        if tree["adapter"]["status"]["runState"] == "reboot":
+            loop = asyncio.get_running_loop()
+            self._rebooting_until = loop.time() + self.reboot_seconds
+        if _has_write(query):
+            self.writes.append(query)
+        return {"r": response}
+
+
+def _has_write(query: Any) -> bool:
+    if not isinstance(query, dict):
+        return True
+    return any(_has_write(sub) for sub in query.values() if sub != {})
+
+
+class KumoSimulator:
+    """A set of simulated adapters served from one background thread."""
+
+    def __init__(self, host: str = DEFAULT_HOST) -> None:
+        """Initialize the simulator; call start() before adding units."""
+        self.host = host
+        self.units: dict[str, SimulatedUnit] = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="kumo-simulator", daemon=True
+        )
+
+    def start(self) -> KumoSimulator:
+        """Start the background event loop."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Close every listener and stop the background thread."""
+        self._call(self._async_shutdown())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def add_unit(
+        self, serial: str, label: str | None = None, **kwargs
+    ) -> SimulatedUnit:
+        """Create a unit and start listening for it."""
+        kwargs.setdefault("host", self.host)
+        unit = SimulatedUnit(serial=serial, label=label or f"Unit {serial}", **kwargs)
+        self._call(self._async_listen(unit))
+        self.units[serial] = unit
+        return unit
+
+    def add_fleet(
+        self, count: int, prefix: str = "SIM", **kwargs
+    ) -> list[SimulatedUnit]:
+        """Create `count` indoor units with sequential serials."""
+        return [
+            self.add_unit(f"{prefix}{i:04d}", f"Room {i}", **kwargs)
+            for i in range(count)
+        ]
+
+    def change_address(self, unit: SimulatedUnit, host: str | None = None) -> str:
+        """Move `unit` to a new port (and optionally host), like a DHCP renewal."""
+        self._call(self._async_close(unit))
+        unit.port = 0
+        if host is not None:
+            unit.host = host
+        self._call(self._async_listen(unit))
+        return unit.address
+
+    def reboot(self, unit: SimulatedUnit, seconds: float | None = None) -> None:
+        """Make `unit` drop every request for `seconds`."""
+        duration = unit.reboot_seconds if seconds is None else seconds
+        unit._rebooting_until = self._loop.time() + duration
+
+    def kumo_cache(self) -> list[Any]:
+        """Return kumo_cache.json contents pointing at every simulated unit."""
+        zone_table = {serial: unit.cache_entry() for serial, unit in self.units.items()}
+        return [{}, {}, {"children": [{"zoneTable": zone_table}]}]
+
+    def dhcp_candidates(self) -> dict[str, str]:
+        """Return the MAC -> address map DHCP discovery would have produced."""
+        return {unit.mac: unit.address for unit in self.units.values()}
+
+    async def _async_listen(self, unit: SimulatedUnit) -> None:
+        async def _handle(reader, writer):
+            await self._async_serve(unit, reader, writer)
+
+        unit._server = await asyncio.start_server(_handle, unit.host, unit.port)
+        unit.port = unit._server.sockets[0].getsockname()[1]
+
+    async def _async_close(self, unit: SimulatedUnit) -> None:
+        if unit._server is not None:
+            unit._server.close()
+            unit._server = None
+        for writer in list(unit._connections):
+            writer.close()
+
+    async def _async_shutdown(self) -> None:
+        for unit in self.units.values():
+            await self._async_close(unit)
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _async_serve(self, unit, reader, writer) -> None:
+        loop = asyncio.get_running_loop()
+        unit._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                if loop.time() < unit._rebooting_until or (
+                    unit.packet_loss and random.random() < unit.packet_loss
+                ):
+                    if unit.loss_stall:
+                        await asyncio.sleep(unit.loss_stall)
+                    break
+                delay = unit.latency + unit.jitter * random.random()
+                if delay:
+                    await asyncio.sleep(delay)
+                target = request_line.decode("latin-1").split(" ")[1]
+                token = parse_qs(urlsplit(target).query).get("m", [""])[0]
+                payload = json.dumps(unit.handle(token, body)).encode("utf-8")
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            unit._connections.discard(writer)
+            writer.close()
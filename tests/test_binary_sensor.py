@@ -0,0 +1,45 @@
+"""Tests for the Kumo binary sensor platform and climate attributes."""
+
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+
+from custom_components.kumo.const import (
+    CONF_CLIMATE_ATTRIBUTES,
+    DOMAIN,
+    KUMO_DATA_COORDINATORS,
+)
+
+
+async def test_filter_and_defrost_binary_sensors(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """Filter and defrost have their own entities instead of climate attributes."""
+    unit = kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+
+    assert hass.states.get("binary_sensor.living_room_filter").state == STATE_OFF
+    assert hass.states.get("binary_sensor.living_room_defrost").state == STATE_OFF
+    attributes = hass.states.get("climate.living_room").attributes
+    assert "filter_dirty" not in attributes
+    assert "rssi" not in attributes
+
+    unit.status["filterDirty"] = True
+    coordinator = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]["SIM1"]
+    coordinator.get_device()._last_status_update = 0
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.living_room_filter").state == STATE_ON
+
+
+async def test_migration_keeps_climate_attributes(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """Entries created before 1.2 keep the diagnostic climate attributes."""
+    kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry(minor_version=1, unique_id=DOMAIN)
+
+    assert entry.minor_version == 3
+    assert entry.unique_id == "u"
+    assert entry.options[CONF_CLIMATE_ATTRIBUTES] is True
+    assert "filter_dirty" in hass.states.get("climate.living_room").attributes
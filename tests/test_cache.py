@@ -0,0 +1,190 @@
+"""Tests for the integrity-checked unit cache."""
+
+import os
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kumo.cache import (
+    CACHE_SOURCE_BACKUP,
+    CACHE_SOURCE_UNVERIFIED,
+    CACHE_SOURCE_VERIFIED,
+    apply_dhcp_addresses,
+    async_load_cache,
+    load_cache,
+    migrate_legacy_cache,
+    save_cache,
+    unaddressed_units,
+    validate_cache,
+)
+from custom_components.kumo.const import (
+    CONF_KUMO_CACHE,
+    DOMAIN,
+    KUMO_CONFIG_CACHE,
+    KUMO_CONFIG_CACHE_META,
+    KUMO_LEGACY_CACHE,
+    SERVICE_REFRESH_CLOUD,
+)
+
+
+def _unit(serial: str, address: str = "192.168.1.10") -> dict:
+    return {
+        "serial": serial,
+        "label": "Den",
+        "address": address,
+        "password": "cGFzc3dvcmQ=",
+        "cryptoSerial": "0a0b0c",
+        "mac": "aa:bb:cc:dd:ee:ff",
+        "unitType": "ductless",
+    }
+
+
+def _kumo_dict(address: str = "192.168.1.10", serials=("S1",)) -> list:
+    zone_table = {serial: _unit(serial, address) for serial in serials}
+    return [{}, {}, {"children": [{"zoneTable": zone_table}]}]
+
+
+def test_cache_checksum_and_backup(tmp_path):
+    """A damaged cache is replaced by its last known good copy."""
+    config_dir = str(tmp_path)
+    assert load_cache(config_dir, "entry") is None
+
+    save_cache(config_dir, "entry", _kumo_dict())
+    assert load_cache(config_dir, "entry").source == CACHE_SOURCE_VERIFIED
+    assert load_cache(config_dir, "other") is None
+
+    # A bit flip that still parses fails the checksum.
+    path = os.path.join(config_dir, KUMO_CONFIG_CACHE.format("entry"))
+    with open(path, encoding="utf-8") as file:
+        text = file.read()
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text.replace("192.168.1.10", "192.168.1.11"))
+    cache = load_cache(config_dir, "entry")
+    assert cache.source == CACHE_SOURCE_BACKUP
+    assert cache.kumo_dict == _kumo_dict()
+
+    # A truncated cache is no better.
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text[:40])
+    assert load_cache(config_dir, "entry").source == CACHE_SOURCE_BACKUP
+
+
+def test_cache_without_metadata(tmp_path):
+    """A cache from an older version is used only if it is well formed."""
+    config_dir = str(tmp_path)
+    save_cache(config_dir, "entry", _kumo_dict())
+    os.remove(os.path.join(config_dir, KUMO_CONFIG_CACHE_META.format("entry")))
+    assert load_cache(config_dir, "entry").source == CACHE_SOURCE_UNVERIFIED
+
+    broken = _kumo_dict()
+    broken[2]["children"][0]["zoneTable"]["S1"]["password"] = "not base64!"
+    save_cache(config_dir, "entry", broken)
+    os.remove(os.path.join(config_dir, KUMO_CONFIG_CACHE_META.format("entry")))
+    assert load_cache(config_dir, "entry") is None
+
+
+def test_nested_zone_tables(tmp_path):
+    """Units in every child and grandchild zone table are found, as pykumo does."""
+    kumo_dict = [
+        {},
+        {},
+        {
+            "children": [
+                {"zoneTable": {"S1": _unit("S1", "")}},
+                {
+                    "zoneTable": {},
+                    "children": [{"zoneTable": {"S2": _unit("S2", "192.168.1.10")}}],
+                },
+            ]
+        },
+    ]
+    assert validate_cache(kumo_dict) == 2
+    assert unaddressed_units(kumo_dict) == ["S1"]
+    kumo_dict[2]["children"][0]["zoneTable"]["S1"]["mac"] = "00:11:22:33:44:55"
+    assert apply_dhcp_addresses(
+        kumo_dict, {"001122334455": "192.168.1.20", "aabbccddeeff": "192.168.1.21"}
+    ) == ["S1", "S2"]
+    grandchild = kumo_dict[2]["children"][1]["children"][0]
+    assert grandchild["zoneTable"]["S2"]["address"] == "192.168.1.21"
+
+    config_dir = str(tmp_path)
+    save_cache(config_dir, None, kumo_dict)
+    split = migrate_legacy_cache(config_dir, "entry", {"S2"}, ["entry"]).kumo_dict
+    assert split[2]["children"][0]["zoneTable"] == {}
+    assert list(split[2]["children"][1]["children"][0]["zoneTable"]) == ["S2"]
+
+
+async def test_legacy_cache_split_between_entries(hass: HomeAssistant):
+    """Each entry takes only its own units from the legacy shared cache."""
+    config_dir = hass.config.config_dir
+    await hass.async_add_executor_job(
+        save_cache, config_dir, None, _kumo_dict(serials=("S1", "S2", "S3"))
+    )
+    first = MockConfigEntry(domain=DOMAIN, data={})
+    second = MockConfigEntry(domain=DOMAIN, data={})
+    device_registry = dr.async_get(hass)
+    for entry, serial in ((first, "S1"), (second, "S2")):
+        entry.add_to_hass(hass)
+        device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id, identifiers={(DOMAIN, serial)}
+        )
+
+    cache = await async_load_cache(hass, first.entry_id)
+    assert list(cache.kumo_dict[2]["children"][0]["zoneTable"]) == ["S1"]
+    assert os.path.exists(os.path.join(config_dir, KUMO_LEGACY_CACHE))
+
+    cache = await async_load_cache(hass, second.entry_id)
+    assert list(cache.kumo_dict[2]["children"][0]["zoneTable"]) == ["S2"]
+    # Every entry has its own cache now.
+    assert not os.path.exists(os.path.join(config_dir, KUMO_LEGACY_CACHE))
+    cache = await async_load_cache(hass, first.entry_id)
+    assert cache.source == CACHE_SOURCE_VERIFIED
+    assert list(cache.kumo_dict[2]["children"][0]["zoneTable"]) == ["S1"]
+
+
+async def test_entry_cache_from_flow_and_removal(hass: HomeAssistant, kumo_simulator):
+    """The flow's units become the entry's cache, deleted with the entry."""
+    kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "username": "u",
+            "password": "p",
+            "prefer_cache": True,
+            CONF_KUMO_CACHE: kumo_simulator.kumo_cache(),
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert CONF_KUMO_CACHE not in entry.data
+    path = hass.config.path(KUMO_CONFIG_CACHE.format(entry.entry_id))
+    assert os.path.exists(path)
+    assert hass.states.get("climate.living_room").state == "heat"
+
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert not os.path.exists(path)
+
+
+async def test_fast_start_skips_cloud(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """With a verified cache, setup neither contacts KumoCloud nor probes units."""
+    kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+
+    with patch("pykumo.KumoCloudAccount.try_setup") as try_setup:
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        try_setup.assert_not_called()
+    assert hass.states.get("climate.living_room").state == "heat"
+
+    with patch("pykumo.KumoCloudAccount.try_setup", return_value=False) as try_setup:
+        await hass.services.async_call(DOMAIN, SERVICE_REFRESH_CLOUD, {}, blocking=True)
+        await hass.async_block_till_done()
+        try_setup.assert_called_once()
+        assert try_setup.call_args.args[1] is False
@@ -2,9 +2,14 @@
 
 from unittest.mock import patch
 
+import requests
 from homeassistant import config_entries, data_entry_flow
+import voluptuous as vol
 from homeassistant.core import HomeAssistant
-from custom_components.kumo.const import DOMAIN
+from custom_components.kumo.cache import async_save_cache, load_cache, save_cache
+from custom_components.kumo.const import CONF_KUMO_CACHE, DHCP_DISCOVERED_KEY, DOMAIN
+
+from .kumo_simulator import SimulatedUnit
 
 
 async def test_user_form(hass: HomeAssistant):
@@ -22,9 +27,15 @@ async def test_user_form_invalid_auth(hass: HomeAssistant):
         DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
 
-    with patch(
-        "custom_components.kumo.config_flow.KumoCloudAccount.try_setup",
-        return_value=False,
+    with (
+        patch(
+            "custom_components.kumo.config_flow.KumoCloudV3.login",
+            return_value=False,
+        ),
+        patch(
+            "custom_components.kumo.config_flow._cloud_reachable",
+            return_value=True,
+        ),
     ):
         result2 = await hass.config_entries.flow.async_configure(
             result["flow_id"],
@@ -39,20 +50,52 @@ async def test_user_form_invalid_auth(hass: HomeAssistant):
     assert result2["errors"] == {"base": "invalid_auth"}
 
 
-async def test_user_form_success(hass: HomeAssistant):
-    """Test we create an entry on success."""
+async def test_user_form_cannot_connect(hass: HomeAssistant):
+    """A failed login while KumoCloud is unreachable is not blamed on the password."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    with (
+        patch(
+            "custom_components.kumo.config_flow.KumoCloudV3.login",
+            return_value=False,
+        ),
+        patch(
+            "custom_components.kumo.config_flow.requests.head",
+            side_effect=requests.ConnectionError,
+        ),
+    ):
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                "username": "test-username",
+                "password": "test-password",
+                "prefer_cache": False,
+            },
+        )
+
+    assert result2["type"] == data_entry_flow.FlowResultType.FORM
+    assert result2["errors"] == {"base": "cannot_connect"}
+
+
+async def test_user_form_success(hass: HomeAssistant, kumo_simulator):
+    """Credentials are checked first, then the units are probed in a progress step."""
+    unit = kumo_simulator.add_unit("SIM1", "Living Room")
+    credentials = {**unit.cache_entry(), "address": ""}
+    hass.data[DHCP_DISCOVERED_KEY] = kumo_simulator.dhcp_candidates()
     result = await hass.config_entries.flow.async_init(
         DOMAIN, context={"source": config_entries.SOURCE_USER}
     )
 
     with (
         patch(
-            "custom_components.kumo.config_flow.KumoCloudAccount.try_setup",
+            "custom_components.kumo.config_flow.KumoCloudV3.login",
             return_value=True,
         ),
         patch(
-            "custom_components.kumo.config_flow.KumoCloudAccount.get_raw_json",
-            return_value=[{}, {}, {"children": []}],
+            "custom_components.kumo.config_flow.KumoCloudV3.get_all_device_credentials",
+            return_value={"SIM1": credentials},
         ),
         patch(
             "custom_components.kumo.async_setup_entry",
@@ -67,16 +110,120 @@ async def test_user_form_success(hass: HomeAssistant):
                 "prefer_cache": False,
             },
         )
+        assert result2["type"] == data_entry_flow.FlowResultType.SHOW_PROGRESS
+        assert result2["step_id"] == "probe_units"
+        await hass.async_block_till_done()
+        result3 = await hass.config_entries.flow.async_configure(result["flow_id"])
         await hass.async_block_till_done()
 
-    assert result2["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
-    assert result2["title"] == "test-username"
-    assert result2["data"] == {
+    assert result3["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert result3["title"] == "test-username"
+    data = dict(result3["data"])
+    kumo_cache = data.pop(CONF_KUMO_CACHE)
+    assert data == {
         "username": "test-username",
         "password": "test-password",
         "prefer_cache": False,
     }
     assert len(mock_setup_entry.mock_calls) == 1
+    zone_table = kumo_cache[2]["children"][0]["zoneTable"]
+    assert zone_table["SIM1"]["address"] == unit.address
+
+
+async def test_user_form_second_account(hass: HomeAssistant, kumo_simulator):
+    """Each account gets its own entry, with only the account's own units."""
+    first = kumo_simulator.add_unit("SIM1", "Living Room")
+    second = kumo_simulator.add_unit("SIM2", "Bedroom")
+    hass.data[DHCP_DISCOVERED_KEY] = kumo_simulator.dhcp_candidates()
+    # The cache of older versions lists the units of both accounts.
+    await hass.async_add_executor_job(
+        save_cache, hass.config.config_dir, None, kumo_simulator.kumo_cache()
+    )
+
+    async def add_account(username, units):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        with (
+            patch(
+                "custom_components.kumo.config_flow.KumoCloudV3.login",
+                return_value=True,
+            ),
+            patch(
+                "custom_components.kumo.config_flow.KumoCloudV3.get_all_device_credentials",
+                return_value={
+                    unit.serial: {**unit.cache_entry(), "address": ""} for unit in units
+                },
+            ),
+            patch(
+                "custom_components.kumo.async_setup_entry",
+                return_value=True,
+            ),
+        ):
+            result = await hass.config_entries.flow.async_configure(
+                result["flow_id"],
+                {"username": username, "password": "p", "prefer_cache": False},
+            )
+            if result["type"] != data_entry_flow.FlowResultType.SHOW_PROGRESS:
+                return result
+            await hass.async_block_till_done()
+            result = await hass.config_entries.flow.async_configure(result["flow_id"])
+            await hass.async_block_till_done()
+        return result
+
+    result = await add_account("First@example.com", [first])
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    result = await add_account("second@example.com", [second])
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    zone_table = result["data"][CONF_KUMO_CACHE][2]["children"][0]["zoneTable"]
+    assert list(zone_table) == ["SIM2"]
+
+    entries = hass.config_entries.async_entries(DOMAIN)
+    assert sorted(entry.unique_id for entry in entries) == [
+        "first@example.com",
+        "second@example.com",
+    ]
+
+    result = await add_account("FIRST@example.com", [first])
+    assert result["type"] == data_entry_flow.FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+
+async def test_user_form_prefills_addresses(hass: HomeAssistant, kumo_simulator):
+    """Units that did not answer are asked for, with found addresses filled in."""
+    unit = kumo_simulator.add_unit("SIM1", "Living Room")
+    # A unit of the account that is not on the network.
+    offline = {**SimulatedUnit("SIM2", "Bedroom").cache_entry(), "address": ""}
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    with (
+        patch(
+            "custom_components.kumo.config_flow.KumoCloudV3.login",
+            return_value=True,
+        ),
+        patch(
+            "custom_components.kumo.config_flow.KumoCloudV3.get_all_device_credentials",
+            return_value={"SIM1": unit.cache_entry(), "SIM2": offline},
+        ),
+    ):
+        await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {"username": "u", "password": "p", "prefer_cache": False},
+        )
+        await hass.async_block_till_done()
+        result2 = await hass.config_entries.flow.async_configure(result["flow_id"])
+
+    assert result2["type"] == data_entry_flow.FlowResultType.FORM
+    assert result2["step_id"] == "request_ips"
+    assert result2["description_placeholders"]["answered"] == "Living Room"
+    defaults = {
+        str(key): key.default()
+        for key in result2["data_schema"].schema
+        if key.default is not vol.UNDEFINED
+    }
+    assert defaults == {"Living Room": unit.address}
 
 
 async def test_dhcp_discovery(hass: HomeAssistant):
@@ -139,3 +286,183 @@ async def test_dhcp_discovery_already_configured(hass: HomeAssistant):
 
     # Verify reload was scheduled
     mock_reload.assert_called_once_with(entry.entry_id)
+
+
+async def test_dhcp_discovery_reloads_owner(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """A known adapter only reloads the entry that owns it, when it moved."""
+    from homeassistant.helpers.service_info.dhcp import DhcpServiceInfo
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    unit = kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+    other = MockConfigEntry(domain=DOMAIN, unique_id="other", data={})
+    other.add_to_hass(hass)
+
+    for ip, reloaded in ((unit.address, []), ("192.168.1.102", [entry.entry_id])):
+        with patch(
+            "homeassistant.config_entries.ConfigEntries.async_schedule_reload"
+        ) as mock_reload:
+            result = await hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": config_entries.SOURCE_DHCP},
+                data=DhcpServiceInfo(
+                    ip=ip, macaddress=unit.mac.replace(":", ""), hostname="kumo"
+                ),
+            )
+        assert result["reason"] == "already_configured"
+        assert [call.args[0] for call in mock_reload.call_args_list] == reloaded
+
+
+async def test_options_filter_settings_keep_other_options(hass: HomeAssistant):
+    """The reporting filter step updates its options and keeps the rest."""
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    entry = MockConfigEntry(domain=DOMAIN, data={}, options={"connect_timeout": 2.0})
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"edit_selection": "Reporting Filters"}
+    )
+    assert result["step_id"] == "filter_settings"
+
+    with patch("custom_components.kumo.async_setup_entry", return_value=True):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                "signal_deadband": 5.0,
+                "temperature_deadband": 0.5,
+                "humidity_deadband": 2.0,
+                "heartbeat_interval": 600,
+            },
+        )
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert entry.options["signal_deadband"] == 5.0
+    assert entry.options["connect_timeout"] == 2.0
+
+
+async def test_options_scan_network(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """A subnet scan matches adapters to units by their credentials."""
+    # The sandbox only allows loopback connections to 127.0.0.1, so the
+    # scanned "subnet" is that single host on the first unit's port.
+    first = kumo_simulator.add_unit("SIM1", "Living Room")
+    kumo_simulator.add_unit("SIM2", "Bedroom")
+    entry = await setup_simulated_entry()
+    cache = load_cache(hass.config.config_dir, entry.entry_id).kumo_dict
+    for unit in cache[2]["children"][0]["zoneTable"].values():
+        unit["address"] = ""
+    await hass.async_add_executor_job(
+        save_cache, hass.config.config_dir, entry.entry_id, cache
+    )
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"edit_selection": "Scan Network"}
+    )
+    assert result["step_id"] == "scan_network"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"subnet": "10.0.0.0/16"}
+    )
+    assert result["errors"] == {"subnet": "subnet_too_large"}
+
+    with patch("custom_components.kumo.config_flow.KUMO_PORT", first.port):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {"subnet": "127.0.0.1/32"}
+        )
+        assert result["type"] == data_entry_flow.FlowResultType.SHOW_PROGRESS
+        await hass.async_block_till_done()
+        result = await hass.config_entries.options.async_configure(result["flow_id"])
+    assert result["step_id"] == "scan_result"
+    assert "Living Room" in result["description_placeholders"]["found"]
+    assert "Bedroom" not in result["description_placeholders"]["found"]
+
+    with patch("homeassistant.config_entries.ConfigEntries.async_schedule_reload"):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {}
+        )
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    zone_table = load_cache(hass.config.config_dir, entry.entry_id).kumo_dict[2][
+        "children"
+    ][0]["zoneTable"]
+    assert zone_table["SIM1"]["address"] == first.address
+    assert zone_table["SIM2"]["address"] == ""
+
+
+def test_parse_address_lines():
+    """Pasted CSV maps labels or serials to addresses and reports bad lines."""
+    from custom_components.kumo.config_flow import _parse_address_lines
+
+    kumo_cache = [
+        {},
+        {},
+        {
+            "children": [
+                {
+                    "zoneTable": {
+                        "S1": {"label": "Living Room"},
+                        "S2": {"label": "Bedroom"},
+                        "S3": {"label": "Office"},
+                    }
+                }
+            ]
+        },
+    ]
+    text = (
+        "label,address\n"
+        '"living room","192.168.1.20"\n'
+        "S2;192.168.1.21:8080\n"
+        "Office,\n"
+        "Garage, 192.168.1.22\n"
+        "Bedroom, not-an-ip\n"
+    )
+    addresses, bad_lines = _parse_address_lines(text, kumo_cache)
+    assert addresses == {"S1": "192.168.1.20", "S2": "192.168.1.21:8080"}
+    assert bad_lines == [5, 6]
+
+
+async def test_options_bulk_addresses(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """New addresses are checked concurrently and written in one save."""
+    living_room = kumo_simulator.add_unit("SIM1", "Living Room")
+    bedroom = kumo_simulator.add_unit("SIM2", "Bedroom")
+    entry = await setup_simulated_entry()
+    new_address = kumo_simulator.change_address(living_room)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"edit_selection": "Bulk Addresses"}
+    )
+    assert result["step_id"] == "bulk_addresses"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {"addresses": f"Living Room, {new_address}\nSIM2, 127.0.0.1:1\n"},
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.SHOW_PROGRESS
+    await hass.async_block_till_done()
+    result = await hass.config_entries.options.async_configure(result["flow_id"])
+    assert result["step_id"] == "bulk_result"
+    assert result["description_placeholders"]["answered"] == "1"
+    assert "Bedroom" in result["description_placeholders"]["unanswered"]
+
+    with (
+        patch(
+            "custom_components.kumo.config_flow.async_save_cache",
+            wraps=async_save_cache,
+        ) as save,
+        patch("homeassistant.config_entries.ConfigEntries.async_schedule_reload"),
+    ):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], {"apply_unanswered": False}
+        )
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert save.call_count == 1
+    zone_table = load_cache(hass.config.config_dir, entry.entry_id).kumo_dict[2][
+        "children"
+    ][0]["zoneTable"]
+    assert zone_table["SIM1"]["address"] == new_address
+    assert zone_table["SIM2"]["address"] == bedroom.address
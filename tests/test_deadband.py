@@ -0,0 +1,47 @@
+"""Tests for deadband filtering of noisy sensor values."""
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.kumo.const import DOMAIN, KUMO_DATA_COORDINATORS
+from custom_components.kumo.deadband import KumoDeadbandFilter
+
+
+def test_filter_deadband_and_heartbeat():
+    """Small changes are suppressed until they add up or the heartbeat passes."""
+    deadband_filter = KumoDeadbandFilter(deadband=3.0, heartbeat=60.0)
+
+    assert deadband_filter.update(-60, 0.0)
+    assert not deadband_filter.update(-61, 10.0)
+    assert not deadband_filter.update(-62, 20.0)
+    assert deadband_filter.update(-63, 30.0)
+    assert deadband_filter.value == -63
+    assert not deadband_filter.update(-62, 40.0)
+    assert deadband_filter.update(-62, 95.0)
+    assert deadband_filter.update(None, 96.0)
+
+    data = deadband_filter.as_dict()
+    assert data["published"] == 4
+    assert data["suppressed"] == 3
+
+
+async def test_signal_sensor_suppresses_small_changes(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """The climate rssi attribute only follows significant changes."""
+    unit = kumo_simulator.add_unit("SIM1", "Living Room", rssi=-55)
+    entry = await setup_simulated_entry(climate_attributes=True)
+    coordinator = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]["SIM1"]
+
+    async def _poll(rssi):
+        unit.rssi = rssi
+        coordinator.get_device()._last_status_update = 0
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        return hass.states.get("climate.living_room").attributes["rssi"]
+
+    assert await _poll(-56) == -55
+    assert await _poll(-60) == -60
+
+    stats = coordinator.filters["climate_rssi"].as_dict()
+    assert stats["suppressed"] >= 1
+    assert stats["suppression_rate"] > 0
@@ -0,0 +1,87 @@
+"""Tests for the account-wide aggregate sensors."""
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.kumo.const import DOMAIN, KUMO_DATA_COORDINATORS
+from custom_components.kumo.fleet import (
+    FLEET_HEATING,
+    FLEET_UNAVAILABLE,
+    KumoFleet,
+    KumoUnitSnapshot,
+)
+from custom_components.kumo.runtime import RUNTIME_COOLING, RUNTIME_HEATING
+
+
+def test_fleet_applies_deltas():
+    """Counts and extremes follow each unit's change."""
+    fleet = KumoFleet()
+    changes = []
+    fleet.async_add_listener(lambda: changes.append(1))
+
+    fleet.async_update_unit("A", KumoUnitSnapshot(True, RUNTIME_HEATING, 20.0, False))
+    fleet.async_update_unit("B", KumoUnitSnapshot(True, RUNTIME_COOLING, 24.0, True))
+    fleet.async_update_unit("C", KumoUnitSnapshot(True, None, 22.0, False))
+    fleet.async_update_unit("C", KumoUnitSnapshot(True, None, 22.0, False))
+    assert len(changes) == 3
+    assert fleet.as_dict() == {
+        "units_heating": 1,
+        "units_cooling": 1,
+        "units_unavailable": 0,
+        "dirty_filters": 1,
+        "units": 3,
+        "mean_temperature": 22.0,
+        "min_temperature": 20.0,
+        "max_temperature": 24.0,
+        "outdoor_temperature": None,
+    }
+
+    # The unit holding the maximum goes offline.
+    fleet.async_update_unit("B", KumoUnitSnapshot(False, None, None, False))
+    assert fleet.value(FLEET_UNAVAILABLE) == 1
+    assert fleet.max_temperature == 22.0
+    assert fleet.mean_temperature == 21.0
+
+    fleet.async_remove_unit("A")
+    assert fleet.value(FLEET_HEATING) == 0
+    assert fleet.min_temperature == fleet.max_temperature == 22.0
+
+
+def test_fleet_shares_outdoor_temperature():
+    """Station readings are published once, averaged over stations."""
+    fleet = KumoFleet()
+    changes = []
+    fleet.async_add_listener(lambda: changes.append(1))
+
+    fleet.async_update_outdoor_temperature("S1", 4.0)
+    fleet.async_update_outdoor_temperature("S2", 6.0)
+    fleet.async_update_outdoor_temperature("S2", 6.0)
+    assert fleet.outdoor_temperature == 5.0
+    assert len(changes) == 2
+
+    fleet.async_update_outdoor_temperature("S1", None)
+    assert fleet.outdoor_temperature == 6.0
+
+
+async def test_fleet_sensors(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """Aggregate sensors hang off the account device and follow the units."""
+    kumo_simulator.add_unit("SIM1", "Living Room")
+    unit = kumo_simulator.add_unit("SIM2", "Bedroom")
+    unit.status["roomTemp"] = 18.5
+    unit.status["mode"] = "cool"
+    entry = await setup_simulated_entry()
+
+    assert hass.states.get("sensor.kumo_units_heating").state == "1"
+    assert hass.states.get("sensor.kumo_units_cooling").state == "1"
+    assert hass.states.get("sensor.kumo_mean_temperature").state == "19.5"
+    assert hass.states.get("sensor.kumo_min_temperature").state == "18.5"
+
+    unit.status["mode"] = "heat"
+    coordinator = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]["SIM2"]
+    coordinator.get_device()._last_status_update = 0
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.kumo_units_heating").state == "2"
+    assert hass.states.get("sensor.kumo_units_cooling").state == "0"
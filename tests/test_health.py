@@ -0,0 +1,96 @@
+"""Tests for load shedding."""
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.kumo.const import DOMAIN, KUMO_DATA_COORDINATORS
+from custom_components.kumo.health import (
+    HEALTH_NORMAL,
+    HEALTH_SHEDDING,
+    KumoHealthMonitor,
+)
+
+INTERVAL = timedelta(seconds=60)
+
+
+class _Coordinator:
+    """Just enough of a coordinator for the monitor."""
+
+    def __init__(self) -> None:
+        self.last_update_success = True
+        self.update_interval = INTERVAL
+        self.shed = False
+        self._listeners = []
+
+    def async_add_listener(self, update_callback):
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    def finish_update(self, success: bool) -> None:
+        self.last_update_success = success
+        for update_callback in self._listeners:
+            update_callback()
+
+
+def test_health_sheds_with_hysteresis():
+    """Shedding starts at half the units failing and ends at a fifth."""
+    coordinators = {f"S{n}": _Coordinator() for n in range(10)}
+    health = KumoHealthMonitor()
+    health.async_track(MockConfigEntry(domain=DOMAIN), coordinators)
+
+    for n in range(4):
+        coordinators[f"S{n}"].finish_update(False)
+    assert health.mode == HEALTH_NORMAL
+    assert coordinators["S0"].update_interval == INTERVAL
+
+    coordinators["S4"].finish_update(False)
+    assert health.mode == HEALTH_SHEDDING
+    assert coordinators["S0"].shed
+    assert coordinators["S0"].update_interval == INTERVAL * 5
+    assert not coordinators["S9"].shed
+    assert coordinators["S9"].update_interval == INTERVAL
+
+    # A unit that answers again polls normally at once.
+    coordinators["S0"].finish_update(True)
+    coordinators["S1"].finish_update(True)
+    assert health.mode == HEALTH_SHEDDING
+    assert not coordinators["S0"].shed
+    assert coordinators["S0"].update_interval == INTERVAL
+    assert coordinators["S2"].update_interval == INTERVAL * 5
+
+    coordinators["S2"].finish_update(True)
+    assert health.mode == HEALTH_NORMAL
+    assert not any(coordinator.shed for coordinator in coordinators.values())
+    assert coordinators["S3"].update_interval == INTERVAL
+
+
+async def test_polling_mode_sensor(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """The account's polling mode follows an outage of its units."""
+    units = kumo_simulator.add_fleet(3)
+    entry = await setup_simulated_entry()
+    coordinators = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]
+    assert hass.states.get("sensor.kumo_polling_mode").state == HEALTH_NORMAL
+
+    async def _refresh_all():
+        for coordinator in coordinators.values():
+            coordinator.get_device()._last_status_update = 0
+            await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    for unit in units:
+        kumo_simulator.reboot(unit, 60)
+    await _refresh_all()
+    state = hass.states.get("sensor.kumo_polling_mode")
+    assert state.state == HEALTH_SHEDDING
+    assert state.attributes["failing_units"] == 3
+    assert all(coordinator.shed for coordinator in coordinators.values())
+
+    for unit in units:
+        kumo_simulator.reboot(unit, 0)
+    await _refresh_all()
+    assert hass.states.get("sensor.kumo_polling_mode").state == HEALTH_NORMAL
+    assert not any(coordinator.shed for coordinator in coordinators.values())
@@ -0,0 +1,112 @@
+"""Tests for the short-term history and trend sensors."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.kumo.const import DOMAIN, KUMO_DATA_COORDINATORS
+from custom_components.kumo.history import (
+    CHANNEL_COOL_SETPOINT,
+    CHANNEL_HEAT_SETPOINT,
+    CHANNEL_HUMIDITY,
+    CHANNEL_TEMPERATURE,
+    READING_MODE,
+    READING_STANDBY,
+    KumoHistory,
+)
+
+
+def _readings(temperature, humidity=None, mode="heat", standby=False):
+    return {
+        READING_MODE: mode,
+        READING_STANDBY: standby,
+        CHANNEL_TEMPERATURE: temperature,
+        CHANNEL_HEAT_SETPOINT: 22.0,
+        CHANNEL_COOL_SETPOINT: 26.0,
+        CHANNEL_HUMIDITY: humidity,
+    }
+
+
+def test_history_trend_matches_window_after_wrapping():
+    """Incremental sums give the least-squares slope of the samples kept."""
+    history = KumoHistory(size=8)
+    # Falling for a while, then rising 1 degree per hour: once the falling
+    # samples have left the window, only the rise is left.
+    for step in range(10):
+        history.append(1000 + step * 60, _readings(25.0 - step))
+    for step in range(10, 30):
+        history.append(1000 + step * 60, _readings(15.0 + (step - 10) / 60))
+
+    assert history.count == 8
+    assert history.trend(CHANNEL_TEMPERATURE) == pytest.approx(1.0)
+    assert history.trend(CHANNEL_HUMIDITY) is None
+    # 22.0 - (15 + 19/60) degrees at 1 degree per hour.
+    assert history.time_to_setpoint() == pytest.approx((7 - 19 / 60) * 3600)
+
+
+def test_history_needs_enough_samples():
+    """No trend is reported from a handful of samples or a short span."""
+    history = KumoHistory()
+    for step in range(4):
+        history.append(step * 60, _readings(20.0 + step))
+    assert history.trend(CHANNEL_TEMPERATURE) is None
+    history.append(240, _readings(24.0))
+    assert history.trend(CHANNEL_TEMPERATURE) is None
+    history.append(300, _readings(25.0))
+    assert history.trend(CHANNEL_TEMPERATURE) == pytest.approx(60.0)
+    # Rising above the heat setpoint and below the cool setpoint.
+    assert history.time_to_setpoint() is None
+
+
+@pytest.mark.parametrize(
+    ("start", "step", "mode", "standby", "expected"),
+    [
+        # Heating: 3 degrees below the heat setpoint, rising 6 degrees per hour.
+        (19.0, 0.1, "heat", False, 30 * 60),
+        (19.0, 0.1, "autoHeat", False, 30 * 60),
+        (19.0, 0.1, "auto", False, 30 * 60),
+        # Cooling: 3 degrees above the cool setpoint, falling as fast.
+        (29.0, -0.1, "cool", False, 30 * 60),
+        (29.0, -0.1, "auto", False, 30 * 60),
+        # Drifting while the unit does not work towards that setpoint.
+        (19.0, 0.1, "cool", False, None),
+        (29.0, -0.1, "heat", False, None),
+        (19.0, 0.1, "off", False, None),
+        (19.0, 0.1, "vent", False, None),
+        (19.0, 0.1, "heat", True, None),
+        # Moving away from the active setpoint.
+        (19.0, -0.1, "heat", False, None),
+        (29.0, 0.1, "cool", False, None),
+    ],
+)
+def test_history_time_to_setpoint_follows_mode(start, step, mode, standby, expected):
+    """Only the setpoint of the active mode, approached by the trend, counts."""
+    history = KumoHistory()
+    for index in range(10):
+        temperature = start + step * (index - 9)
+        history.append(index * 60, _readings(temperature, mode=mode, standby=standby))
+
+    result = history.time_to_setpoint()
+    if expected is None:
+        assert result is None
+    else:
+        assert result == pytest.approx(expected)
+
+
+async def test_trend_sensors(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """The trend sensors show the coordinator's history."""
+    kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+    coordinator = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]["SIM1"]
+
+    assert hass.states.get("sensor.living_room_temperature_trend").state == "unknown"
+
+    coordinator.history = KumoHistory()
+    for step in range(10):
+        coordinator.history.append(step * 60, _readings(20.0 - step / 30))
+    coordinator.async_update_listeners()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.living_room_temperature_trend").state == "-2.0"
+    assert hass.states.get("sensor.living_room_time_to_setpoint").state == "unknown"
@@ -0,0 +1,65 @@
+"""Tests for the persistent last HVAC mode store."""
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    mock_restore_cache,
+)
+
+from custom_components.kumo.const import DOMAIN
+from custom_components.kumo.last_hvac_mode import KumoLastHvacModeStore
+
+
+async def test_store_migrates_restored_sensor_state(hass: HomeAssistant, hass_storage):
+    """The first load takes the modes the sensors used to restore."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    er.async_get(hass).async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "SIM1-last-hvac-mode",
+        config_entry=entry,
+        suggested_object_id="living_room_last_hvac_mode",
+    )
+    mock_restore_cache(hass, [State("sensor.living_room_last_hvac_mode", "cool")])
+
+    store = KumoLastHvacModeStore(hass, entry.entry_id)
+    await store.async_load()
+    assert store.get("SIM1") == "cool"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    key = f"{DOMAIN}.{entry.entry_id}.last_hvac_mode"
+    assert hass_storage[key]["data"] == {"modes": {"SIM1": "cool"}}
+
+
+async def test_turn_on_uses_stored_mode_after_reload(
+    hass: HomeAssistant, hass_storage, kumo_simulator, setup_simulated_entry
+):
+    """The last mode survives a reload and is used by climate.turn_on."""
+    unit = kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+
+    for hvac_mode in ("cool", "off"):
+        await hass.services.async_call(
+            "climate",
+            "set_hvac_mode",
+            {"entity_id": "climate.living_room", "hvac_mode": hvac_mode},
+            blocking=True,
+        )
+    assert hass.states.get("sensor.living_room_last_hvac_mode").state == "cool"
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    key = f"{DOMAIN}.{entry.entry_id}.last_hvac_mode"
+    assert hass_storage[key]["data"] == {"modes": {"SIM1": "cool"}}
+
+    await hass.services.async_call(
+        "climate", "turn_on", {"entity_id": "climate.living_room"}, blocking=True
+    )
+    assert unit.status["mode"] == "cool"
@@ -0,0 +1,99 @@
+"""Tests for Kumo I/O metrics."""
+
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.kumo.coordinator import KumoDataUpdateCoordinator
+from custom_components.kumo.metrics import (
+    KIND_COMMAND,
+    KIND_POLL,
+    OUTCOME_ERROR,
+    OUTCOME_OK,
+    OUTCOME_TIMEOUT,
+    KumoDeviceMetrics,
+    KumoLatencyHistogram,
+)
+
+
+def test_histogram_buckets():
+    """Observations land in the first bucket whose bound they do not exceed."""
+    histogram = KumoLatencyHistogram()
+    histogram.observe(0.01)
+    histogram.observe(0.3)
+    histogram.observe(60.0)
+
+    data = histogram.as_dict()
+    assert data["count"] == 3
+    assert data["buckets"]["le_0.05"] == 1
+    assert data["buckets"]["le_0.5"] == 1
+    assert data["buckets"]["le_inf"] == 1
+    assert data["last_seconds"] == 60.0
+
+
+def test_device_metrics_outcomes():
+    """Outcomes update the right counters."""
+    metrics = KumoDeviceMetrics()
+    metrics.record(KIND_POLL, 0.1, OUTCOME_OK)
+    metrics.record(KIND_POLL, 9.0, OUTCOME_TIMEOUT)
+    metrics.record(KIND_COMMAND, 0.2, OUTCOME_ERROR)
+
+    assert metrics.last_success is not None
+    assert metrics.timeout_count == 1
+    assert metrics.error_count == 1
+    assert metrics.as_dict()["latency"][KIND_POLL]["count"] == 2
+
+
+async def test_coordinator_records_calls(hass: HomeAssistant):
+    """The coordinator times executor calls and classifies empty responses."""
+    device = MagicMock()
+    device.get_serial.return_value = "S1"
+    coordinator = KumoDataUpdateCoordinator(hass, device)
+
+    assert await coordinator.async_device_call(KIND_COMMAND, lambda: {"r": {}})
+    assert await coordinator.async_device_call(KIND_COMMAND, lambda: {}) == {}
+
+    metrics = coordinator.metrics
+    assert metrics.latency[KIND_COMMAND].count == 2
+    assert metrics.last_success is not None
+    assert metrics.error_count == 1
+
+
+async def test_prometheus_render(hass: HomeAssistant):
+    """Coordinator metrics are rendered in the Prometheus text format."""
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.kumo.const import DOMAIN, KUMO_DATA_COORDINATORS
+    from custom_components.kumo.prometheus import render_metrics
+
+    entry = MockConfigEntry(domain=DOMAIN, title="acct", data={})
+    entry.add_to_hass(hass)
+    device = MagicMock()
+    device.get_serial.return_value = "S1"
+    device.get_name.return_value = 'Living "Room"'
+    coordinator = KumoDataUpdateCoordinator(hass, device)
+    coordinator.metrics.record(KIND_POLL, 0.3, OUTCOME_OK)
+    coordinator.metrics.noop_commands = 2
+    hass.data[DOMAIN] = {entry.entry_id: {KUMO_DATA_COORDINATORS: {"S1": coordinator}}}
+
+    text = render_metrics(hass)
+    labels = f'account="{entry.entry_id}",serial="S1",unit="Living \\"Room\\""'
+    assert f'kumo_poll_duration_seconds_bucket{{{labels},le="0.5"}} 1' in text
+    assert f"kumo_poll_duration_seconds_count{{{labels}}} 1" in text
+    assert f"kumo_noop_commands_total{{{labels}}} 2" in text
+    assert f"kumo_in_flight{{{labels}}} 0" in text
+    assert f'kumo_queue_depth{{account="{entry.entry_id}"}} 0' in text
+    assert "kumo_cache_writes_total 0" in text
+
+
+def test_trace_buffer_wraps():
+    """The trace buffer keeps only the newest events, oldest first."""
+    from custom_components.kumo.trace import KumoTraceBuffer
+
+    trace = KumoTraceBuffer(size=3)
+    for i in range(5):
+        trace.record("update_status", float(i), 0.1, OUTCOME_OK, i)
+
+    data = trace.as_dict()
+    assert data["recorded"] == 5
+    assert [event["payload_size"] for event in data["events"]] == [2, 3, 4]
@@ -0,0 +1,63 @@
+"""Tests for the Kumo profiling service."""
+
+import asyncio
+import os
+import pstats
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.kumo.const import DOMAIN, KUMO_DATA_COORDINATORS
+from custom_components.kumo.coordinator import KumoDataUpdateCoordinator
+from custom_components.kumo.profiler import KumoProfiler
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+async def test_profile_service_writes_stats(hass: HomeAssistant):
+    """Profiling a coordinator for one cycle writes a stats file."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    entry = MockConfigEntry(domain=DOMAIN, data={})
+    entry.add_to_hass(hass)
+    device = MagicMock()
+    device.get_serial.return_value = "S1"
+    device.update_status.return_value = True
+    coordinator = KumoDataUpdateCoordinator(hass, device, config_entry=entry)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+        KUMO_DATA_COORDINATORS: {"S1": coordinator}
+    }
+    entry.mock_state(hass, entry.state.LOADED)
+
+    await hass.services.async_call(DOMAIN, "profile", {"cycles": 1}, blocking=True)
+    assert coordinator.profiler is not None
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.profiler is None
+    written = [
+        name
+        for name in os.listdir(hass.config.config_dir)
+        if name.startswith("kumo_profile_")
+    ]
+    assert len(written) == 1
+
+
+async def test_profiler_skips_other_tasks(hass: HomeAssistant):
+    """Tasks that run while a profiled section waits are not profiled."""
+    profiler = KumoProfiler(hass, [], 1, timedelta(minutes=1))
+    other_ran = asyncio.Event()
+
+    def other_task_marker() -> None:
+        other_ran.set()
+
+    async def section() -> str:
+        hass.loop.call_soon(other_task_marker)
+        await other_ran.wait()
+        return "done"
+
+    assert await profiler.profiled(section()) == "done"
+    functions = {name for _, _, name in pstats.Stats(profiler._profile).stats}
+    assert "section" in functions
+    assert "other_task_marker" not in functions
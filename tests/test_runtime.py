@@ -0,0 +1,79 @@
+"""Tests for runtime and compressor cycle statistics."""
+
+from homeassistant.core import HomeAssistant, State
+from pytest_homeassistant_custom_component.common import (
+    mock_restore_cache_with_extra_data,
+)
+
+from custom_components.kumo.runtime import (
+    RUNTIME_COOLING,
+    RUNTIME_CYCLES,
+    RUNTIME_DEFROST,
+    RUNTIME_HEATING,
+    RUNTIME_IDLE,
+    KumoRuntimeAccumulator,
+)
+
+
+def test_accumulator_runtime_and_cycles():
+    """Time is credited to the state seen at the previous poll."""
+    runtime = KumoRuntimeAccumulator(max_gap=600)
+
+    runtime.sample(RUNTIME_IDLE, 0)
+    runtime.sample(RUNTIME_HEATING, 60)
+    runtime.sample(RUNTIME_DEFROST, 120)
+    runtime.sample(RUNTIME_HEATING, 180)
+    runtime.sample(None, 240)
+    runtime.sample(RUNTIME_COOLING, 2000)
+    runtime.sample(RUNTIME_COOLING, 2060)
+
+    assert runtime.totals[RUNTIME_IDLE] == 60
+    assert runtime.totals[RUNTIME_HEATING] == 120
+    assert runtime.totals[RUNTIME_DEFROST] == 60
+    assert runtime.totals[RUNTIME_COOLING] == 60
+    # Defrost is part of the heating cycle; the unit was off before cooling.
+    assert runtime.totals[RUNTIME_CYCLES] == 2
+    assert runtime.cycles_per_hour == 2
+
+    # Half an hour into the next window, half of the last one still counts.
+    runtime.sample(RUNTIME_COOLING, 3600 + 1800)
+    assert runtime.cycles_per_hour == 1
+    assert runtime.totals[RUNTIME_COOLING] == 660
+
+
+def test_accumulator_outdoor_temperature():
+    """Heating time is weighted by the shared outdoor temperature."""
+    runtime = KumoRuntimeAccumulator()
+
+    runtime.sample(RUNTIME_HEATING, 0, 2.0)
+    runtime.sample(RUNTIME_HEATING, 60, 2.0)
+    runtime.sample(RUNTIME_DEFROST, 180, -1.0)
+    runtime.sample(RUNTIME_HEATING, 240, -1.0)
+
+    assert runtime.heating_outdoor_temperature == 0.0
+    assert runtime.defrosts == 1
+    assert runtime.last_defrost_outdoor_temperature == -1.0
+
+
+async def test_runtime_sensors_restore(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """Runtime totals continue from the values saved before a restart."""
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State("sensor.living_room_heating_runtime", "12.5"),
+                {"native_value": 12.5, "native_unit_of_measurement": "h"},
+            ),
+            (
+                State("sensor.living_room_compressor_cycles", "40"),
+                {"native_value": 40, "native_unit_of_measurement": None},
+            ),
+        ],
+    )
+    kumo_simulator.add_unit("SIM1", "Living Room")
+    await setup_simulated_entry()
+
+    assert float(hass.states.get("sensor.living_room_heating_runtime").state) == 12.5
+    assert hass.states.get("sensor.living_room_compressor_cycles").state == "40"
@@ -60,3 +60,105 @@ async def test_scenario_6_new_installation_missing_discovery(hass: HomeAssistant
         entry = MockConfigEntry(domain=DOMAIN, data={"username": "u", "password": "p"})
         entry.add_to_hass(hass)
         assert await hass.config_entries.async_setup(entry.entry_id)
+
+
+async def test_simulated_units_end_to_end(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """Units behind simulated adapters are polled and controlled over the wire."""
+    unit = kumo_simulator.add_unit(
+        "SIM1", "Living Room", sensor={"humidity": 41, "battery": 90, "rssi": -61}
+    )
+    kumo_simulator.add_unit("SIM2", "Bedroom", latency=0.05)
+    await setup_simulated_entry()
+
+    state = hass.states.get("climate.living_room")
+    assert state.state == "heat"
+    assert state.attributes["current_temperature"] == 20.5
+    assert hass.states.get("climate.bedroom").state == "heat"
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {"entity_id": "climate.living_room", "hvac_mode": "cool"},
+        blocking=True,
+    )
+    assert unit.status["mode"] == "cool"
+
+
+async def test_simulated_unit_reboot_marks_unavailable(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """A unit that stops answering becomes unavailable after repeated failures."""
+    from custom_components.kumo.const import KUMO_DATA_COORDINATORS
+
+    unit = kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+    coordinator = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]["SIM1"]
+
+    kumo_simulator.reboot(unit, 60)
+    for _ in range(3):
+        # Defeat pykumo's 20 second status cache so every refresh hits the wire.
+        coordinator.get_device()._last_status_update = 0
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("climate.living_room").state == "unavailable"
+
+
+async def test_simulated_dhcp_address_change(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """A unit that moved is found again from DHCP discovery on reload."""
+    from custom_components.kumo.const import DHCP_DISCOVERED_KEY
+
+    unit = kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+
+    kumo_simulator.change_address(unit)
+    hass.data[DHCP_DISCOVERED_KEY] = kumo_simulator.dhcp_candidates()
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("climate.living_room").state == "heat"
+
+
+async def test_simulated_command_matching_stale_state_is_sent(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """A command is sent even if the last poll says the unit is already there."""
+    from custom_components.kumo.const import KUMO_DATA_COORDINATORS
+
+    unit = kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+    coordinator = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]["SIM1"]
+    assert hass.states.get("climate.living_room").state == "heat"
+
+    # Turned off with the remote since the last poll.
+    unit.status["mode"] = "off"
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {"entity_id": "climate.living_room", "hvac_mode": "heat"},
+        blocking=True,
+    )
+    assert unit.status["mode"] == "heat"
+    assert coordinator.metrics.noop_commands == 1
+
+
+async def test_simulated_thermostat_reads_each_poll_once(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """Adding a thermostat does not feed its filters a poll a second time."""
+    from custom_components.kumo.const import KUMO_DATA_COORDINATORS
+    from custom_components.kumo.metrics import KIND_POLL
+
+    kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+    coordinator = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]["SIM1"]
+
+    rssi_filter = coordinator.filters["climate_rssi"]
+    polls = coordinator.metrics.latency[KIND_POLL].count
+    assert polls
+    assert rssi_filter.published + rssi_filter.suppressed == polls
+    assert hass.states.get("climate.living_room").state == "heat"
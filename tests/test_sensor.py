@@ -0,0 +1,49 @@
+"""Tests for the Kumo sensor platform."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.kumo.const import DOMAIN, KUMO_DATA_COORDINATORS
+
+
+def _unique_ids(hass: HomeAssistant, entry) -> set[str]:
+    registry = er.async_get(hass)
+    return {
+        entity.unique_id
+        for entity in er.async_entries_for_config_entry(registry, entry.entry_id)
+    }
+
+
+async def test_capability_sensors_created_when_reported(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """Sensor entities only appear once the unit reports their data."""
+    unit = kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+
+    unique_ids = _unique_ids(hass, entry)
+    assert "SIM1-current-temperature" in unique_ids
+    assert "SIM1-signal-strength" in unique_ids
+    assert "SIM1-sensor-battery" not in unique_ids
+    assert "SIM1-current-humidity" not in unique_ids
+
+    # A wireless sensor is paired with the unit.
+    unit.sensor = {"humidity": 44.0, "battery": 80, "rssi": -70}
+    coordinator = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]["SIM1"]
+    coordinator.get_device()._last_status_update = 0
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    unique_ids = _unique_ids(hass, entry)
+    assert "SIM1-sensor-battery" in unique_ids
+    assert "SIM1-sensor-signal-strength" in unique_ids
+    assert "SIM1-current-humidity" in unique_ids
+
+    # Registered entities are still set up when the data is missing at startup.
+    registry = er.async_get(hass)
+    entity_id = registry.async_get_entity_id("sensor", DOMAIN, "SIM1-sensor-battery")
+    registry.async_update_entity(entity_id, disabled_by=None)
+    unit.sensor = None
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id) is not None
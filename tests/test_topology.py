@@ -0,0 +1,232 @@
+"""Tests for the background topology resync."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.kumo.const import (
+    DHCP_DISCOVERED_KEY,
+    DOMAIN,
+    KUMO_DATA,
+    KUMO_DATA_COORDINATORS,
+)
+from custom_components.kumo.topology import REMOVE_AFTER_MISSES, KumoTopologySync
+
+
+def _cloud_zones(units) -> dict:
+    return {
+        unit.serial: {"label": unit.label, "unitType": unit.unit_type, "mac": unit.mac}
+        for unit in units
+    }
+
+
+async def test_topology_resync(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """Only the added, removed and renamed units are touched."""
+    living_room = kumo_simulator.add_unit("SIM1", "Living Room")
+    bedroom = kumo_simulator.add_unit("SIM2", "Bedroom")
+    entry = await setup_simulated_entry()
+    coordinators = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]
+    healthy = coordinators["SIM1"]
+    assert hass.states.get("climate.bedroom") is not None
+
+    office = kumo_simulator.add_unit("SIM3", "Office")
+    hass.data[DHCP_DISCOVERED_KEY] = {office.mac: office.address}
+    living_room.label = "Lounge"
+    sync = KumoTopologySync(hass, entry, timedelta(hours=1))
+    with (
+        patch.object(
+            KumoTopologySync,
+            "_fetch_zones",
+            return_value=_cloud_zones([living_room, office]),
+        ),
+        patch.object(
+            KumoTopologySync,
+            "_fetch_credentials",
+            return_value={"SIM3": office.cache_entry()},
+        ),
+    ):
+        changes = await sync.async_sync()
+        await hass.async_block_till_done()
+        assert changes.added == ["SIM3"]
+        assert changes.removed == []
+        assert changes.renamed == ["SIM1"]
+        assert hass.states.get("climate.bedroom") is not None
+
+        # Only removed once missing from several resyncs in a row.
+        for _ in range(REMOVE_AFTER_MISSES - 1):
+            changes = await sync.async_sync()
+        await hass.async_block_till_done()
+
+    assert changes.removed == ["SIM2"]
+    assert set(coordinators) == {"SIM1", "SIM3"}
+    assert coordinators["SIM1"] is healthy
+
+    assert hass.states.get("climate.bedroom") is None
+    assert hass.states.get("climate.office").state == "heat"
+    assert hass.states.get("binary_sensor.office_filter") is not None
+    assert hass.states.get("sensor.office_current_temperature") is not None
+    assert hass.states.get("climate.living_room").name == "Lounge"
+    assert (
+        hass.states.get("sensor.living_room_current_temperature").name
+        == "Lounge Current Temperature"
+    )
+    device_registry = dr.async_get(hass)
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "SIM2")}) is None
+    assert (
+        device_registry.async_get_device(identifiers={(DOMAIN, "SIM1")}).name
+        == "Lounge"
+    )
+    settings = hass.data[DOMAIN][entry.entry_id][KUMO_DATA]
+    zone_table = settings.get_raw_json()[2]["children"][0]["zoneTable"]
+    assert bedroom.serial not in zone_table
+    assert zone_table["SIM3"]["address"] == office.address
+
+
+async def test_topology_resync_keeps_units_on_empty_answer(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """A failed or empty cloud answer never removes units."""
+    kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+    sync = KumoTopologySync(hass, entry, timedelta(hours=1))
+
+    with patch.object(KumoTopologySync, "_fetch_zones", return_value={}):
+        assert not await sync.async_sync()
+    with patch.object(KumoTopologySync, "_fetch_zones", side_effect=OSError):
+        assert not await sync.async_sync()
+    assert list(hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]) == ["SIM1"]
+
+
+async def test_topology_resync_miss_count_resets(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """A unit that shows up again starts its miss count over."""
+    living_room = kumo_simulator.add_unit("SIM1", "Living Room")
+    bedroom = kumo_simulator.add_unit("SIM2", "Bedroom")
+    entry = await setup_simulated_entry()
+    sync = KumoTopologySync(hass, entry, timedelta(hours=1))
+
+    answers = [[living_room]] * (REMOVE_AFTER_MISSES - 1)
+    answers += [[living_room, bedroom]]
+    answers += [[living_room]] * (REMOVE_AFTER_MISSES - 1)
+    for units in answers:
+        with patch.object(
+            KumoTopologySync, "_fetch_zones", return_value=_cloud_zones(units)
+        ):
+            assert not await sync.async_sync()
+    coordinators = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]
+    assert set(coordinators) == {"SIM1", "SIM2"}
+
+
+class _FakeCloud:
+    """KumoCloudV3 stand-in whose second site fails to list its zones."""
+
+    def __init__(self, username, password) -> None:
+        pass
+
+    def login(self) -> bool:
+        return True
+
+    def get_sites(self) -> list:
+        return [{"id": "site1"}, {"id": "site2"}]
+
+    def get_zones(self, site_id: str) -> list:
+        if site_id == "site2":
+            return []
+        return [
+            {
+                "name": "Living Room",
+                "adapter": {"deviceSerial": "SIM1", "macAddress": "00:00"},
+            }
+        ]
+
+
+async def test_topology_resync_fails_on_failed_site(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """A site whose zones cannot be listed fails the resync."""
+    kumo_simulator.add_unit("SIM1", "Living Room")
+    kumo_simulator.add_unit("SIM2", "Bedroom")
+    entry = await setup_simulated_entry()
+    sync = KumoTopologySync(hass, entry, timedelta(hours=1))
+
+    with patch("custom_components.kumo.topology.pykumo.KumoCloudV3", _FakeCloud):
+        assert await hass.async_add_executor_job(sync._fetch_zones) is None
+        for _ in range(REMOVE_AFTER_MISSES):
+            assert not await sync.async_sync()
+    coordinators = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]
+    assert set(coordinators) == {"SIM1", "SIM2"}
+
+
+async def test_topology_rename_keeps_entity_suffix(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """Renames replace exactly the unit name, even when one extends the other."""
+    unit = kumo_simulator.add_unit("SIM1", "Den")
+    entry = await setup_simulated_entry()
+    coordinator = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]["SIM1"]
+    sync = KumoTopologySync(hass, entry, timedelta(hours=1))
+
+    for label in ("Den 2", "Den", "D"):
+        unit.label = label
+        with patch.object(
+            KumoTopologySync, "_fetch_zones", return_value=_cloud_zones([unit])
+        ):
+            assert (await sync.async_sync()).renamed == ["SIM1"]
+        await hass.async_block_till_done()
+        assert hass.states.get("climate.den").name == label
+        assert (
+            hass.states.get("sensor.den_current_temperature").name
+            == f"{label} Current Temperature"
+        )
+        assert coordinator.label == label
+        assert coordinator.snapshot()["name"] == label
+    # The pykumo device itself is left alone.
+    assert coordinator.get_device().get_name() == "Den"
+
+
+async def test_topology_duplicate_names_are_not_renames(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """Units sharing a name in the cloud are not renamed on every resync."""
+    units = [kumo_simulator.add_unit(serial, "Den") for serial in ("SIM1", "SIM2")]
+    entry = await setup_simulated_entry()
+    sync = KumoTopologySync(hass, entry, timedelta(hours=1))
+
+    with patch.object(
+        KumoTopologySync, "_fetch_zones", return_value=_cloud_zones(units)
+    ):
+        assert not await sync.async_sync()
+
+
+async def test_topology_resyncs_run_one_at_a_time(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """A resync started while another runs does not add the same unit twice."""
+    living_room = kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+    office = kumo_simulator.add_unit("SIM2", "Office")
+    hass.data[DHCP_DISCOVERED_KEY] = {office.mac: office.address}
+    sync = KumoTopologySync(hass, entry, timedelta(hours=1))
+
+    with (
+        patch.object(
+            KumoTopologySync,
+            "_fetch_zones",
+            return_value=_cloud_zones([living_room, office]),
+        ),
+        patch.object(
+            KumoTopologySync,
+            "_fetch_credentials",
+            return_value={"SIM2": office.cache_entry()},
+        ),
+    ):
+        first, second = await asyncio.gather(sync.async_sync(), sync.async_sync())
+        await hass.async_block_till_done()
+    assert first.added == ["SIM2"]
+    assert not second
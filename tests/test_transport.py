@@ -0,0 +1,165 @@
+"""Tests for the process-wide transport."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.kumo.const import DOMAIN, KUMO_DATA_COORDINATORS
+from custom_components.kumo.metrics import KIND_COMMAND, KIND_POLL
+from custom_components.kumo.transport import KumoTransport, get_transport
+
+
+async def test_transport_takes_turns(hass: HomeAssistant):
+    """Waiting entries get slots in turn, commands before polls."""
+    transport = KumoTransport(hass, limit=1)
+    release = threading.Event()
+    order = []
+
+    def _call(name):
+        if name == "first":
+            release.wait(5)
+        order.append(name)
+
+    calls = [transport.async_run("A", KIND_POLL, _call, "first")]
+    calls += [transport.async_run("A", KIND_POLL, _call, f"A{n}") for n in range(3)]
+    calls.append(transport.async_run("B", KIND_POLL, _call, "B"))
+    calls.append(transport.async_run("A", KIND_COMMAND, _call, "A command"))
+    tasks = [hass.async_create_task(call) for call in calls]
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert transport.active == 1
+    assert transport.waiting == 5
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["first", "A command", "B", "A0", "A1", "A2"]
+    assert transport.active == 0
+    assert transport.waiting == 0
+
+
+async def test_transport_skips_cancelled_calls(hass: HomeAssistant):
+    """A call cancelled while waiting gives up its place in line."""
+    transport = KumoTransport(hass, limit=1)
+    release = threading.Event()
+    order = []
+
+    def _call(name):
+        if name == "first":
+            release.wait(5)
+        order.append(name)
+
+    first = hass.async_create_task(transport.async_run("A", KIND_POLL, _call, "first"))
+    cancelled = hass.async_create_task(
+        transport.async_run("B", KIND_POLL, _call, "cancelled")
+    )
+    last = hass.async_create_task(transport.async_run("A", KIND_POLL, _call, "last"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+    await asyncio.gather(first, last)
+    assert order == ["first", "last"]
+    assert transport.active == 0
+
+
+async def test_unload_cancels_calls(
+    hass: HomeAssistant, kumo_simulator, setup_simulated_entry
+):
+    """Unloading cancels a call blocked on an adapter instead of waiting."""
+    kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+    coordinator = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]["SIM1"]
+    transport = get_transport(hass)
+
+    release = threading.Event()
+    call = hass.async_create_task(
+        coordinator.async_device_call(KIND_COMMAND, release.wait, 10)
+    )
+    while not transport.active:
+        await asyncio.sleep(0.01)
+    start = time.monotonic()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert time.monotonic() - start < 0.5
+    assert transport.active == 0
+    release.set()
+
+
+async def test_transport_caps_shed_polls(hass: HomeAssistant):
+    """Shed polls hold at most their share of slots."""
+    transport = KumoTransport(hass, limit=4)
+    release = threading.Event()
+
+    shed = [
+        hass.async_create_task(
+            transport.async_run("A", KIND_POLL, release.wait, 5, shed=True)
+        )
+        for _ in range(2)
+    ]
+    healthy = hass.async_create_task(transport.async_run("A", KIND_POLL, len, "ok"))
+    assert await healthy == 2
+    assert transport.shed_active == 1
+    assert transport.waiting == 1
+
+    release.set()
+    await asyncio.gather(*shed)
+    assert transport.active == transport.shed_active == 0
+
+
+async def test_abandoned_calls_keep_their_threads(hass: HomeAssistant):
+    """Abandoned calls hold their slot until they end, without retiring the pool."""
+    transport = KumoTransport(hass, limit=4)
+    started = threading.Semaphore(0)
+    release = threading.Event()
+
+    def _blocked():
+        started.release()
+        release.wait(5)
+
+    abandoned = hass.async_create_task(transport.async_run("A", KIND_POLL, _blocked))
+    await hass.async_add_executor_job(started.acquire)
+    executor = transport._executor
+    assert transport.async_cancel_entry("A") == 1
+    with pytest.raises(asyncio.CancelledError):
+        await abandoned
+    assert transport._executor is executor
+    assert transport.capacity == 3
+
+    release.set()
+    while transport.capacity < 4:
+        await asyncio.sleep(0.01)
+    assert transport.as_dict()["abandoned"] == 0
+    assert await transport.async_run("B", KIND_POLL, len, "ok") == 2
+
+
+async def test_retired_pool_is_dropped_when_its_calls_end(hass: HomeAssistant):
+    """A pool mostly tied up by abandoned calls is replaced, then let go."""
+    transport = KumoTransport(hass, limit=4)
+    started = threading.Semaphore(0)
+    release = threading.Event()
+
+    def _blocked():
+        started.release()
+        release.wait(5)
+
+    abandoned = [
+        hass.async_create_task(transport.async_run("A", KIND_POLL, _blocked))
+        for _ in range(2)
+    ]
+    for _ in abandoned:
+        await hass.async_add_executor_job(started.acquire)
+    transport.async_cancel_entry("A")
+    await asyncio.gather(*abandoned, return_exceptions=True)
+    assert transport._executor is None
+    assert transport.capacity == 4
+    assert await transport.async_run("B", KIND_POLL, len, "ok") == 2
+    assert transport.as_dict()["retired_pools"] == 1
+
+    release.set()
+    while transport.as_dict()["retired_pools"]:
+        await asyncio.sleep(0.01)
+    await hass.async_block_till_done()
+    assert transport.as_dict()["abandoned"] == 0
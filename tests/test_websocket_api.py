@@ -0,0 +1,76 @@
+"""Tests for the Kumo websocket API."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import DATA_DISPATCHER
+from homeassistant.setup import async_setup_component
+
+from custom_components.kumo.const import (
+    DOMAIN,
+    KUMO_DATA_COORDINATORS,
+    SIGNAL_ENTRY_UNLOADED,
+)
+
+
+async def test_subscribe_snapshot_then_deltas(
+    hass: HomeAssistant, hass_ws_client, kumo_simulator, setup_simulated_entry
+):
+    """Subscribers get a full snapshot, then only the fields that changed."""
+    unit = kumo_simulator.add_unit("SIM1", "Living Room")
+    kumo_simulator.add_unit("SIM2", "Bedroom")
+    entry = await setup_simulated_entry()
+    client = await hass_ws_client(hass)
+
+    await client.send_json({"id": 1, "type": "kumo/subscribe"})
+    assert (await client.receive_json())["success"]
+    snapshot = (await client.receive_json())["event"]["units"]
+    assert set(snapshot) == {"SIM1", "SIM2"}
+    assert snapshot["SIM1"]["current_temperature"] == 20.5
+    assert snapshot["SIM1"]["available"] is True
+
+    unit.status["roomTemp"] = 21.0
+    coordinator = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]["SIM1"]
+    coordinator.get_device()._last_status_update = 0
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    event = (await client.receive_json())["event"]
+    assert event == {"units": {"SIM1": {"current_temperature": 21.0}}}
+
+
+async def test_subscribe_unknown_entry(hass: HomeAssistant, hass_ws_client):
+    """Subscribing to an entry that is not loaded fails."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": "kumo/subscribe", "entry_id": "nope"})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "not_found"
+
+
+async def test_unsubscribe_and_unload_release_listeners(
+    hass: HomeAssistant, hass_ws_client, kumo_simulator, setup_simulated_entry
+):
+    """Neither unsubscribing nor unloading leaves a subscription's listeners."""
+    kumo_simulator.add_unit("SIM1", "Living Room")
+    entry = await setup_simulated_entry()
+    coordinator = hass.data[DOMAIN][entry.entry_id][KUMO_DATA_COORDINATORS]["SIM1"]
+    signal = SIGNAL_ENTRY_UNLOADED.format(entry.entry_id)
+    listeners = len(coordinator._listeners)
+    client = await hass_ws_client(hass)
+
+    for msg_id in (1, 3):
+        await client.send_json({"id": msg_id, "type": "kumo/subscribe"})
+        assert (await client.receive_json())["success"]
+        await client.receive_json()
+    assert len(hass.data[DATA_DISPATCHER][signal]) == 2
+    assert len(coordinator._listeners) == listeners + 2
+
+    await client.send_json({"id": 4, "type": "unsubscribe_events", "subscription": 1})
+    assert (await client.receive_json())["success"]
+    assert len(hass.data[DATA_DISPATCHER][signal]) == 1
+    assert len(coordinator._listeners) == listeners + 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert not hass.data[DATA_DISPATCHER].get(signal)
+    assert not coordinator._listeners